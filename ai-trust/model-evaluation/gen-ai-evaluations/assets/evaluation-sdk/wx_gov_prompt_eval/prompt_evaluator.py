@@ -5,7 +5,8 @@ This module provides the PromptTemplateEvaluator class for creating, configuring
 and evaluating prompt template assets in Watson OpenScale.
 """
 
-from typing import Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Set
 import pandas as pd
 from ibm_aigov_facts_client import DetachedPromptTemplate, PromptTemplate
 
@@ -306,25 +307,40 @@ class PromptTemplateEvaluator:
         self,
         test_data_path: str,
         subscription_id: Optional[str] = None,
-        background_mode: bool = False
+        background_mode: bool = False,
+        chunk_size: int = 1,
+        max_workers: int = 1
     ) -> Dict:
         """
         Evaluate the prompt template with test data.
 
+        The CSV is streamed in chunks of ``chunk_size`` records and each chunk is
+        uploaded as one risk evaluation, straight from memory. The default of 1
+        evaluates every record separately; a larger chunk size evaluates the
+        dataset in bulk with one upload per chunk instead of one per record.
+
         Args:
             test_data_path: Path to test data CSV file
             subscription_id: Subscription ID (uses stored ID if not provided)
             background_mode: Whether to run evaluation in background
+            chunk_size: Records per risk evaluation upload (default: 1)
+            max_workers: Chunks evaluated concurrently (default: 1). OpenScale reports
+                the latest run of a monitor instance, so use values above 1 together
+                with background_mode=True
 
         Returns:
-            Dictionary with evaluation results
+            Dictionary with evaluation results (one entry per chunk, in file order)
 
         Example:
             >>> results = evaluator.evaluate("test_data.csv")
+            >>> results = evaluator.evaluate("large_test_data.csv", chunk_size=500, max_workers=4,
+            ...                              background_mode=True)
         """
         sub_id = subscription_id or self.subscription_id
         if not sub_id:
             raise ValueError("No subscription ID provided or stored")
+        if chunk_size < 1 or max_workers < 1:
+            raise ValueError("chunk_size and max_workers must be at least 1")
 
         # Get MRM monitor instance ID
         if not self.mrm_monitor_id:
@@ -332,34 +348,51 @@ class PromptTemplateEvaluator:
 
         print(f"Running risk evaluation on {test_data_path}")
 
-        # Read test data
-        test_data = pd.read_csv(test_data_path, encoding='unicode_escape')
-
-        # Process each row
-        results = []
-        for index, row in test_data.iterrows():
-            row_with_headers = dict(zip(test_data.columns, row))
-            temp_path = "temp_input.csv"
-            pd.DataFrame([row_with_headers]).to_csv(temp_path, index=False)
-
-            response = self.wos_client.monitor_instances.mrm.evaluate_risk(
-                monitor_instance_id=self.mrm_monitor_id,
-                test_data_set_name="data.csv",
-                test_data_path=temp_path,
-                content_type="multipart/form-data",
-                body={},
-                project_id=self.project_id,
-                space_id=self.space_id,
-                background_mode=background_mode
-            )
-            results.append(response)
-
-            if (index + 1) % 10 == 0:
-                print(f"  Processed {index + 1}/{len(test_data)} records")
-
-        print(f"✓ Evaluation complete. Processed {len(test_data)} records")
-
-        return {"total_records": len(test_data), "results": results}
+        results: Dict[int, object] = {}
+        processed = 0
+        pending: Set[Future] = set()
+
+        def collect(done: Set[Future]) -> None:
+            nonlocal processed
+            for future in done:
+                index, records, response = future.result()
+                results[index] = response
+                previous, processed = processed, processed + records
+                if processed // 10 > previous // 10:
+                    print(f"  Processed {processed} records")
+
+        # Stream the CSV; at most max_workers chunks are in memory at a time
+        chunks = pd.read_csv(test_data_path, encoding='unicode_escape', chunksize=chunk_size)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                for index, chunk in enumerate(chunks):
+                    if len(pending) >= max_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done)
+                    pending.add(executor.submit(self._evaluate_chunk, index, chunk, background_mode))
+                collect(pending)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        print(f"✓ Evaluation complete. Processed {processed} records in {len(results)} evaluation(s)")
+
+        return {"total_records": processed, "results": [results[i] for i in sorted(results)]}
+
+    def _evaluate_chunk(self, index: int, chunk: pd.DataFrame, background_mode: bool):
+        """Upload one chunk of test data as a risk evaluation; returns (index, records, response)."""
+        # A DataFrame with text/csv content is serialized by the SDK in memory, no temp file
+        response = self.wos_client.monitor_instances.mrm.evaluate_risk(
+            monitor_instance_id=self.mrm_monitor_id,
+            test_data_set_name="data.csv",
+            test_data_path=chunk,
+            content_type="text/csv",
+            project_id=self.project_id,
+            space_id=self.space_id,
+            background_mode=background_mode
+        )
+        return index, len(chunk), response
 
     def display_metrics(
         self,
@@ -4,6 +4,7 @@ Usage::
 
     python -m ingestion_pipeline           # start the API server
     python -m ingestion_pipeline --port 9000
+    python -m ingestion_pipeline --migrate-knn   # reindex documents with a knn_vector mapping, then exit
 """
 
 from __future__ import annotations
@@ -25,12 +26,22 @@ def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(prog="ingestion_pipeline")
     parser.add_argument("--port", type=int, default=app_cfg.backend_port)
     parser.add_argument("--debug", action="store_true")
+    parser.add_argument(
+        "--migrate-knn",
+        action="store_true",
+        help="Reindex the documents index with a knn_vector mapping and exit",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = _parse_args()
 
+    if args.migrate_knn:
+        result = opensearch_service.migrate_to_knn_index()
+        logger.info("kNN migration finished", extra=result)
+        return
+
     logger.info("=" * 60)
     logger.info("Ingestion Pipeline starting", extra={"port": args.port, "debug": args.debug})
 
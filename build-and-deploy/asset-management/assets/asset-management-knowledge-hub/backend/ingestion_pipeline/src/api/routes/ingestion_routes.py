@@ -5,10 +5,11 @@ import asyncio
 import json
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from shared.config import cos as cos_cfg
+from ingestion_pipeline.src.config import ingestion as ingest_cfg
 from shared.logging import get_logger
 from ingestion_pipeline.src.services.progress_service import progress_service, ProgressEvent
 
@@ -22,36 +23,27 @@ _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ingest")
 # ── Progress SSE ──────────────────────────────────────────────────────────────
 
 @router.get("/progress/{job_id}")
-async def stream_progress(job_id: str):
+async def stream_progress(job_id: str, last_event_id: Optional[str] = Header(default=None)):
     """Server-Sent Events stream for a running ingestion job.
 
     The client opens this endpoint after POST /web (or /cos etc.) returns
-    a job_id. Events are streamed until the job finishes.
+    a job_id. Events are pushed as soon as the pipeline emits them and the
+    stream ends when the job finishes. Each frame carries an ``id:`` (the
+    event's sequence number), so a reconnecting EventSource resumes after
+    the last event it saw via ``Last-Event-ID``.
     """
+    since = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else 0
+
     async def _generate():
-        seen = 0
-        idle = 0
-        while True:
-            job = progress_service.get(job_id)
-            if job is None:
-                yield f"data: {json.dumps({'type': 'error', 'message': 'Job not found'})}\n\n"
-                return
-
-            events = job.drain(since=seen)
-            for ev in events:
-                yield f"data: {json.dumps({'type': ev.type, 'message': ev.message, 'detail': ev.detail, 'count': ev.count, 'total': ev.total, 'chunks': ev.chunks})}\n\n"
-                seen += 1
-                idle = 0
-
-            if job.status in ("done", "error"):
-                return
-
-            idle += 1
-            if idle > 120:   # 60 s of silence → give up
-                yield f"data: {json.dumps({'type': 'done', 'message': 'Timed out'})}\n\n"
-                return
-
-            await asyncio.sleep(0.5)
+        job = progress_service.get(job_id)
+        if job is None:
+            yield f"data: {json.dumps({'type': 'error', 'message': 'Job not found'})}\n\n"
+            return
+        try:
+            async for seq, ev in job.subscribe(since=since, idle_timeout=60):
+                yield f"id: {seq}\ndata: {json.dumps({'type': ev.type, 'message': ev.message, 'detail': ev.detail, 'count': ev.count, 'total': ev.total, 'chunks': ev.chunks})}\n\n"
+        except asyncio.TimeoutError:   # 60 s of silence → give up
+            yield f"data: {json.dumps({'type': 'done', 'message': 'Timed out'})}\n\n"
 
     return StreamingResponse(
         _generate(),
@@ -177,6 +169,8 @@ class S3IngestRequest(BaseModel):
     secret_key: Optional[str] = None     # falls back to COS_HMAC_SECRET_ACCESS_KEY env var
     region: Optional[str] = None         # falls back to COS_REGION env var
     force: bool = False
+    # parallel downloads; falls back to INGEST_DOWNLOAD_CONCURRENCY
+    concurrency: Optional[int] = Field(None, ge=1, le=ingest_cfg.max_download_concurrency)
     asset_num: Optional[str] = None
     category: str = "s3-document"
     tags: list[str] = []
@@ -200,6 +194,8 @@ def _run_s3_job(job_id: str, body: S3IngestRequest) -> None:
             asset_num=body.asset_num,
             category=body.category,
             tags=body.tags,
+            job_id=job_id,
+            concurrency=body.concurrency,
         )
         ok      = sum(1 for r in results if r.status == "success")
         failed  = sum(1 for r in results if r.status == "failed")
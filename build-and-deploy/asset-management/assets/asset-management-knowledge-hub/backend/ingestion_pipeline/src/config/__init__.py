@@ -6,4 +6,28 @@ import os
 
 from shared.config import opensearch, watsonx, maximo, cos, app  # re-export
 
-__all__ = ["opensearch", "watsonx", "maximo", "cos", "app"]
+# ── Ingestion-specific ────────────────────────────────────────────────────────
+
+class IngestionConfig:
+    # Bulk (S3/COS) ingestion concurrency budget — one bound per pipeline stage
+    download_concurrency: int = int(os.environ.get("INGEST_DOWNLOAD_CONCURRENCY", "8"))
+    # Highest per-request download concurrency; also sizes the S3 connection pool
+    max_download_concurrency: int = int(os.environ.get("INGEST_MAX_DOWNLOAD_CONCURRENCY", "32"))
+    extract_workers: int = int(os.environ.get("INGEST_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    embed_concurrency: int = int(os.environ.get("INGEST_EMBED_CONCURRENCY", "4"))
+    # Chunks sent per embedding API call
+    embed_batch_size: int = int(os.environ.get("INGEST_EMBED_BATCH_SIZE", "64"))
+    # Large PDFs are split into page slices extracted in parallel processes
+    pdf_pages_per_slice: int = int(os.environ.get("INGEST_PDF_PAGES_PER_SLICE", "25"))
+    # Use pdfium's text layer, falling back to pdfplumber layout analysis
+    # only for pages where it finds no text. Set false to always use pdfplumber.
+    pdf_fast_path: bool = os.environ.get("INGEST_PDF_FAST_PATH", "true").lower() in ("true", "1", "yes")
+    # Seconds a single document may spend in text extraction
+    pdf_time_budget: float = float(os.environ.get("INGEST_PDF_TIME_BUDGET", "600"))
+    # Registry ids per multi-get request when pre-filtering bucket listings
+    registry_mget_size: int = int(os.environ.get("INGEST_REGISTRY_MGET_SIZE", "500"))
+
+
+ingestion = IngestionConfig()
+
+__all__ = ["opensearch", "watsonx", "maximo", "cos", "app", "ingestion"]
@@ -2,23 +2,27 @@
 
 Supported file types: PDF, DOCX, TXT.
 
-The processor is intentionally kept I/O-bound friendly: it processes
-chunks in small batches rather than loading the entire document into
-memory as a single object.
+The processor is intentionally kept I/O-bound friendly: extracted text
+arrives as a stream of page segments (see ``text_extraction``) that is
+chunked incrementally and embedded in batches, rather than loading the
+entire document into memory as a single object. Chunks from paginated
+formats record the page(s) they came from in ``metadata.page`` /
+``metadata.pageEnd``.
 """
 
 from __future__ import annotations
 
+import bisect
 import re
+import threading
 from dataclasses import dataclass
-from typing import Optional
-
-import pdfplumber  # type: ignore
-import mammoth  # type: ignore
+from typing import Iterable, Iterator, Optional
 
+from ingestion_pipeline.src.config import ingestion as ingest_cfg
 from ingestion_pipeline.src.services.cos_service import DocumentMetadata
 from ingestion_pipeline.src.services.opensearch_service import OpenSearchService, DocumentChunk
 from ingestion_pipeline.src.services.document_registry_service import document_registry_service
+from ingestion_pipeline.src.services import text_extraction
 from shared.watsonx import client as wx
 from shared.logging import get_logger
 
@@ -28,7 +32,10 @@ logger = get_logger(__name__)
 # Stay safely under by capping at 400 characters (~320 tokens).
 _CHUNK_SIZE = 400
 _CHUNK_OVERLAP = 50
-_BATCH_SIZE = 10  # chunks per embedding API call
+_BATCH_SIZE = ingest_cfg.embed_batch_size  # chunks per embedding API call
+
+# Process-wide cap on concurrent embed + index calls, shared by every job
+_embed_slots = threading.BoundedSemaphore(max(1, ingest_cfg.embed_concurrency))
 
 
 @dataclass
@@ -70,20 +77,32 @@ class DocumentProcessorService:
             :class:`ProcessingResult` with status and chunk count.
         """
         logger.info("▶ Processing document", extra={"file": file_name, "size_bytes": len(file_bytes)})
-        try:
-            doc_id = (
-                f"{metadata.asset_num}/{metadata.category or 'document'}/{file_name}"
-                if metadata.asset_num
-                else f"documents/{file_name}"
-            )
-            logger.debug("Document ID assigned", extra={"doc_id": doc_id})
+        logger.debug("Extracting text…", extra={"file": file_name})
+        return self.process_segments(
+            text_extraction.iter_segments(file_bytes, file_name), file_name, metadata
+        )
 
-            logger.debug("Extracting text…", extra={"file": file_name})
-            text = self._extract_text(file_bytes, file_name)
-            del file_bytes  # release memory early
-            logger.info("Text extracted", extra={"file": file_name, "chars": len(text)})
+    def process_segments(
+        self,
+        segments: Iterable[text_extraction.Segment],
+        file_name: str,
+        metadata: DocumentMetadata,
+    ) -> ProcessingResult:
+        """Chunk, embed and index a stream of ``(page_number, text)`` segments.
 
-            if not text.strip():
+        Segments are consumed lazily, so chunks from early pages are indexed
+        while later pages are still being extracted.
+        """
+        doc_id = (
+            f"{metadata.asset_num}/{metadata.category or 'document'}/{file_name}"
+            if metadata.asset_num
+            else f"documents/{file_name}"
+        )
+        logger.debug("Document ID assigned", extra={"doc_id": doc_id})
+        try:
+            logger.debug("Chunking + embedding + indexing…", extra={"file": file_name})
+            total = self._process_and_index(segments, doc_id, file_name, metadata)
+            if not total:
                 logger.warning("⚠ Document yielded no text — skipping", extra={"file": file_name, "doc_id": doc_id})
                 return ProcessingResult(
                     document_id=doc_id,
@@ -92,9 +111,6 @@ class DocumentProcessorService:
                     status="failed",
                     error="No text could be extracted from document",
                 )
-
-            logger.debug("Chunking + embedding + indexing…", extra={"file": file_name})
-            total = self._process_and_index(text, doc_id, file_name, metadata)
             logger.info("✔ Document indexed", extra={"file": file_name, "doc_id": doc_id, "chunks": total})
             return ProcessingResult(
                 document_id=doc_id,
@@ -104,6 +120,11 @@ class DocumentProcessorService:
             )
         except Exception as exc:
             logger.error("✘ Document processing failed", extra={"file": file_name, "error": str(exc)}, exc_info=True)
+            # Batches indexed before the failure would otherwise stay searchable
+            try:
+                self._os.delete_document_chunks(doc_id)
+            except Exception as cleanup_exc:
+                logger.warning("Could not delete partial chunks", extra={"doc_id": doc_id, "error": str(cleanup_exc)})
             return ProcessingResult(
                 document_id="",
                 file_name=file_name,
@@ -112,108 +133,132 @@ class DocumentProcessorService:
                 error=str(exc),
             )
 
-    # ── Text extraction ───────────────────────────────────────────────────────
-
-    def _extract_text(self, file_bytes: bytes, file_name: str) -> str:
-        ext = file_name.rsplit(".", 1)[-1].lower()
-        if ext == "pdf":
-            return self._extract_pdf(file_bytes)
-        if ext == "docx":
-            return self._extract_docx(file_bytes)
-        if ext == "txt":
-            return file_bytes.decode("utf-8", errors="replace")
-        raise ValueError(f"Unsupported file type: .{ext}")
-
-    @staticmethod
-    def _extract_pdf(data: bytes) -> str:
-        import io
-        text_parts: list[str] = []
-        with pdfplumber.open(io.BytesIO(data)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                text_parts.append(page_text)
-        return "\n".join(text_parts)
-
-    @staticmethod
-    def _extract_docx(data: bytes) -> str:
-        import io
-        result = mammoth.extract_raw_text(io.BytesIO(data))
-        return result.value
-
     # ── Chunking + indexing ───────────────────────────────────────────────────
 
     def _process_and_index(
         self,
-        text: str,
+        segments: Iterable[text_extraction.Segment],
         doc_id: str,
         file_name: str,
         metadata: DocumentMetadata,
     ) -> int:
-        """Stream-process text into chunks, embed them in batches, and index."""
+        """Stream-process segments into chunks, embed them in batches, and index."""
         from datetime import datetime, timezone
 
         chunk_index = 0
-        start = 0
         batch: list[DocumentChunk] = []
         total_indexed = 0
-
-        while start < len(text):
-            end = min(start + _CHUNK_SIZE, len(text))
-            chunk_text = text[start:end]
-
-            # Prefer sentence boundary
-            if end < len(text):
-                last_period = chunk_text.rfind(".")
-                last_nl = chunk_text.rfind("\n")
-                break_at = max(last_period, last_nl)
-                if break_at > _CHUNK_SIZE * 0.7:
-                    end = start + break_at + 1
-                    chunk_text = text[start:end]
-
-            content = chunk_text.strip()
-            if content:
-                chunk_id = document_registry_service.generate_chunk_id(doc_id, chunk_index)
-                batch.append(
-                    DocumentChunk(
-                        id=chunk_id,
-                        document_id=doc_id,
-                        file_name=file_name,
-                        chunk_index=chunk_index,
-                        content=content,
-                        metadata={
-                            "assetnum": metadata.asset_num,
-                            "category": metadata.category,
-                            "version": metadata.version,
-                            "tags": metadata.tags,
-                        },
-                        timestamp=datetime.now(timezone.utc).isoformat(),
-                    )
+        chars = 0
+
+        for content, first_page, last_page in _chunk_stream(segments):
+            chars += len(content)
+            chunk_meta = {
+                "assetnum": metadata.asset_num,
+                "category": metadata.category,
+                "version": metadata.version,
+                "tags": metadata.tags,
+            }
+            if first_page is not None:
+                chunk_meta["page"] = first_page
+                chunk_meta["pageEnd"] = last_page
+            chunk_id = document_registry_service.generate_chunk_id(doc_id, chunk_index)
+            batch.append(
+                DocumentChunk(
+                    id=chunk_id,
+                    document_id=doc_id,
+                    file_name=file_name,
+                    chunk_index=chunk_index,
+                    content=content,
+                    metadata=chunk_meta,
+                    timestamp=datetime.now(timezone.utc).isoformat(),
                 )
-                chunk_index += 1
+            )
+            chunk_index += 1
 
             if len(batch) >= _BATCH_SIZE:
                 total_indexed += self._flush_batch(batch)
                 batch = []
 
-            start = end - _CHUNK_OVERLAP
-
         if batch:
             total_indexed += self._flush_batch(batch)
 
+        logger.info("Text extracted", extra={"file": file_name, "chars": chars})
         return total_indexed
 
     def _flush_batch(self, batch: list[DocumentChunk]) -> int:
         """Generate embeddings for *batch* and bulk-index them."""
         texts = [c.content for c in batch]
         logger.debug("Embedding batch", extra={"chunks": len(texts)})
-        embeddings = wx.embed_batched(texts)
-        for chunk, emb in zip(batch, embeddings):
-            chunk.embedding = emb
-        self._os.bulk_index_chunks(batch)
+        with _embed_slots:
+            embeddings = wx.embed_batched(texts, batch_size=_BATCH_SIZE)
+            for chunk, emb in zip(batch, embeddings):
+                chunk.embedding = emb
+            self._os.bulk_index_chunks(batch)
         logger.debug("Batch indexed", extra={"chunks": len(batch)})
         return len(batch)
 
 
+def _chunk_stream(
+    segments: Iterable[text_extraction.Segment],
+) -> Iterator[tuple[str, Optional[int], Optional[int]]]:
+    """Yield ``(content, first_page, last_page)`` chunks from a segment stream.
+
+    Segments are joined with newlines and cut into ``_CHUNK_SIZE`` windows
+    overlapping by ``_CHUNK_OVERLAP``, preferring a sentence or line break in
+    the last 30% of a window. Only the text from the current window onward is
+    buffered, so memory stays flat however long the document is.
+    """
+    buf = ""                         # text from absolute offset `base` onward
+    base = 0
+    starts: list[int] = []           # absolute offset where each page begins
+    pages: list[Optional[int]] = []
+    start = 0
+
+    def _page_at(pos: int) -> Optional[int]:
+        return pages[max(0, bisect.bisect_right(starts, pos) - 1)] if pages else None
+
+    def _cut(end_of_text: int) -> tuple[int, str]:
+        end = min(start + _CHUNK_SIZE, end_of_text)
+        chunk_text = buf[start - base : end - base]
+        # Prefer sentence boundary
+        if end < end_of_text:
+            break_at = max(chunk_text.rfind("."), chunk_text.rfind("\n"))
+            if break_at > _CHUNK_SIZE * 0.7:
+                end = start + break_at + 1
+                chunk_text = buf[start - base : end - base]
+        return end, chunk_text
+
+    for page, text in segments:
+        if starts:
+            buf += "\n"
+        starts.append(base + len(buf))
+        pages.append(page)
+        buf += text
+
+        # Emit every window that is known not to be the last one
+        while start + _CHUNK_SIZE < base + len(buf):
+            end, chunk_text = _cut(base + len(buf))
+            content = chunk_text.strip()
+            if content:
+                yield content, _page_at(start), _page_at(end - 1)
+            start = end - _CHUNK_OVERLAP
+
+        buf = buf[start - base :]
+        base = start
+        keep = max(0, bisect.bisect_right(starts, start) - 1)
+        del starts[:keep], pages[:keep]
+
+    end_of_text = base + len(buf)
+    while start < end_of_text:
+        end, chunk_text = _cut(end_of_text)
+        content = chunk_text.strip()
+        if content:
+            yield content, _page_at(start), _page_at(end - 1)
+        if end >= end_of_text:
+            break
+        start = end - _CHUNK_OVERLAP
+
+
 document_processor_service = DocumentProcessorService(
     opensearch=__import__(
         "ingestion_pipeline.src.services.opensearch_service",
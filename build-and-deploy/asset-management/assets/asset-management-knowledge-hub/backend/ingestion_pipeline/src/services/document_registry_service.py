@@ -13,7 +13,7 @@ from typing import Optional
 
 from shared.opensearch import build_client
 from shared.logging import get_logger
-from ingestion_pipeline.src.config import opensearch as cfg
+from ingestion_pipeline.src.config import opensearch as cfg, ingestion as ingest_cfg
 
 logger = get_logger(__name__)
 
@@ -70,6 +70,33 @@ class DocumentRegistryService:
         except Exception:
             return False
 
+    def indexed_etags(self, document_ids: list[str]) -> dict[str, str]:
+        """Return ``{document_id: etag}`` for every id that is already indexed.
+
+        Looks ids up with ``_mget`` (``INGEST_REGISTRY_MGET_SIZE`` per request)
+        instead of one GET per document, so a bucket listing can be filtered
+        against the registry in a handful of round trips. Ids that are
+        missing or whose last run failed are left out.
+        """
+        indexed: dict[str, str] = {}
+        step = max(1, ingest_cfg.registry_mget_size)
+        for i in range(0, len(document_ids), step):
+            ids = document_ids[i : i + step]
+            try:
+                resp = self._client.mget(
+                    index=_REGISTRY_INDEX,
+                    body={"ids": ids},
+                    params={"_source_includes": "etag,status"},
+                )
+            except Exception as exc:
+                logger.warning("Registry multi-get failed", extra={"ids": len(ids), "error": str(exc)})
+                continue
+            for doc in resp.get("docs", []):
+                src = doc.get("_source") or {}
+                if doc.get("found") and src.get("status") == "indexed":
+                    indexed[doc["_id"]] = src.get("etag", "")
+        return indexed
+
     # ── Registry writes ───────────────────────────────────────────────────────
 
     def register_document(
@@ -12,7 +12,7 @@ from typing import Optional
 
 from shared.opensearch import build_client
 from shared.logging import get_logger
-from ingestion_pipeline.src.config import opensearch as cfg
+from ingestion_pipeline.src.config import opensearch as cfg, watsonx as wx_cfg
 
 logger = get_logger(__name__)
 
@@ -35,7 +35,7 @@ _INDEX_SETTINGS = {
             },
             "embedding": {
                 "type": "knn_vector",
-                "dimension": 384,
+                "dimension": wx_cfg.embedding_dimension,
                 "method": {
                     "name": "hnsw",
                     "space_type": "cosinesimil",
@@ -48,6 +48,8 @@ _INDEX_SETTINGS = {
                     "category": {"type": "keyword"},
                     "version":  {"type": "integer"},
                     "section":  {"type": "text"},
+                    "page":     {"type": "integer"},
+                    "pageEnd":  {"type": "integer"},
                     "tags":     {"type": "keyword"},
                 }
             },
@@ -89,6 +91,57 @@ class OpenSearchService:
         self._client.indices.create(index=self._index, body=_INDEX_SETTINGS)
         logger.info("Index created", extra={"index": self._index})
 
+    def migrate_to_knn_index(self) -> dict:
+        """Reindex the documents index into one with a ``knn_vector`` mapping.
+
+        Indexes created by older setup scripts store ``embedding`` as a plain
+        float array, which the MCP server's kNN queries cannot use. This copies
+        every chunk into a new ``<index>-knn-<timestamp>`` index built from
+        :data:`_INDEX_SETTINGS` and then points the configured index name at it
+        through an alias, so readers and writers need no configuration change.
+        Safe to re-run — returns ``{"migrated": False}`` when the live index is
+        already kNN-mapped.
+        """
+        mapping = self._client.indices.get_mapping(index=self._index)
+        source = next(iter(mapping))
+        props = mapping[source].get("mappings", {}).get("properties", {})
+        if props.get("embedding", {}).get("type") == "knn_vector":
+            logger.info("Index already has a kNN mapping", extra={"index": source})
+            return {"migrated": False, "index": source}
+
+        target = f"{self._index}-knn-{datetime.utcnow():%Y%m%d%H%M%S}"
+        self._client.indices.create(index=target, body=_INDEX_SETTINGS)
+        logger.info("Reindexing into kNN index", extra={"source": source, "target": target})
+        resp = self._client.reindex(
+            body={"source": {"index": source}, "dest": {"index": target}},
+            params={"wait_for_completion": "true", "refresh": "true"},
+            request_timeout=3600,
+        )
+        if resp.get("failures"):
+            raise RuntimeError(f"Reindex into {target} failed: {resp['failures'][:3]}")
+        source_count = self._client.count(index=source)["count"]
+        target_count = self._client.count(index=target)["count"]
+        if source_count != target_count:
+            raise RuntimeError(
+                f"Reindex count mismatch: {source} has {source_count}, {target} has {target_count}"
+            )
+
+        if source == self._index:
+            # A concrete index cannot share its name with an alias — drop it
+            # only after the copy has been verified.
+            self._client.indices.delete(index=source)
+            self._client.indices.put_alias(index=target, name=self._index)
+        else:
+            self._client.indices.update_aliases(body={"actions": [
+                {"remove": {"index": source, "alias": self._index}},
+                {"add": {"index": target, "alias": self._index}},
+            ]})
+        logger.info(
+            "kNN migration complete",
+            extra={"alias": self._index, "index": target, "documents": target_count},
+        )
+        return {"migrated": True, "index": target, "documents": target_count}
+
     # ── Write ─────────────────────────────────────────────────────────────────
 
     def index_chunk(self, chunk: DocumentChunk) -> None:
@@ -1,23 +1,32 @@
 """In-memory progress tracking for ingestion jobs.
 
 Each run gets a job_id. The pipeline pushes ProgressEvent objects into
-a deque. The SSE endpoint drains events to the client.
+a bounded ring buffer, numbering each one with a per-job sequence number.
+SSE subscribers read from their last-seen sequence number and are woken
+the moment a new event is pushed — there is no polling.
 
 Design:
   - No database or file I/O — purely in-memory, ephemeral per run.
   - Thread-safe: uses threading.Lock so pipeline threads (run_in_executor)
-    can push events safely.
+    can push events safely. Subscribers are asyncio tasks; a push notifies
+    each one through its own event loop with ``call_soon_threadsafe``.
+  - Job summaries (chunk total, last message) are maintained incrementally
+    on push, so listing jobs costs O(jobs) regardless of event volume.
   - Auto-cleanup: completed/failed jobs are removed after TTL seconds.
 """
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 import threading
 import time
 import uuid
 from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import AsyncIterator, Optional
+
+_MAX_EVENTS = 500
 
 
 @dataclass
@@ -36,45 +45,87 @@ class JobProgress:
     source: str
     label: str = ""           # human-readable label (e.g. URL or bucket name)
     status: str = "running"   # running | done | error
-    events: deque = field(default_factory=lambda: deque(maxlen=500))
+    events: deque = field(default_factory=lambda: deque(maxlen=_MAX_EVENTS))
+    next_seq: int = 0         # sequence number the next pushed event will get
+    chunks: int = 0           # running total of chunk events' ``chunks``
+    last_msg: str = ""
     created_at: float = field(default_factory=time.monotonic)
     created_at_iso: str = field(default_factory=lambda: __import__('datetime').datetime.now(__import__('datetime').timezone.utc).isoformat())
     _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _subscribers: set = field(default_factory=set, repr=False)
 
     def push(self, event: ProgressEvent) -> None:
         with self._lock:
             self.events.append(event)
-        if event.type in ("done", "error"):
-            self.status = event.type
+            self.next_seq += 1
+            self.last_msg = event.message
+            if event.type == "chunk":
+                self.chunks += event.chunks
+            if event.type in ("done", "error"):
+                self.status = event.type
+            subscribers = list(self._subscribers)
+        for loop, wakeup in subscribers:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:   # subscriber's loop already closed
+                pass
 
     def drain(self, since: int = 0) -> list[ProgressEvent]:
-        """Return all events from index *since* onwards."""
+        """Return all retained events with sequence number >= *since*."""
+        with self._lock:
+            return self._since(since)
+
+    async def subscribe(self, since: int = 0, idle_timeout: float = 60.0) -> AsyncIterator[tuple[int, ProgressEvent]]:
+        """Yield ``(seq, event)`` pairs from *since* until the job finishes.
+
+        Must be iterated on an event loop. Raises :class:`TimeoutError` if no
+        event arrives for *idle_timeout* seconds while the job is running.
+        """
+        wakeup = asyncio.Event()
+        token = (asyncio.get_running_loop(), wakeup)
         with self._lock:
-            all_events = list(self.events)
-        return all_events[since:]
+            self._subscribers.add(token)
+        try:
+            while True:
+                with self._lock:
+                    wakeup.clear()
+                    first = max(since, self.next_seq - len(self.events))
+                    pending = self._since(since)
+                    since = self.next_seq
+                    finished = self.status != "running"
+                for seq, event in enumerate(pending, start=first):
+                    yield seq, event
+                if finished:
+                    return
+                await asyncio.wait_for(wakeup.wait(), timeout=idle_timeout)
+        finally:
+            with self._lock:
+                self._subscribers.discard(token)
 
     def to_summary(self) -> dict:
         """Return a lightweight summary dict for job list APIs."""
-        with self._lock:
-            ev_list = list(self.events)
-        last_msg = ev_list[-1].message if ev_list else ""
-        chunks = sum(e.chunks for e in ev_list if e.type == "chunk")
         return {
             "job_id":    self.job_id,
             "source":    self.source,
             "label":     self.label,
             "status":    self.status,
             "startedAt": self.created_at_iso,
-            "chunks":    chunks,
-            "lastMsg":   last_msg,
+            "chunks":    self.chunks,
+            "lastMsg":   self.last_msg,
         }
 
+    def _since(self, since: int) -> list[ProgressEvent]:
+        # Caller holds the lock. Events older than the ring buffer are gone.
+        offset = max(0, since - (self.next_seq - len(self.events)))
+        return list(itertools.islice(self.events, offset, None))
+
 
 _TTL = 600   # seconds — keep completed jobs for 10 minutes
 
 
 class ProgressService:
     def __init__(self) -> None:
+        # Insertion-ordered: iteration is oldest → newest by creation time
         self._jobs: dict[str, JobProgress] = {}
         self._lock = threading.Lock()
 
@@ -104,9 +155,7 @@ class ProgressService:
     def list_all(self) -> list[dict]:
         """Return summaries of all in-memory jobs (running + recently completed)."""
         with self._lock:
-            jobs = list(self._jobs.values())
-        # Newest first
-        jobs.sort(key=lambda j: j.created_at, reverse=True)
+            jobs = list(reversed(self._jobs.values()))   # newest first
         return [j.to_summary() for j in jobs]
 
     def _cleanup(self) -> None:
@@ -1,10 +1,19 @@
 """S3-compatible ingestion service (AWS S3, MinIO, IBM COS with S3 API).
 
-Downloads objects from a bucket and runs them through the existing
-DocumentProcessorService pipeline.
+Lists a bucket, drops objects whose ETag the document registry already
+has (one multi-get per few hundred keys), then runs the rest through three
+bounded stages in parallel:
+
+    download (threads) → extract page slices (process pool) → embed + index
+
+Extracted pages stream straight into the chunker, and embedding is capped
+process-wide by ``INGEST_EMBED_CONCURRENCY``. The per-stage limits come from
+``IngestionConfig`` and are reported to the job's progress stream.
 """
 
 from __future__ import annotations
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
@@ -12,10 +21,12 @@ from typing import Optional
 import boto3
 from botocore.config import Config
 
+from ingestion_pipeline.src.config import ingestion as cfg
 from ingestion_pipeline.src.services.document_processor_service import document_processor_service
 from ingestion_pipeline.src.services.document_registry_service import document_registry_service
 from ingestion_pipeline.src.services.cos_service import DocumentMetadata
 from ingestion_pipeline.src.services.job_store_service import job_store_service
+from ingestion_pipeline.src.services.progress_service import progress_service, ProgressEvent
 from shared.logging import get_logger
 
 logger = get_logger(__name__)
@@ -43,6 +54,7 @@ class S3IngestionService:
         region: str = "us-east-1",
     ) -> None:
         self._bucket = bucket
+        self._pool_size = max(cfg.max_download_concurrency, cfg.download_concurrency)
         self._client = boto3.client(
             "s3",
             aws_access_key_id=access_key,
@@ -54,6 +66,7 @@ class S3IngestionService:
                 connect_timeout=10,
                 read_timeout=30,
                 retries={"max_attempts": 2},
+                max_pool_connections=self._pool_size,
             ),
         )
 
@@ -65,78 +78,163 @@ class S3IngestionService:
         asset_num: Optional[str] = None,
         category: str = "s3-document",
         tags: list[str] | None = None,
+        job_id: Optional[str] = None,
+        concurrency: Optional[int] = None,
     ) -> list[S3IngestResult]:
+        """Ingest every supported object under *prefix*.
+
+        Args:
+            force:       Re-ingest objects even if their ETag is already indexed.
+            job_id:      Progress job to report per-object events to (optional).
+            concurrency: Parallel downloads; defaults to ``INGEST_DOWNLOAD_CONCURRENCY``
+                         and is capped at the client's connection pool size.
+        """
+        downloads = min(max(1, concurrency or cfg.download_concurrency), self._pool_size)
+        embeds = max(1, cfg.embed_concurrency)
         logger.info("▶ S3 ingestion started", extra={"bucket": self._bucket, "prefix": prefix or "(all)", "force": force})
-        paginator = self._client.get_paginator("list_objects_v2")
+
+        objects = self._list_supported(prefix)
+        indexed = {} if force else document_registry_service.indexed_etags([o["Key"] for o in objects])
+
         results: list[S3IngestResult] = []
-        total_found = 0
-        for page in paginator.paginate(Bucket=self._bucket, Prefix=prefix):
-            for obj in page.get("Contents", []):
-                key = obj["Key"]
-                ext = "." + key.rsplit(".", 1)[-1].lower() if "." in key else ""
-                if ext not in _SUPPORTED_EXTS:
-                    logger.debug("Skipping unsupported file type", extra={"key": key, "ext": ext})
-                    continue
-                total_found += 1
-                etag = obj.get("ETag", "").strip('"')
-                if not force and document_registry_service.is_document_indexed(key, etag):
-                    logger.info("⏭ Already indexed — skipping", extra={"key": key})
-                    result = S3IngestResult(key=key, status="skipped")
-                    results.append(result)
-                    job_store_service.append(
-                        document_id=key,
-                        file_name=key.split("/")[-1],
-                        status="skipped",
-                        source="s3",
-                    )
-                    continue
-                try:
-                    logger.info("⬇ Downloading", extra={"key": key, "size_bytes": obj.get("Size", "?")})
-                    obj_data = self._client.get_object(Bucket=self._bucket, Key=key)
-                    file_bytes = obj_data["Body"].read()
-                    file_name = key.split("/")[-1]
-                    meta = DocumentMetadata(
-                        document_id=key,
-                        file_name=file_name,
-                        file_type="application/octet-stream",
-                        file_size=len(file_bytes),
-                        upload_date=datetime.utcnow(),
-                        version=1,
-                        asset_num=asset_num,
-                        category=category,
-                        tags=tags or [],
-                        etag=etag,
-                    )
-                    res = document_processor_service.process_document(file_bytes, file_name, meta)
-                    if res.status == "success":
-                        document_registry_service.register_document(key, file_name, res.total_chunks, etag)
-                    result = S3IngestResult(key=key, status=res.status, chunks=res.total_chunks, error=res.error)
-                    results.append(result)
-                    job_store_service.append(
-                        document_id=key,
-                        file_name=file_name,
-                        status=res.status,
-                        source="s3",
-                        chunk_count=res.total_chunks,
-                        error=res.error,
-                    )
-                except Exception as exc:
-                    logger.error("✘ S3 object ingest failed", extra={"key": key, "error": str(exc)}, exc_info=True)
-                    results.append(S3IngestResult(key=key, status="failed", error=str(exc)))
-                    job_store_service.append(
-                        document_id=key,
-                        file_name=key.split("/")[-1],
-                        status="failed",
-                        source="s3",
-                        error=str(exc),
-                    )
+        pending: list[dict] = []
+        for obj in objects:
+            key = obj["Key"]
+            etag = obj.get("ETag", "").strip('"')
+            # Same rule as DocumentRegistryService.is_document_indexed
+            if key in indexed and (not etag or indexed[key] == etag):
+                logger.info("⏭ Already indexed — skipping", extra={"key": key})
+                results.append(S3IngestResult(key=key, status="skipped"))
+                job_store_service.append(
+                    document_id=key,
+                    file_name=key.split("/")[-1],
+                    status="skipped",
+                    source="s3",
+                )
+                continue
+            pending.append(obj)
+
+        self._progress(job_id, ProgressEvent(
+            type="start",
+            message=(
+                f"{len(objects)} file(s) found — {len(pending)} to ingest, {len(results)} unchanged. "
+                f"Concurrency: {downloads} download(s), {cfg.extract_workers} extractor process(es), "
+                f"{embeds} embedding worker(s)."
+            ),
+            total=len(pending),
+        ))
+
+        download_slots = threading.BoundedSemaphore(downloads)
+        # Enough threads for every stage to be busy at once; the download
+        # semaphore, extraction pool and embed cap keep each stage within its
+        # budget and bound the objects held in memory.
+        with ThreadPoolExecutor(max_workers=downloads + embeds, thread_name_prefix="s3-ingest") as pool:
+            futures = [
+                pool.submit(
+                    self._ingest_object, obj,
+                    asset_num=asset_num, category=category, tags=tags or [],
+                    download_slots=download_slots,
+                )
+                for obj in pending
+            ]
+            for done, fut in enumerate(as_completed(futures), 1):
+                result = fut.result()
+                results.append(result)
+                # A failed object is reported as "skip": "error" and "done" end the job
+                # (ProgressService marks it finished and closes SSE streams), and the
+                # route pushes those once every object has been processed.
+                self._progress(job_id, ProgressEvent(
+                    type="chunk" if result.status == "success" else "skip",
+                    message=(
+                        f"✓ {result.key} — {result.chunks} chunks"
+                        if result.status == "success"
+                        else f"✗ {result.key} — {result.error}"
+                    ),
+                    detail=result.key,
+                    count=done,
+                    total=len(pending),
+                    chunks=result.chunks,
+                ))
 
         ok      = sum(1 for r in results if r.status == "success")
         skipped = sum(1 for r in results if r.status == "skipped")
         failed  = sum(1 for r in results if r.status == "failed")
         logger.info(
             "✔ S3 ingestion complete",
-            extra={"bucket": self._bucket, "found": total_found,
+            extra={"bucket": self._bucket, "found": len(objects),
                    "ok": ok, "skipped": skipped, "failed": failed},
         )
         return results
+
+    # ── Private ───────────────────────────────────────────────────────────────
+
+    def _list_supported(self, prefix: str) -> list[dict]:
+        """Return listing entries for every object with a supported extension."""
+        paginator = self._client.get_paginator("list_objects_v2")
+        objects: list[dict] = []
+        for page in paginator.paginate(Bucket=self._bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                key = obj["Key"]
+                ext = "." + key.rsplit(".", 1)[-1].lower() if "." in key else ""
+                if ext not in _SUPPORTED_EXTS:
+                    logger.debug("Skipping unsupported file type", extra={"key": key, "ext": ext})
+                    continue
+                objects.append(obj)
+        return objects
+
+    def _ingest_object(
+        self,
+        obj: dict,
+        *,
+        asset_num: Optional[str],
+        category: str,
+        tags: list[str],
+        download_slots: threading.BoundedSemaphore,
+    ) -> S3IngestResult:
+        """Download → extract → embed/index a single object."""
+        key = obj["Key"]
+        file_name = key.split("/")[-1]
+        etag = obj.get("ETag", "").strip('"')
+        try:
+            with download_slots:
+                logger.info("⬇ Downloading", extra={"key": key, "size_bytes": obj.get("Size", "?")})
+                file_bytes = self._client.get_object(Bucket=self._bucket, Key=key)["Body"].read()
+            meta = DocumentMetadata(
+                document_id=key,
+                file_name=file_name,
+                file_type="application/octet-stream",
+                file_size=len(file_bytes),
+                upload_date=datetime.utcnow(),
+                version=1,
+                asset_num=asset_num,
+                category=category,
+                tags=tags,
+                etag=etag,
+            )
+            res = document_processor_service.process_document(file_bytes, file_name, meta)
+            if res.status == "success":
+                document_registry_service.register_document(key, file_name, res.total_chunks, etag)
+            job_store_service.append(
+                document_id=key,
+                file_name=file_name,
+                status=res.status,
+                source="s3",
+                chunk_count=res.total_chunks,
+                error=res.error,
+            )
+            return S3IngestResult(key=key, status=res.status, chunks=res.total_chunks, error=res.error)
+        except Exception as exc:
+            logger.error("✘ S3 object ingest failed", extra={"key": key, "error": str(exc)}, exc_info=True)
+            job_store_service.append(
+                document_id=key,
+                file_name=file_name,
+                status="failed",
+                source="s3",
+                error=str(exc),
+            )
+            return S3IngestResult(key=key, status="failed", error=str(exc))
+
+    @staticmethod
+    def _progress(job_id: Optional[str], event: ProgressEvent) -> None:
+        if job_id:
+            progress_service.push(job_id, event)
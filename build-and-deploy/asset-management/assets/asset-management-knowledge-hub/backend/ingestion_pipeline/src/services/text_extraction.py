@@ -0,0 +1,211 @@
+"""Text extraction for PDF, DOCX and TXT documents.
+
+Kept free of service singletons (OpenSearch / WatsonX clients) so the
+functions can be shipped to worker processes by :func:`extraction_pool`
+without dragging the rest of the pipeline along.
+
+PDFs are extracted as a stream of ``(page_number, text)`` segments. Pages
+are split into slices of ``INGEST_PDF_PAGES_PER_SLICE`` that are extracted
+in parallel worker processes and yielded back in page order, so a large
+manual neither pins a single core nor has to be held in memory as one
+string. Each slice first tries pdfium's text layer (fast, no layout
+analysis) and only falls back to pdfplumber for pages where that finds no
+text.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Iterator, Optional, Union
+
+import pdfplumber  # type: ignore
+import mammoth  # type: ignore
+
+try:
+    import pypdfium2 as pdfium  # type: ignore  # installed with pdfplumber
+except ImportError:  # pragma: no cover
+    pdfium = None
+
+from ingestion_pipeline.src.config import ingestion as cfg
+
+# A segment is (1-based page number or None for unpaginated formats, text)
+Segment = tuple[Optional[int], str]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# pdfium is not thread-safe; guards the few calls made in this (threaded) process
+_pdfium_lock = threading.Lock()
+# How often a waiting consumer checks whether a running slice is over budget
+_WAIT_POLL_SECONDS = 0.5
+
+
+class ExtractionTimeout(TimeoutError):
+    """Raised when extracting a document takes longer than ``INGEST_PDF_TIME_BUDGET``."""
+
+
+def extraction_pool() -> ProcessPoolExecutor:
+    """Return the process-wide extraction pool (``INGEST_EXTRACT_WORKERS`` processes)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max(1, cfg.extract_workers))
+        return _pool
+
+
+def iter_segments(data: bytes, file_name: str) -> Iterator[Segment]:
+    """Yield the text of *data* as segments, extracting in the worker pool."""
+    ext = file_name.rsplit(".", 1)[-1].lower()
+    if ext == "pdf":
+        yield from iter_pdf_pages(data)
+    elif ext == "docx":
+        yield None, extraction_pool().submit(extract_docx, data).result(timeout=cfg.pdf_time_budget)
+    elif ext == "txt":
+        yield None, data.decode("utf-8", errors="replace")
+    else:
+        raise ValueError(f"Unsupported file type: .{ext}")
+
+
+def extract_docx(data: bytes) -> str:
+    result = mammoth.extract_raw_text(io.BytesIO(data))
+    return result.value
+
+
+def iter_pdf_pages(data: bytes, *, time_budget: Optional[float] = None) -> Iterator[Segment]:
+    """Yield ``(page_number, text)`` for every page of the PDF, in order.
+
+    Slices are submitted to :func:`extraction_pool` a bounded window ahead of
+    the consumer. Raises :class:`ExtractionTimeout` once extraction of this
+    document has taken more than *time_budget* seconds (default
+    ``INGEST_PDF_TIME_BUDGET``). Only time spent extracting counts: time the
+    consumer spends on yielded pages and time slices wait in the shared pool
+    queue do not. Pages already yielded stay yielded.
+    """
+    budget = time_budget or cfg.pdf_time_budget
+    spent = 0.0
+    pages = _page_count(data)
+    step = max(1, cfg.pdf_pages_per_slice)
+    slices = [(start, min(start + step, pages)) for start in range(0, pages, step)]
+    pool = extraction_pool()
+
+    # Multi-slice documents go to workers by path so the bytes are not
+    # pickled once per slice.
+    spool: Optional[str] = None
+    source: Union[bytes, str] = data
+    if len(slices) > 1:
+        fd, spool = tempfile.mkstemp(suffix=".pdf")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        source = spool
+
+    def timeout(page: int) -> ExtractionTimeout:
+        return ExtractionTimeout(f"PDF extraction exceeded {budget:.0f}s at page {page} of {pages}")
+
+    window = max(2, 2 * cfg.extract_workers)
+    in_flight: deque = deque()
+    try:
+        todo = iter(slices)
+        for start, stop in todo:
+            in_flight.append((start, pool.submit(_extract_pdf_slice, source, start, stop, budget)))
+            if len(in_flight) >= window:
+                break
+        while in_flight:
+            start, fut = in_flight.popleft()
+            texts, elapsed = _await_slice(fut, budget - spent, lambda: timeout(start + 1))
+            spent += elapsed
+            if spent > budget:
+                raise timeout(start + len(texts))
+            nxt = next(todo, None)
+            if nxt is not None:
+                in_flight.append((nxt[0], pool.submit(_extract_pdf_slice, source, *nxt, budget - spent)))
+            for offset, text in enumerate(texts):
+                yield start + offset + 1, text
+    finally:
+        for _, fut in in_flight:
+            fut.cancel()
+        if spool:
+            try:
+                os.unlink(spool)
+            except OSError:
+                pass
+
+
+def _await_slice(fut, remaining: float, on_timeout) -> tuple[list[str], float]:
+    """Wait for a slice; give up once it has been *running* longer than *remaining*.
+
+    Guards against a page that hangs in a worker. Time the slice spends queued
+    behind other documents' slices is not counted.
+    """
+    running_for = 0.0
+    while True:
+        try:
+            return fut.result(timeout=_WAIT_POLL_SECONDS)
+        except FutureTimeout:
+            if fut.done():
+                # The slice itself raised (ExtractionTimeout is a TimeoutError too)
+                raise
+            if fut.running():
+                running_for += _WAIT_POLL_SECONDS
+                if running_for > remaining:
+                    raise on_timeout() from None
+
+
+# ── Worker-side helpers ───────────────────────────────────────────────────────
+
+def _page_count(source: Union[bytes, str]) -> int:
+    # Called from the ingest threads of the parent process, hence the lock
+    if pdfium is not None:
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(source)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+    with pdfplumber.open(_open_arg(source)) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_pdf_slice(
+    source: Union[bytes, str], start: int, stop: int, budget: float
+) -> tuple[list[str], float]:
+    """Return the text of pages ``[start, stop)`` (0-based) of a PDF and the seconds it took.
+
+    Raises :class:`ExtractionTimeout` between pages once *budget* seconds are used up.
+    """
+    began = time.monotonic()
+
+    def check(page: int) -> None:
+        if time.monotonic() - began > budget:
+            raise ExtractionTimeout(f"PDF extraction exceeded the time budget at page {page + 1}")
+
+    texts: list[str] = [""] * (stop - start)
+    if cfg.pdf_fast_path and pdfium is not None:
+        pdf = pdfium.PdfDocument(source)
+        try:
+            for i in range(start, stop):
+                check(i)
+                page = pdf[i]
+                textpage = page.get_textpage()
+                texts[i - start] = textpage.get_text_range().replace("\r\n", "\n")
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+
+    # Layout analysis only where the text layer came back empty
+    missing = [i for i, text in enumerate(texts) if not text.strip()]
+    if missing:
+        with pdfplumber.open(_open_arg(source)) as pdf:
+            for i in missing:
+                check(start + i)
+                texts[i] = pdf.pages[start + i].extract_text() or ""
+    return texts, time.monotonic() - began
+
+
+def _open_arg(source: Union[bytes, str]):
+    return io.BytesIO(source) if isinstance(source, bytes) else source
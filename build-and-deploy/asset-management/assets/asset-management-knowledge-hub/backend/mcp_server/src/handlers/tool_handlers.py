@@ -263,30 +263,41 @@ async def handle_intelligent_query(args: dict) -> dict:
         last_result["objectStructure"] = ", ".join(os_list)
         return last_result
 
-    def _rag_call():
-        if not use_documents:
-            return []
-        embedding = None
+    def _embed_query():
+        if not (use_documents or use_web):
+            return None
         try:
-            embedding = wx.embed([query])[0]
+            return wx.embed([query])[0]
         except Exception as emb_exc:
             logger.warning("Embedding failed — falling back to keyword search", extra={"error": str(emb_exc)})
+            return None
+
+    def _rag_call(embedding):
+        if not use_documents:
+            return []
         filters = {"assetnum": assetnum} if assetnum else {}
         hits = opensearch_service.hybrid_search(query, embedding, filters, max_results)
         logger.info("✔ Document search response", extra={"hits": len(hits)})
         return hits
 
-    def _web_call():
+    def _web_call(embedding):
         if not use_web:
             return []
-        hits = opensearch_service.web_knowledge_search(query, max_results)
+        hits = opensearch_service.web_knowledge_search(query, max_results, embedding)
         logger.info("✔ Web knowledge search response", extra={"hits": len(hits)})
         return hits
 
+    # One embedding call is shared by both hybrid searches; Maximo does not
+    # wait for it.
+    embedding_future = loop.run_in_executor(None, _embed_query)
+
+    async def _with_embedding(fn):
+        return await loop.run_in_executor(None, fn, await embedding_future)
+
     maximo_result, rag_result, web_result = await asyncio.gather(
         loop.run_in_executor(None, _maximo_call),
-        loop.run_in_executor(None, _rag_call),
-        loop.run_in_executor(None, _web_call),
+        _with_embedding(_rag_call),
+        _with_embedding(_web_call),
         return_exceptions=True,
     )
 
@@ -1,28 +1,37 @@
-"""Chat history store — persists sessions per user as a JSON file on the server.
-
-File location: <project-root>/chat_history.json
-
-Storage structure:
-    {
-        "<username>": [
-            {
-                "id":           <int>   — first user message id (stable dedup key),
-                "title":        <str>   — first user message text, max 60 chars,
-                "created_at":   <str>   — ISO-8601, set once when session first saved,
-                "updated_at":   <str>   — ISO-8601, updated on every upsert,
-                "message_count":<int>   — number of user messages in this session,
-                "messages":     [ ... ] — slimmed message objects
-            },
-            ...
-        ],
-        ...
-    }
+"""Chat history store — persists sessions per user in sharded SQLite files.
+
+Location: /tmp/chat_history/shard-<n>.db  (``_SHARD_COUNT`` files)
+
+Each user is pinned to one shard by a stable hash of the username, so users
+on different shards never contend for the same lock or database file. Every
+shard runs in WAL mode and holds a single table:
+
+    sessions(
+        username      TEXT     — owner, part of the primary key,
+        id            INTEGER  — first user message id (stable dedup key),
+        seq           INTEGER  — per-user write sequence, newest = highest,
+        created_at    TEXT     — ISO-8601, set once when session first saved,
+        updated_at    TEXT     — ISO-8601, updated on every upsert,
+        data          TEXT     — the full session object as compact JSON
+                                 (title, message_count, messages, …)
+    )
+
+Lookups go through the ``(username, id)`` primary key and the
+``(username, seq)`` index, and each upsert / delete touches only the rows it
+changes — write cost no longer depends on how many users or sessions exist.
+Per-user compaction keeps at most ``_MAX_SESSIONS`` sessions, dropping the
+least recently updated.
+
+A legacy ``/tmp/chat_history.json`` file is imported once on first use and
+renamed to ``chat_history.json.migrated``.
 """
 
 from __future__ import annotations
 
 import json
+import sqlite3
 import threading
+import zlib
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -34,38 +43,99 @@ logger = get_logger(__name__)
 # Write to /tmp which is always writable in CE containers (uid 1001).
 # Resolving relative to __file__ (/app/backend/…) would land in /app/ which
 # is owned by root and not writable by the non-root runtime user.
-_HISTORY_FILE = Path("/tmp/chat_history.json")
+_HISTORY_DIR  = Path("/tmp/chat_history")
+_LEGACY_FILE  = Path("/tmp/chat_history.json")
+_SHARD_COUNT  = 8
 _MAX_SESSIONS = 50
-_lock         = threading.Lock()
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    username   TEXT    NOT NULL,
+    id         INTEGER NOT NULL,
+    seq        INTEGER NOT NULL,
+    created_at TEXT    NOT NULL,
+    updated_at TEXT    NOT NULL,
+    data       TEXT    NOT NULL,
+    PRIMARY KEY (username, id)
+);
+CREATE INDEX IF NOT EXISTS sessions_by_recency ON sessions (username, seq DESC);
+"""
 
-# ── Internal I/O ──────────────────────────────────────────────────────────────
 
-def _read() -> dict[str, list]:
-    """Read the full history file; return empty dict on any error."""
-    try:
-        if _HISTORY_FILE.exists():
-            data = json.loads(_HISTORY_FILE.read_text(encoding="utf-8"))
-            # Support old flat-list format (pre-user-specific): migrate to dict
-            if isinstance(data, list):
-                logger.info("history_store: migrating flat list → user-keyed dict")
-                return {"default": data}
-            return data
-    except Exception as exc:
-        logger.warning("history_store: could not read file", extra={"error": str(exc)})
-    return {}
+class _Shard:
+    """One SQLite database file plus the lock that serialises access to it."""
+
+    def __init__(self, path: Path) -> None:
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
 
 
-def _write(data: dict[str, list]) -> None:
-    """Write the full history dict to disk."""
+_shards: list[_Shard] = []
+_init_lock = threading.Lock()
+
+
+# ── Internal I/O ──────────────────────────────────────────────────────────────
+
+def _all_shards() -> list[_Shard]:
+    """Open the shard files on first use (and import any legacy JSON file)."""
+    if _shards:
+        return _shards
+    with _init_lock:
+        if not _shards:
+            _HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+            opened = [_Shard(_HISTORY_DIR / f"shard-{n}.db") for n in range(_SHARD_COUNT)]
+            _migrate_legacy(opened)
+            _shards.extend(opened)
+    return _shards
+
+
+def _shard(username: str) -> _Shard:
+    """Return the shard a user's sessions live in (stable across restarts)."""
+    shards = _all_shards()
+    return shards[zlib.crc32(username.encode("utf-8")) % len(shards)]
+
+
+def _migrate_legacy(shards: list[_Shard]) -> None:
+    """Import the pre-sharding single-file history, oldest session first."""
+    if not _LEGACY_FILE.exists():
+        return
     try:
-        _HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        _HISTORY_FILE.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        data = json.loads(_LEGACY_FILE.read_text(encoding="utf-8"))
     except Exception as exc:
-        logger.error("history_store: could not write file", extra={"error": str(exc)})
+        logger.warning("history_store: could not read legacy file", extra={"error": str(exc)})
+        return
+    # Support old flat-list format (pre-user-specific)
+    if isinstance(data, list):
+        data = {"default": data}
+    for username, sessions in data.items():
+        shard = shards[zlib.crc32(username.encode("utf-8")) % len(shards)]
+        with shard.conn:
+            for session in reversed(sessions[:_MAX_SESSIONS]):
+                _insert(shard, username, session)
+    _LEGACY_FILE.rename(_LEGACY_FILE.with_name(_LEGACY_FILE.name + ".migrated"))
+    logger.info("history_store: migrated legacy JSON history", extra={"users": len(data)})
+
+
+def _insert(shard: _Shard, username: str, session: dict[str, Any]) -> None:
+    """Write *session* as the newest row for *username* (caller holds the lock)."""
+    (seq,) = shard.conn.execute(
+        "SELECT COALESCE(MAX(seq), 0) + 1 FROM sessions WHERE username = ?", (username,)
+    ).fetchone()
+    shard.conn.execute(
+        "INSERT OR REPLACE INTO sessions (username, id, seq, created_at, updated_at, data) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            username,
+            session["id"],
+            seq,
+            session.get("created_at") or _now(),
+            session.get("updated_at") or _now(),
+            json.dumps(session, ensure_ascii=False, separators=(",", ":")),
+        ),
+    )
 
 
 def _now() -> str:
@@ -76,63 +146,71 @@ def _now() -> str:
 
 def get_all(username: str) -> list[dict]:
     """Return all sessions for a user, newest first."""
-    with _lock:
-        return _read().get(username, [])
+    shard = _shard(username)
+    with shard.lock:
+        rows = shard.conn.execute(
+            "SELECT data FROM sessions WHERE username = ? ORDER BY seq DESC",
+            (username,),
+        ).fetchall()
+    return [json.loads(data) for (data,) in rows]
 
 
 def upsert(username: str, session: dict[str, Any]) -> None:
     """Insert or update a session for a user (matched by session['id'])."""
-    with _lock:
-        data       = _read()
-        sessions   = data.get(username, [])
-        session_id = session["id"]
-
-        existing = next((s for s in sessions if s["id"] == session_id), None)
-
-        # Preserve created_at from the first save; always refresh updated_at
-        now = _now()
-        session["created_at"]    = existing["created_at"] if existing else now
-        session["updated_at"]    = now
-        session["message_count"] = len([m for m in session.get("messages", []) if m.get("type") == "user"])
-
-        sessions = [s for s in sessions if s["id"] != session_id]
-        sessions = [session] + sessions
-        sessions = sessions[:_MAX_SESSIONS]
-
-        data[username] = sessions
-        _write(data)
+    shard = _shard(username)
+    try:
+        with shard.lock, shard.conn:
+            existing = shard.conn.execute(
+                "SELECT created_at FROM sessions WHERE username = ? AND id = ?",
+                (username, session["id"]),
+            ).fetchone()
+
+            # Preserve created_at from the first save; always refresh updated_at
+            now = _now()
+            session["created_at"]    = existing[0] if existing else now
+            session["updated_at"]    = now
+            session["message_count"] = len([m for m in session.get("messages", []) if m.get("type") == "user"])
+
+            _insert(shard, username, session)
+            if not existing:
+                # Compaction — only a new session can push the user over the cap
+                shard.conn.execute(
+                    "DELETE FROM sessions WHERE username = ? AND seq NOT IN "
+                    "(SELECT seq FROM sessions WHERE username = ? ORDER BY seq DESC LIMIT ?)",
+                    (username, username, _MAX_SESSIONS),
+                )
+    except Exception as exc:
+        logger.error("history_store: could not write session", extra={"error": str(exc)})
 
 
 def delete(username: str, session_id: int) -> bool:
     """Remove a session for a user. Returns True if it existed."""
-    with _lock:
-        data     = _read()
-        sessions = data.get(username, [])
-        filtered = [s for s in sessions if s["id"] != session_id]
-        if len(filtered) == len(sessions):
-            return False
-        data[username] = filtered
-        _write(data)
-        return True
+    shard = _shard(username)
+    with shard.lock, shard.conn:
+        cur = shard.conn.execute(
+            "DELETE FROM sessions WHERE username = ? AND id = ?",
+            (username, session_id),
+        )
+        return cur.rowcount > 0
 
 
 def delete_all(username: str) -> None:
     """Delete all sessions for a user."""
-    with _lock:
-        data = _read()
-        data[username] = []
-        _write(data)
+    shard = _shard(username)
+    with shard.lock, shard.conn:
+        shard.conn.execute("DELETE FROM sessions WHERE username = ?", (username,))
 
 
 def get_all_users() -> list[dict]:
     """Return a summary of all users and their session counts (admin view)."""
-    with _lock:
-        data = _read()
-        return [
-            {
-                "username":      user,
-                "session_count": len(sessions),
-                "last_active":   sessions[0]["updated_at"] if sessions else None,
-            }
-            for user, sessions in data.items()
-        ]
+    users: list[dict] = []
+    for shard in _all_shards():
+        with shard.lock:
+            rows = shard.conn.execute(
+                "SELECT username, COUNT(*), MAX(updated_at) FROM sessions GROUP BY username"
+            ).fetchall()
+        users.extend(
+            {"username": user, "session_count": count, "last_active": last_active}
+            for user, count, last_active in rows
+        )
+    return users
@@ -46,7 +46,13 @@ class OpenSearchService:
         filters: Optional[dict] = None,
         limit: int = 10,
     ) -> list[dict]:
-        """Keyword + optional vector search over the documents index.
+        """Hybrid BM25 + kNN search over the documents index.
+
+        The keyword and vector queries are sent together in one ``_msearch``
+        round trip, both pre-filtered on the metadata filters, and their
+        ranked lists are fused client-side (reciprocal-rank fusion by default,
+        see ``OPENSEARCH_HYBRID_FUSION``). Without an embedding — or if the
+        index has no ``knn_vector`` mapping yet — the BM25 ranking is used as-is.
 
         Args:
             query:     User's natural-language query.
@@ -59,59 +65,58 @@ class OpenSearchService:
             ``score``, ``metadata``, and ``highlights``.
         """
         filters = filters or {}
-        must: list[dict] = []
-        should: list[dict] = []
-
-        if query:
-            should.append({
-                "multi_match": {
-                    "query": query,
-                    "fields": ["content^2", "fileName", "metadata.section"],
-                    "type": "best_fields",
-                    "fuzziness": "AUTO",
-                }
-            })
-
-        # Vector search is disabled here until the index is recreated with a
-        # knn_vector mapping (see SEMANTIC_SEARCH_IMPLEMENTATION.md in old_code).
-        # When ready, uncomment the block below:
-        # if embedding:
-        #     should.append({"knn": {"embedding": {"vector": embedding, "k": limit}}})
-
-        for field, value in [
-            ("assetnum", filters.get("assetnum")),
-            ("category", filters.get("category")),
-            ("version", filters.get("version")),
-        ]:
-            if value:
-                must.append({"term": {f"metadata.{field}": value}})
-
-        body: dict = {
-            "query": {
-                "bool": {
-                    **({"must": must} if must else {}),
-                    **({"should": should, "minimum_should_match": 1} if should else {}),
-                }
-            },
-            "size": limit,
-            "highlight": {
-                "fields": {"content": {"fragment_size": 150, "number_of_fragments": 3}}
-            },
+        pre_filter = [
+            {"term": {f"metadata.{field}": value}}
+            for field, value in [
+                ("assetnum", filters.get("assetnum")),
+                ("category", filters.get("category")),
+                ("version", filters.get("version")),
+            ]
+            if value
+        ]
+        depth = max(limit, cfg.knn_candidates) if embedding else limit
+        keyword = {
+            "multi_match": {
+                "query": query,
+                "fields": ["content^2", "fileName", "metadata.section"],
+                "type": "best_fields",
+                "fuzziness": "AUTO",
+            }
         }
+        highlight = {"fields": {"content": {"fragment_size": 150, "number_of_fragments": 3}}}
 
-        response = self._client.search(index=self._index, body=body)
-        hits = response["hits"]["hits"]
-        logger.debug("Hybrid search done", extra={"hits": len(hits)})
+        searches: list[dict] = []
+        if query or not embedding:
+            searches.append({
+                "query": {
+                    "bool": {
+                        **({"filter": pre_filter} if pre_filter else {}),
+                        **({"should": [keyword], "minimum_should_match": 1} if query else {}),
+                    }
+                },
+                "size": depth,
+                "highlight": highlight,
+                "_source": {"excludes": ["embedding"]},
+            })
+        if embedding:
+            searches.append(_knn_body(embedding, depth, pre_filter, highlight, keyword if query else None))
+
+        ranked = self._msearch(self._index, searches)
+        hits = _fuse(ranked, key=lambda h: h["_id"], limit=limit)
+        logger.debug(
+            "Hybrid search done",
+            extra={"hits": len(hits), "lists": [len(r) for r in ranked], "fusion": cfg.hybrid_fusion},
+        )
         return [
             {
                 "documentId": h["_source"].get("documentId"),
                 "fileName": h["_source"].get("fileName"),
                 "content": h["_source"].get("content"),
-                "score": h["_score"],
+                "score": score,
                 "metadata": h["_source"].get("metadata", {}),
                 "highlights": h.get("highlight", {}).get("content", []),
             }
-            for h in hits
+            for h, score in hits
         ]
 
     def get_document_chunks(self, document_id: str) -> list[dict]:
@@ -167,30 +172,48 @@ class OpenSearchService:
 
     # ── Web knowledge index ───────────────────────────────────────────────────
 
-    def web_knowledge_search(self, query: str, limit: int = 5) -> list[dict]:
-        """Keyword search over the web-knowledge index (populated by spiderbot).
+    def web_knowledge_search(
+        self,
+        query: str,
+        limit: int = 5,
+        embedding: Optional[list[float]] = None,
+    ) -> list[dict]:
+        """Hybrid search over the web-knowledge index (populated by spiderbot).
+
+        Uses the ``embedding`` vectors spiderbot writes alongside BM25 when a
+        query embedding is supplied; results are fused and de-duplicated so at
+        most one chunk per URL is returned.
 
         Returns an empty list if the index does not yet exist — callers should
         treat an empty result as "source not available" rather than an error.
         """
-        body = {
-            "query": {
-                "multi_match": {
-                    "query": query,
-                    "fields": ["content^3", "title^2", "siteLabel", "topic"],
-                    "type": "best_fields",
-                    "fuzziness": "AUTO",
-                }
-            },
-            "size": limit,
-            "highlight": {
-                "fields": {"content": {"fragment_size": 200, "number_of_fragments": 2}}
-            },
-            "_source": ["url", "title", "siteLabel", "topic", "content"],
-            "collapse": {"field": "url.keyword"},  # one result per unique URL
+        depth = max(limit, cfg.knn_candidates) if embedding else limit
+        keyword = {
+            "multi_match": {
+                "query": query,
+                "fields": ["content^3", "title^2", "siteLabel", "topic"],
+                "type": "best_fields",
+                "fuzziness": "AUTO",
+            }
         }
+        highlight = {"fields": {"content": {"fragment_size": 200, "number_of_fragments": 2}}}
+        source = ["url", "title", "siteLabel", "topic", "content"]
+
+        searches: list[dict] = [{
+            "query": keyword,
+            "size": depth,
+            "highlight": highlight,
+            "_source": source,
+            "collapse": {"field": "url.keyword"},  # one result per unique URL
+        }]
+        if embedding:
+            knn = _knn_body(embedding, depth, [], highlight, keyword)
+            knn["_source"] = source
+            knn["collapse"] = {"field": "url.keyword"}
+            searches.append(knn)
+
         try:
-            response = self._client.search(index=_WEB_INDEX, body=body)
+            ranked = self._msearch(_WEB_INDEX, searches)
         except Exception as exc:
             if "index_not_found" in str(exc).lower():
                 logger.warning("Web knowledge index not found — skipping")
@@ -198,7 +221,7 @@ class OpenSearchService:
             logger.error("Web knowledge search error", extra={"error": str(exc)})
             return []
 
-        hits = response["hits"]["hits"]
+        hits = _fuse(ranked, key=lambda h: h["_source"].get("url") or h["_id"], limit=limit)
         return [
             {
                 "url": h["_source"].get("url"),
@@ -206,12 +229,113 @@ class OpenSearchService:
                 "siteLabel": h["_source"].get("siteLabel"),
                 "topic": h["_source"].get("topic"),
                 "content": h["_source"].get("content"),
-                "score": h["_score"],
+                "score": score,
                 "highlights": h.get("highlight", {}).get("content", []),
             }
-            for h in hits
+            for h, score in hits
         ]
 
+    # ── Private ───────────────────────────────────────────────────────────────
+
+    def _msearch(self, index: str, searches: list[dict]) -> list[list[dict]]:
+        """Run *searches* against *index* in a single ``_msearch`` request.
+
+        Returns one hit list per search, in order. A search that fails on the
+        server (e.g. kNN against an index without a ``knn_vector`` mapping) is
+        logged and contributes an empty list so the others still count.
+        """
+        body: list[dict] = []
+        for search in searches:
+            body.append({"index": index})
+            body.append(search)
+        response = self._client.msearch(body=body)
+
+        ranked: list[list[dict]] = []
+        for search, result in zip(searches, response["responses"]):
+            if "error" in result:
+                error = result["error"]
+                reason = error.get("type", str(error)) if isinstance(error, dict) else str(error)
+                if "index_not_found" in reason:
+                    logger.warning("Index not found — skipping", extra={"index": index})
+                else:
+                    logger.warning(
+                        "Sub-search failed — fusing remaining results",
+                        extra={"index": index, "kind": "knn" if "knn" in search["query"] else "bm25", "error": reason},
+                    )
+                ranked.append([])
+                continue
+            ranked.append(result["hits"]["hits"])
+        return ranked
+
+
+def _knn_body(
+    embedding: list[float],
+    k: int,
+    pre_filter: list[dict],
+    highlight: dict,
+    highlight_query: Optional[dict],
+) -> dict:
+    """Build an approximate kNN search body with an efficient (pre-)filter.
+
+    The ``filter`` is applied inside the kNN clause so the Lucene engine
+    restricts the HNSW traversal to matching documents rather than dropping
+    hits after the top-k have been chosen.
+    """
+    knn: dict = {"vector": embedding, "k": k}
+    if pre_filter:
+        knn["filter"] = {"bool": {"filter": pre_filter}}
+    body: dict = {
+        "query": {"knn": {"embedding": knn}},
+        "size": k,
+        "_source": {"excludes": ["embedding"]},
+    }
+    if highlight_query:
+        # Vector hits carry no matched terms — borrow the keyword query so
+        # the UI still gets highlighted fragments.
+        body["highlight"] = {**highlight, "highlight_query": highlight_query}
+    return body
+
+
+def _fuse(ranked: list[list[dict]], key, limit: int) -> list[tuple[dict, float]]:
+    """Merge ranked hit lists into one list of ``(hit, fused_score)``.
+
+    ``rrf`` sums ``1 / (k + rank)`` across lists; ``normalized`` min-max scales
+    each list's scores and combines them with ``OPENSEARCH_KNN_WEIGHT`` (the
+    last list is taken to be the kNN one). A single non-empty list is returned
+    with its native scores.
+    """
+    non_empty = [hits for hits in ranked if hits]
+    if len(non_empty) <= 1:
+        hits = non_empty[0] if non_empty else []
+        return [(h, h.get("_score") or 0.0) for h in hits[:limit]]
+
+    scores: dict = {}
+    best: dict = {}
+    for pos, hits in enumerate(ranked):
+        seen: set = set()
+        if cfg.hybrid_fusion == "normalized":
+            weight = cfg.knn_weight if pos == len(ranked) - 1 else 1.0 - cfg.knn_weight
+            raw = [h.get("_score") or 0.0 for h in hits]
+            lo, hi = (min(raw), max(raw)) if raw else (0.0, 0.0)
+            span = hi - lo
+        for rank, hit in enumerate(hits):
+            k = key(hit)
+            if k in seen:
+                continue
+            seen.add(k)
+            if cfg.hybrid_fusion == "normalized":
+                norm = (raw[rank] - lo) / span if span else 1.0
+                contribution = weight * norm
+            else:
+                contribution = 1.0 / (cfg.rrf_k + rank + 1)
+            scores[k] = scores.get(k, 0.0) + contribution
+            # Keep the first copy seen, but prefer one that has highlights
+            if k not in best or (not best[k].get("highlight") and hit.get("highlight")):
+                best[k] = hit
+
+    ordered = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+    return [(best[k], score) for k, score in ordered]
+
 
 # Module-level singleton
 opensearch_service = OpenSearchService()
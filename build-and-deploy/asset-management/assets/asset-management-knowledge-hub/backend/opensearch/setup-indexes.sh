@@ -114,8 +114,10 @@ create_index() {
 # Index 1 — maximo-documents
 #   Stores chunked PDF / document content for RAG queries.
 #   Fields: documentId, fileName, content, chunkIndex, metadata (assetnum,
-#           category, version, source), embedding (knn_vector, disabled until
-#           KNN plugin is confirmed).
+#           category, version, source), embedding (knn_vector, used by the
+#           MCP server's hybrid kNN + BM25 search).
+#   Indexes created before the embedding mapping was added can be migrated
+#   in place with:  python -m ingestion_pipeline --migrate-knn
 # =============================================================================
 DOC_MAPPING=$(cat <<'EOF'
 {
@@ -123,7 +125,8 @@ DOC_MAPPING=$(cat <<'EOF'
     "number_of_shards":   1,
     "number_of_replicas": 0,
     "index": {
-      "refresh_interval": "5s"
+      "refresh_interval": "5s",
+      "knn": true
     }
   },
   "mappings": {
@@ -133,6 +136,11 @@ DOC_MAPPING=$(cat <<'EOF'
       "content":     { "type": "text",    "analyzer": "english" },
       "chunkIndex":  { "type": "integer" },
       "indexedAt":   { "type": "date" },
+      "embedding": {
+        "type": "knn_vector",
+        "dimension": 384,
+        "method": { "name": "hnsw", "space_type": "cosinesimil", "engine": "lucene" }
+      },
       "metadata": {
         "properties": {
           "assetnum": { "type": "keyword" },
@@ -160,7 +168,8 @@ WEB_MAPPING=$(cat <<'EOF'
     "number_of_shards":   1,
     "number_of_replicas": 0,
     "index": {
-      "refresh_interval": "5s"
+      "refresh_interval": "5s",
+      "knn": true
     }
   },
   "mappings": {
@@ -174,7 +183,12 @@ WEB_MAPPING=$(cat <<'EOF'
       "topic":      { "type": "text",    "fields": { "keyword": { "type": "keyword" } } },
       "content":    { "type": "text",    "analyzer": "english" },
       "crawledAt":  { "type": "date" },
-      "chunkIndex": { "type": "integer" }
+      "chunkIndex": { "type": "integer" },
+      "embedding": {
+        "type": "knn_vector",
+        "dimension": 384,
+        "method": { "name": "hnsw", "space_type": "cosinesimil", "engine": "lucene" }
+      }
     }
   }
 }
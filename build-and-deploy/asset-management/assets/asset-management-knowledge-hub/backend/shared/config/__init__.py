@@ -39,6 +39,11 @@ class OpenSearchConfig:
     password: str = os.environ.get("OPENSEARCH_PASSWORD", "admin")
     index: str = os.environ.get("OPENSEARCH_INDEX", "maximo-documents")
     verify_ssl: bool = _bool("OPENSEARCH_VERIFY_SSL", False)
+    # Hybrid retrieval — how kNN and BM25 result lists are merged
+    hybrid_fusion: str = os.environ.get("OPENSEARCH_HYBRID_FUSION", "rrf").lower()  # rrf | normalized
+    rrf_k: int = _int("OPENSEARCH_RRF_K", 60)
+    knn_weight: float = float(os.environ.get("OPENSEARCH_KNN_WEIGHT", "0.5"))
+    knn_candidates: int = _int("OPENSEARCH_KNN_CANDIDATES", 50)
 
 
 # ── WatsonX ───────────────────────────────────────────────────────────────────
@@ -8,7 +8,7 @@ from fastapi import APIRouter, HTTPException, Security
 from fastapi.security import APIKeyHeader
 from starlette.status import HTTP_403_FORBIDDEN, HTTP_500_INTERNAL_SERVER_ERROR
 
-from app.src.model.MetricsModel import MetricsQuery, MetricsSummary
+from app.src.model.MetricsModel import MetricsBatchQuery, MetricsQuery, MetricsSummary
 import app.src.services.MetricsService as metrics_svc
 
 logger = logging.getLogger(__name__)
@@ -47,3 +47,27 @@ async def get_quality_summary(
     except Exception as exc:
         logger.exception("get_quality_summary failed: %s", exc)
         raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc))
+
+
+@router.post(
+    "/quality-summaries",
+    summary="Get quality summaries for several runs",
+    description=(
+        "Returns the quality summary of each listed run, in request order. "
+        "Per-run Databand calls are fetched concurrently and finished runs are cached."
+    ),
+    response_model=list[MetricsSummary],
+)
+async def get_quality_summaries(
+    query: MetricsBatchQuery,
+    _: str = Security(_check_key),
+) -> list[MetricsSummary]:
+    try:
+        data = metrics_svc.get_runs_quality_summary(
+            run_uids=query.run_uids,
+            include_tasks=query.include_tasks,
+        )
+        return [MetricsSummary(**item) for item in data]
+    except Exception as exc:
+        logger.exception("get_quality_summaries failed: %s", exc)
+        raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc))
@@ -27,15 +27,19 @@ def _check_key(key: str = Security(_API_KEY_HEADER)) -> str:
 @router.get(
     "",
     summary="List all Databand pipelines",
-    description="Returns all pipelines visible to the configured Databand instance.",
+    description=(
+        "Returns pipelines visible to the configured Databand instance. "
+        "Set all_pages=true to fetch every page (pages are prefetched concurrently)."
+    ),
 )
 async def list_pipelines(
     page: int = 1,
     page_size: int = 50,
+    all_pages: bool = False,
     _: str = Security(_check_key),
 ) -> dict:
     try:
-        return pipeline_svc.list_pipelines(page=page, page_size=page_size)
+        return pipeline_svc.list_pipelines(page=page, page_size=page_size, all_pages=all_pages)
     except Exception as exc:
         logger.exception("list_pipelines failed: %s", exc)
         raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc))
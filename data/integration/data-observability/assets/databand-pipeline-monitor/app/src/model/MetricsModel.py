@@ -10,6 +10,11 @@ class MetricsQuery(BaseModel):
     include_tasks: bool = Field(True, description="Whether to include per-task metrics")
 
 
+class MetricsBatchQuery(BaseModel):
+    run_uids: list[str] = Field(..., min_length=1, max_length=200, description="Databand run UIDs")
+    include_tasks: bool = Field(False, description="Whether to include per-task metrics")
+
+
 class MetricsSummary(BaseModel):
     run_uid: str
     pipeline_name: str
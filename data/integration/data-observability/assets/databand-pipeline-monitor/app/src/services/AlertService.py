@@ -4,18 +4,13 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from app.src.utils.databand_client import DatabandClient
+from app.src.utils.databand_client import DatabandClient, get_client
 
 logger = logging.getLogger(__name__)
 
-_client: DatabandClient | None = None
-
 
 def _get_client() -> DatabandClient:
-    global _client
-    if _client is None:
-        _client = DatabandClient()
-    return _client
+    return get_client()
 
 
 def list_alerts() -> dict[str, Any]:
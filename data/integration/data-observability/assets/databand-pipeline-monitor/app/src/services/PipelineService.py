@@ -4,23 +4,25 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from app.src.utils.databand_client import DatabandClient
+from app.src.utils.databand_client import DatabandClient, get_client
 
 logger = logging.getLogger(__name__)
 
-_client: DatabandClient | None = None
-
 
 def _get_client() -> DatabandClient:
-    global _client
-    if _client is None:
-        _client = DatabandClient()
-    return _client
+    return get_client()
+
 
+def list_pipelines(page: int = 1, page_size: int = 50, all_pages: bool = False) -> dict[str, Any]:
+    """Return pipelines visible to the configured Databand instance.
 
-def list_pipelines(page: int = 1, page_size: int = 50) -> dict[str, Any]:
-    """Return all pipelines visible to the configured Databand instance."""
-    logger.info("Fetching pipeline list (page=%s, page_size=%s)", page, page_size)
+    With *all_pages*, every page is fetched (concurrently after the first)
+    and returned as ``{"data": [...], "total": n}``.
+    """
+    logger.info("Fetching pipeline list (page=%s, page_size=%s, all_pages=%s)", page, page_size, all_pages)
+    if all_pages:
+        pipelines = _get_client().list_all_pipelines(page_size=page_size)
+        return {"data": pipelines, "total": len(pipelines)}
     return _get_client().list_pipelines(page=page, page_size=page_size)
 
 
@@ -45,10 +47,8 @@ def get_pipeline_runs(
 def get_run_detail(run_uid: str) -> dict[str, Any]:
     """Fetch run metadata, metrics, and task runs for *run_uid*."""
     logger.info("Fetching run detail for uid=%s", run_uid)
-    client = _get_client()
-    run = client.get_run(run_uid)
-    metrics = client.get_run_metrics(run_uid)
-    tasks = client.get_run_tasks(run_uid)
+    bundle = _get_client().get_run_bundle(run_uid)
+    run, metrics, tasks = bundle["run"], bundle["metrics"], bundle["tasks"]
     return {
         "run_uid": run_uid,
         "pipeline_name": run.get("pipeline_name", ""),
@@ -2,37 +2,91 @@
 IBM Databand client — wraps the Databand REST API v1.
 Authentication: IBM IAM API key → Bearer token injected into every request.
 Databand API reference: https://databand.ai/docs/api
+
+All calls go through one keep-alive ``requests.Session`` whose adapter
+retries connection errors, 429 and 5xx (GETs only for status retries) with
+exponential backoff, honouring Retry-After. Per-run calls can be fanned out
+over a bounded thread pool, and data of finished runs (run, metrics, task
+runs — immutable once the run ends) is cached for DATABAND_CACHE_TTL seconds.
 """
 from __future__ import annotations
 
 import logging
 import os
+import threading
 import time
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
 
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Bounded parallelism for fan-out calls (also sizes the connection pool)
+MAX_WORKERS = int(os.getenv("DATABAND_MAX_WORKERS", "8"))
+# Seconds to keep data of finished runs
+CACHE_TTL = float(os.getenv("DATABAND_CACHE_TTL", "600"))
+CACHE_MAX_ENTRIES = 2000
+
+# Run states after which run data no longer changes
+FINISHED_STATES = frozenset({"success", "failed", "cancelled", "canceled", "shutdown", "completed", "aborted"})
+
+
+def _build_session(pool_size: int) -> requests.Session:
+    retry = Retry(
+        total=3,
+        backoff_factor=1.0,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _page_items(page: dict) -> list:
+    """Items of a paginated response, whichever envelope key the endpoint uses."""
+    for key in ("data", "pipelines", "results", "items"):
+        if isinstance(page.get(key), list):
+            return page[key]
+    return []
+
+
+def _page_total(page: dict) -> int | None:
+    meta = page.get("meta") if isinstance(page.get("meta"), dict) else {}
+    for source in (page, meta):
+        for key in ("total", "total_count", "count"):
+            if isinstance(source.get(key), int):
+                return source[key]
+    return None
+
 
 class IAMTokenManager:
     """Fetches and caches an IBM Cloud IAM bearer token."""
 
     _IAM_URL = "https://iam.cloud.ibm.com/identity/token"
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, session: requests.Session | None = None) -> None:
         self._api_key = api_key
+        self._session = session or requests.Session()
         self._token: str | None = None
         self._expiry: float = 0.0
+        self._lock = threading.Lock()
 
     def get_token(self) -> str:
-        if not self._token or time.time() >= self._expiry:
-            self._refresh()
-        return self._token  # type: ignore[return-value]
+        with self._lock:
+            if not self._token or time.time() >= self._expiry:
+                self._refresh()
+            return self._token  # type: ignore[return-value]
 
     def _refresh(self) -> None:
-        resp = requests.post(
+        resp = self._session.post(
             self._IAM_URL,
             headers={"Content-Type": "application/x-www-form-urlencoded"},
             data={
@@ -63,14 +117,22 @@ class DatabandClient:
         databand_url: str | None = None,
         access_token: str | None = None,
         ibm_api_key: str | None = None,
+        max_workers: int = MAX_WORKERS,
+        cache_ttl: float = CACHE_TTL,
     ) -> None:
         self._base = (databand_url or os.environ["DATABAND_URL"]).rstrip("/")
+        self._max_workers = max_workers
+        self._session = _build_session(max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="databand")
+        self._cache_ttl = cache_ttl
+        self._cache: dict[str, tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()
         # Prefer a static personal-access-token; fall back to IAM-derived token.
         self._static_token: str | None = access_token or os.getenv("DATABAND_ACCESS_TOKEN")
         self._iam: IAMTokenManager | None = None
         if not self._static_token:
             key = ibm_api_key or os.environ["IBM_API_KEY"]
-            self._iam = IAMTokenManager(key)
+            self._iam = IAMTokenManager(key, self._session)
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -80,27 +142,50 @@ class DatabandClient:
         token = self._static_token if self._static_token else self._iam.get_token()  # type: ignore[union-attr]
         return {"Authorization": f"Bearer {token}"}
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def _get(self, path: str, params: dict | None = None) -> Any:
         url = f"{self._base}/api/v1{path}"
-        resp = requests.get(url, headers=self._auth_header(), params=params, timeout=30)
+        resp = self._session.get(url, headers=self._auth_header(), params=params, timeout=30)
         resp.raise_for_status()
         return resp.json()
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def _post(self, path: str, payload: dict) -> Any:
         url = f"{self._base}/api/v1{path}"
-        resp = requests.post(url, headers=self._auth_header(), json=payload, timeout=30)
+        resp = self._session.post(url, headers=self._auth_header(), json=payload, timeout=30)
         resp.raise_for_status()
         return resp.json()
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def _patch(self, path: str, payload: dict) -> Any:
         url = f"{self._base}/api/v1{path}"
-        resp = requests.patch(url, headers=self._auth_header(), json=payload, timeout=30)
+        resp = self._session.patch(url, headers=self._auth_header(), json=payload, timeout=30)
         resp.raise_for_status()
         return resp.json()
 
+    def _cache_get(self, key: str) -> Any | None:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() > entry[0]:
+                del self._cache[key]
+                return None
+            return entry[1]
+
+    def _cache_set(self, key: str, value: Any) -> None:
+        with self._cache_lock:
+            if len(self._cache) >= CACHE_MAX_ENTRIES:
+                # Entries are inserted in expiry order, so the oldest come first
+                for stale in list(self._cache)[: CACHE_MAX_ENTRIES // 10]:
+                    del self._cache[stale]
+            self._cache[key] = (time.monotonic() + self._cache_ttl, value)
+
+    @staticmethod
+    def _is_finished(run: dict) -> bool:
+        return str(run.get("state", "")).lower() in FINISHED_STATES
+
+    def map(self, fn, items: Iterable) -> list:
+        """Apply *fn* to *items* on the client's bounded pool, preserving order."""
+        return list(self._pool.map(fn, items))
+
     # ------------------------------------------------------------------
     # Pipeline / Run endpoints
     # ------------------------------------------------------------------
@@ -109,6 +194,36 @@ class DatabandClient:
         """GET /pipelines — list all registered pipelines."""
         return self._get("/pipelines", params={"page": page, "page_size": page_size})
 
+    def list_all_pipelines(self, page_size: int = 50, max_pages: int = 100) -> list:
+        """Every pipeline, with the pages after the first fetched concurrently.
+
+        When the first page reports a total, all remaining pages are requested
+        at once; otherwise pages are prefetched in windows of MAX_WORKERS until
+        a short page marks the end.
+        """
+        first = self.list_pipelines(page=1, page_size=page_size)
+        items = list(_page_items(first))
+        if len(items) < page_size:
+            return items
+
+        total = _page_total(first)
+        fetch = lambda page: _page_items(self.list_pipelines(page=page, page_size=page_size))  # noqa: E731
+        if total is not None:
+            last = min(-(-total // page_size), max_pages)
+            for page_items in self.map(fetch, range(2, last + 1)):
+                items.extend(page_items)
+            return items
+
+        page = 2
+        while page <= max_pages:
+            window = range(page, min(page + self._max_workers, max_pages + 1))
+            for page_items in self.map(fetch, window):
+                items.extend(page_items)
+                if len(page_items) < page_size:
+                    return items
+            page = window.stop
+        return items
+
     def get_pipeline(self, pipeline_name: str) -> dict:
         """GET /pipelines/{name}"""
         return self._get(f"/pipelines/{pipeline_name}")
@@ -140,6 +255,33 @@ class DatabandClient:
         """GET /runs/{run_uid}/task_runs — individual task-level metrics."""
         return self._get(f"/runs/{run_uid}/task_runs")
 
+    def get_run_bundle(self, run_uid: str, include_tasks: bool = True) -> dict:
+        """Run, metrics and (optionally) task runs, fetched concurrently.
+
+        Returns ``{"run": ..., "metrics": ..., "tasks": ...}`` (``tasks`` is
+        None when not requested). Bundles of finished runs are served from
+        the TTL cache.
+        """
+        cached = self._cache_get(f"bundle:{run_uid}")
+        if cached is not None and (cached["tasks"] is not None or not include_tasks):
+            return cached
+
+        calls = [self.get_run, self.get_run_metrics] + ([self.get_run_tasks] if include_tasks else [])
+        futures = [self._pool.submit(call, run_uid) for call in calls]
+        results = [future.result() for future in futures]
+        bundle = {"run": results[0], "metrics": results[1], "tasks": results[2] if include_tasks else None}
+        if self._is_finished(bundle["run"]):
+            self._cache_set(f"bundle:{run_uid}", bundle)
+        return bundle
+
+    def get_run_bundles(self, run_uids: Iterable[str], include_tasks: bool = True) -> list[dict]:
+        """get_run_bundle for many runs; runs fan out over the bounded pool."""
+        uids = list(run_uids)
+        # Each bundle submits its own calls to the pool, so run the per-run
+        # coordinators on a separate short-lived pool to avoid starving it.
+        with ThreadPoolExecutor(max_workers=min(len(uids), self._max_workers) or 1) as coordinators:
+            return list(coordinators.map(lambda uid: self.get_run_bundle(uid, include_tasks), uids))
+
     # ------------------------------------------------------------------
     # Alert / policy endpoints
     # ------------------------------------------------------------------
@@ -170,3 +312,16 @@ class DatabandClient:
     def get_dataset_stats(self, dataset_uid: str) -> dict:
         """GET /datasets/{uid}/stats — column-level stats and quality score."""
         return self._get(f"/datasets/{dataset_uid}/stats")
+
+
+_shared_client: DatabandClient | None = None
+_shared_client_lock = threading.Lock()
+
+
+def get_client() -> DatabandClient:
+    """Process-wide DatabandClient, so services share one session, pool and cache."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = DatabandClient()
+        return _shared_client
@@ -21,13 +21,28 @@ Usage
         --inputs   "cos://bucket/raw/customers.parquet" \\
         --outputs  "cos://bucket/curated/customers.parquet" \\
         --run-id   $(python -c "import uuid; print(uuid.uuid4())")
+
+Emitter modes
+-------------
+  sync  (default)  each emit_* call POSTs the event before returning.
+  async            events go to a bounded in-memory queue drained by a
+                   background thread in batches (by size or time). Events
+                   that cannot be delivered are appended to a local spool
+                   file and resent later; the queue is flushed on exit.
+
+Select with EMITTER_MODE=async or PipelineRun(..., mode="async").
 """
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import os
+import queue
+import threading
+import time
 import uuid
+from collections import deque
 from datetime import datetime, timezone
 from typing import Any
 
@@ -48,6 +63,7 @@ from openlineage.client.facet_v2 import (
     schema_dataset,
     source_code_location_job,
 )
+from openlineage.client.serde import Serde
 from openlineage.client.transport.http import HttpConfig, HttpTransport
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -59,13 +75,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger("openlineage_emitter")
 
+# Refresh IAM tokens this many seconds before they expire
+TOKEN_REFRESH_MARGIN = 300
+
+# Async mode tuning
+EMITTER_QUEUE_SIZE = int(os.getenv("EMITTER_QUEUE_SIZE", "10000"))
+EMITTER_OVERFLOW_SIZE = int(os.getenv("EMITTER_OVERFLOW_SIZE", "10000"))   # beyond this, spill to the spool
+EMITTER_BATCH_SIZE = int(os.getenv("EMITTER_BATCH_SIZE", "100"))
+EMITTER_FLUSH_INTERVAL = float(os.getenv("EMITTER_FLUSH_INTERVAL", "1.0"))   # seconds
+EMITTER_SPOOL_PATH = os.getenv("EMITTER_SPOOL_PATH", "openlineage_spool.jsonl")
+EMITTER_RETRY_MAX_BACKOFF = 60.0   # seconds between delivery attempts while the endpoint is down
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _iam_bearer_token(api_key: str) -> str:
-    """Exchange an IBM Cloud API key for a short-lived IAM bearer token."""
+def _iam_bearer_token(api_key: str) -> tuple[str, float]:
+    """Exchange an IBM Cloud API key for a short-lived IAM bearer token.
+
+    Returns the token and its expiry as a UNIX timestamp.
+    """
     resp = requests.post(
         "https://iam.cloud.ibm.com/identity/token",
         headers={"Content-Type": "application/x-www-form-urlencoded"},
@@ -76,22 +106,38 @@ def _iam_bearer_token(api_key: str) -> str:
         timeout=30,
     )
     resp.raise_for_status()
-    return resp.json()["access_token"]
+    data = resp.json()
+    return data["access_token"], float(data.get("expiration") or time.time() + data.get("expires_in", 3600))
 
 
-def _build_client() -> OpenLineageClient:
-    """Build an OpenLineageClient pointing at IBM Databand's HTTP transport."""
-    databand_url = os.environ["DATABAND_URL"].rstrip("/")
-    static_token = os.getenv("DATABAND_ACCESS_TOKEN")
+_token: tuple[str, float] | None = None
+_token_lock = threading.Lock()
+
 
+def _get_token() -> str:
+    """Return the Databand bearer token, reusing the IAM token until shortly before expiry."""
+    global _token
+    static_token = os.getenv("DATABAND_ACCESS_TOKEN")
     if static_token:
-        token = static_token
-    else:
-        token = _iam_bearer_token(os.environ["IBM_API_KEY"])
+        return static_token
+    with _token_lock:
+        if _token is None or time.time() > _token[1] - TOKEN_REFRESH_MARGIN:
+            _token = _iam_bearer_token(os.environ["IBM_API_KEY"])
+            logger.debug("IAM token refreshed, expires in %ds", _token[1] - time.time())
+        return _token[0]
+
+
+def _lineage_url() -> str:
+    return f"{os.environ['DATABAND_URL'].rstrip('/')}/api/v1/lineage"
+
+
+def _build_client() -> OpenLineageClient:
+    """Build an OpenLineageClient pointing at IBM Databand's HTTP transport."""
+    token = _get_token()
 
     transport = HttpTransport(
         HttpConfig(
-            url=f"{databand_url}/api/v1/lineage",
+            url=_lineage_url(),
             auth={"type": "bearer", "token": token},
             verify=True,
             timeout=30,
@@ -129,6 +175,285 @@ def _make_dataset(uri: str, fields: list[dict] | None = None) -> Dataset:
     return Dataset(namespace=namespace, name=name, facets=facets)
 
 
+# ---------------------------------------------------------------------------
+# Async mode: background sender with batching and a local spool
+# ---------------------------------------------------------------------------
+
+class AsyncEmitter:
+    """
+    Drop-in replacement for OpenLineageClient whose ``emit()`` only enqueues.
+
+    A daemon thread drains the queue in batches of up to ``batch_size`` events
+    (or whatever arrived within ``flush_interval`` seconds), serializes them,
+    and POSTs them over one keep-alive session. The bearer token is refreshed
+    by that thread ahead of expiry, never on the caller's path.
+
+    Events that cannot be delivered (endpoint down, queue full, or still
+    queued at shutdown) are appended to ``spool_path`` as JSON lines; the
+    spool is resent before new events once the endpoint accepts requests
+    again, with exponential backoff in between. Only the sender thread (or
+    ``close()`` once it has stopped) touches the spool. Events that find the
+    queue full go to an overflow list, and so does every event after them
+    until the sender has caught up, so events are always sent in emit order.
+    Once the overflow holds ``max_overflow`` events the sender stops posting
+    and moves the queue and the overflow, in order, to the spool (the
+    overflow can only outgrow that by what arrives during one request).
+    """
+
+    def __init__(
+        self,
+        batch_size: int = EMITTER_BATCH_SIZE,
+        flush_interval: float = EMITTER_FLUSH_INTERVAL,
+        max_queue: int = EMITTER_QUEUE_SIZE,
+        max_overflow: int = EMITTER_OVERFLOW_SIZE,
+        spool_path: str = EMITTER_SPOOL_PATH,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._spool_lock = threading.Lock()
+        self.max_overflow = max_overflow
+        self._overflow: deque = deque()           # events (and flush markers) newer than the whole queue
+        self._overflow_lock = threading.Lock()
+        self._spill = threading.Event()
+        self._session = requests.Session()
+        self._stop = threading.Event()
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self._thread = threading.Thread(target=self._run, name="openlineage-emitter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # -- caller side -----------------------------------------------------------
+
+    def emit(self, event: RunEvent) -> None:
+        """Queue an event; never blocks on the network."""
+        if not self._put(event):
+            logger.warning("Emitter queue full; deferring event for run %s", event.run.runId)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until everything queued so far has been sent or spooled."""
+        done = threading.Event()
+        self._put(done)
+        return done.wait(timeout)
+
+    def _put(self, item: RunEvent | threading.Event) -> bool:
+        """Append *item* behind everything pending; return False if it went to the overflow."""
+        with self._overflow_lock:
+            if not self._overflow:
+                try:
+                    self._queue.put_nowait(item)
+                    return True
+                except queue.Full:
+                    pass
+            self._overflow.append(item)
+            if len(self._overflow) >= self.max_overflow:
+                self._spill.set()
+            return False
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush, stop the sender, and spool anything still queued."""
+        if self._stop.is_set():
+            return
+        if self._thread.is_alive():
+            self.flush(timeout)
+        self._stop.set()
+        self._thread.join(timeout)
+        leftover = self._spool_pending()
+        if leftover:
+            logger.warning("%d undelivered events spooled to %s", leftover, self.spool_path)
+        self._session.close()
+
+    # -- sender thread -----------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._spill.is_set():
+                spooled = self._spool_pending()
+                logger.warning("Emitter overflow full; %d events spooled to %s", spooled, self.spool_path)
+            markers: list[threading.Event] = []
+            deadline = time.monotonic() + self.flush_interval
+            batch: list[str] = []
+            while len(batch) < self.batch_size:
+                item = self._next_item(deadline)
+                if item is None:
+                    break
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                    break
+                try:
+                    batch.append(Serde.to_json(item))
+                except Exception:
+                    logger.exception("Dropping event that cannot be serialized")
+            try:
+                self._deliver(batch)
+            except Exception:
+                logger.exception("Emitter sender failed; spooling %d events", len(batch))
+                self._spool(batch)
+            for marker in markers:
+                marker.set()
+
+    def _next_item(self, deadline: float) -> RunEvent | threading.Event | None:
+        """Oldest pending item: the queue first, since everything in the overflow is newer."""
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        with self._overflow_lock:
+            if self._overflow:
+                return self._overflow.popleft()
+        try:
+            return self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            return None
+
+    def _spool_pending(self) -> int:
+        """Move the queue and the overflow, in order, to the spool; return how many events moved."""
+        items = []
+        with self._overflow_lock:
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            items.extend(self._overflow)
+            self._overflow.clear()
+            self._spill.clear()
+        payloads = []
+        for item in items:
+            if isinstance(item, threading.Event):
+                continue
+            try:
+                payloads.append(Serde.to_json(item))
+            except Exception:
+                logger.exception("Dropping event that cannot be serialized")
+        self._spool(payloads)
+        for item in items:
+            if isinstance(item, threading.Event):
+                item.set()
+        return len(payloads)
+
+    def _deliver(self, batch: list[str]) -> None:
+        # One lock across read, post and rewrite, so nothing is appended in between
+        with self._spool_lock:
+            if time.monotonic() < self._retry_at:
+                self._append_spool(batch)
+                return
+            pending = self._read_spool() + batch
+            if not pending:
+                return
+            sent = self._post(pending)
+            if sent < len(pending) and self._spill.is_set():
+                # Stopped early to spill the overflow; keep the rest ahead of it
+                self._rewrite_spool(pending[sent:])
+                return
+            if sent == len(pending):
+                if self._backoff:
+                    logger.info("Databand reachable again; delivered %d events", sent)
+                self._backoff = 0.0
+                self._rewrite_spool([])
+                return
+            self._backoff = min(max(self._backoff * 2, 1.0), EMITTER_RETRY_MAX_BACKOFF)
+            self._retry_at = time.monotonic() + self._backoff
+            self._rewrite_spool(pending[sent:])
+        logger.warning(
+            "Databand delivery failed; %d events spooled, retrying in %.0fs", len(pending) - sent, self._backoff
+        )
+
+    def _post(self, payloads: list[str]) -> int:
+        """POST events in order; return how many were accepted (or dropped as invalid)."""
+        global _token
+        url = _lineage_url()
+        try:
+            token = _get_token()
+        except requests.RequestException as exc:
+            logger.debug("IAM token refresh failed: %s", exc)
+            return 0
+        for i, payload in enumerate(payloads):
+            if self._spill.is_set():
+                return i
+            try:
+                resp = self._send(url, payload, token)
+                if resp.status_code == 401 and not os.getenv("DATABAND_ACCESS_TOKEN"):
+                    with _token_lock:
+                        _token = None
+                    token = _get_token()
+                    resp = self._send(url, payload, token)
+                if 400 <= resp.status_code < 500 and resp.status_code not in (401, 403, 408, 429):
+                    # Retrying will not help a malformed event; drop it rather than block the spool
+                    logger.error("Databand rejected event (%d): %s", resp.status_code, resp.text[:200])
+                    continue
+                resp.raise_for_status()
+            except requests.RequestException as exc:
+                logger.debug("Event delivery failed: %s", exc)
+                return i
+        return len(payloads)
+
+    def _send(self, url: str, payload: str, token: str) -> requests.Response:
+        return self._session.post(
+            url,
+            data=payload,
+            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+            timeout=30,
+        )
+
+    # -- spool ---------------------------------------------------------------------
+
+    def _spool(self, payloads: list[str]) -> None:
+        with self._spool_lock:
+            self._append_spool(payloads)
+
+    # The helpers below expect the caller to hold _spool_lock
+
+    def _append_spool(self, payloads: list[str]) -> None:
+        if not payloads:
+            return
+        with open(self.spool_path, "a", encoding="utf-8") as fh:
+            fh.writelines(p + "\n" for p in payloads)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def _read_spool(self) -> list[str]:
+        try:
+            with open(self.spool_path, encoding="utf-8") as fh:
+                return [line.rstrip("\n") for line in fh if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _rewrite_spool(self, payloads: list[str]) -> None:
+        if not payloads:
+            if os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+            return
+        tmp = f"{self.spool_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.writelines(p + "\n" for p in payloads)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.spool_path)
+
+
+_async_emitter: AsyncEmitter | None = None
+_async_emitter_lock = threading.Lock()
+
+
+def get_async_emitter() -> AsyncEmitter:
+    """Process-wide AsyncEmitter, started on first use and flushed at exit."""
+    global _async_emitter
+    with _async_emitter_lock:
+        if _async_emitter is None:
+            _async_emitter = AsyncEmitter()
+        return _async_emitter
+
+
+def _get_client(mode: str | None = None) -> OpenLineageClient | AsyncEmitter:
+    mode = (mode or os.getenv("EMITTER_MODE", "sync")).lower()
+    if mode == "async":
+        return get_async_emitter()
+    return _build_client()
+
+
 # ---------------------------------------------------------------------------
 # Core emit functions
 # ---------------------------------------------------------------------------
@@ -245,6 +570,10 @@ class PipelineRun:
                          outputs=["cos://curated-bucket/orders.parquet"]) as run:
             # ... your ETL code here ...
             pass
+
+    With ``mode="async"`` (or EMITTER_MODE=async) START/COMPLETE/FAIL are only
+    queued, so the wrapped block pays no network round trip; the shared
+    background emitter delivers them and flushes at interpreter exit.
     """
 
     def __init__(
@@ -256,6 +585,7 @@ class PipelineRun:
         output_schema: list[dict] | None = None,
         run_id: str | None = None,
         parent_run_id: str | None = None,
+        mode: str | None = None,
     ) -> None:
         self.pipeline_name = pipeline_name
         self.job_name = job_name
@@ -264,7 +594,7 @@ class PipelineRun:
         self.output_schema = output_schema
         self.run_id = run_id or str(uuid.uuid4())
         self.parent_run_id = parent_run_id
-        self._client = _build_client()
+        self._client = _get_client(mode)
 
     def __enter__(self) -> "PipelineRun":
         emit_start(
@@ -318,6 +648,12 @@ class PipelineRun:
     help="OpenLineage event type to emit",
 )
 @click.option("--error", default="", help="Error message (only for FAIL events)")
+@click.option(
+    "--mode",
+    type=click.Choice(["sync", "async"], case_sensitive=False),
+    default=lambda: os.getenv("EMITTER_MODE", "sync"),
+    help="sync: POST immediately; async: queue, spool on failure, resend spooled events  [env: EMITTER_MODE]",
+)
 def cli(
     pipeline: str,
     job_name: str,
@@ -326,10 +662,11 @@ def cli(
     outputs: tuple[str, ...],
     event_type: str,
     error: str,
+    mode: str,
 ) -> None:
     """Emit an OpenLineage event to IBM Databand."""
     rid = run_id or str(uuid.uuid4())
-    client = _build_client()
+    client = _get_client(mode)
 
     if event_type.upper() == "START":
         emit_start(client, pipeline, job_name, rid, list(inputs), list(outputs))
@@ -338,6 +675,9 @@ def cli(
     elif event_type.upper() == "FAIL":
         emit_fail(client, pipeline, job_name, rid, error or "Unknown error")
 
+    if isinstance(client, AsyncEmitter):
+        # Also resends anything left in the spool by earlier runs
+        client.close()
     click.echo(f"Event {event_type.upper()} emitted | run_id={rid}")
 
 
@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from .kafka_utils import consume_batches, delivery_stats
+from .producer import run_load
+from .risk_engine import INPUT_TOPIC_KEYS, RiskPublisher, process_batch
+from .settings import TOPICS
+from .state import RiskEngineState
+
+app = typer.Typer(help="End-to-end throughput benchmark of the risk engine against an in-process broker.")
+console = Console()
+
+
+# ── In-process broker stand-in ───────────────────────────────────────────────
+# Implements the parts of the confluent_kafka Producer / Consumer API that
+# produce_json, consume_batches and consumer_lag use. One partition per
+# topic; only the input topics are stored (output records are counted), and
+# records below the committed offset are dropped so the broker's own memory
+# does not hide the engine's.
+
+
+@dataclass
+class TopicPartition:
+    topic: str
+    partition: int = 0
+    offset: int = -1001   # OFFSET_INVALID: use the committed offset
+
+
+class _Message:
+    __slots__ = ("_topic", "_offset", "_key", "_value", "produced_at")
+
+    def __init__(self, topic: str, offset: int, key: bytes | None, value: bytes) -> None:
+        self._topic = topic
+        self._offset = offset
+        self._key = key
+        self._value = value
+        self.produced_at = time.perf_counter()
+
+    def topic(self) -> str:
+        return self._topic
+
+    def partition(self) -> int:
+        return 0
+
+    def offset(self) -> int:
+        return self._offset
+
+    def key(self) -> bytes | None:
+        return self._key
+
+    def value(self) -> bytes:
+        return self._value
+
+    def error(self) -> None:
+        return None
+
+
+class InMemoryBroker:
+    """Thread-safe topic logs shared by in-process producers and consumers."""
+
+    def __init__(self, stored_topics: list[str]) -> None:
+        self._logs: dict[str, list[_Message]] = {topic: [] for topic in stored_topics}
+        self._base: dict[str, int] = dict.fromkeys(stored_topics, 0)   # offset of _logs[topic][0]
+        self._high: dict[str, int] = {}
+        self._cond = threading.Condition()
+
+    def append(self, topic: str, key: bytes | None, value: bytes) -> _Message:
+        with self._cond:
+            offset = self._high.get(topic, 0)
+            self._high[topic] = offset + 1
+            msg = _Message(topic, offset, key, value)
+            if topic in self._logs:
+                self._logs[topic].append(msg)
+                self._cond.notify_all()
+            return msg
+
+    def read(self, positions: dict[str, int], max_messages: int, timeout: float) -> list[_Message]:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                out: list[_Message] = []
+                for topic, offset in positions.items():
+                    log, base = self._logs[topic], self._base[topic]
+                    out.extend(log[max(offset - base, 0):max(offset - base, 0) + max_messages - len(out)])
+                    if len(out) >= max_messages:
+                        break
+                remaining = deadline - time.monotonic()
+                if out or remaining <= 0:
+                    return out
+                self._cond.wait(remaining)
+
+    def high_watermark(self, topic: str) -> int:
+        with self._cond:
+            return self._high.get(topic, 0)
+
+    def trim(self, topic: str, offset: int) -> None:
+        """Drop stored records below ``offset`` (committed by the only consumer)."""
+        with self._cond:
+            drop = offset - self._base[topic]
+            if drop > 0:
+                del self._logs[topic][:drop]
+                self._base[topic] = offset
+
+
+class MemoryProducer:
+    """Producer stand-in; delivery callbacks are served from poll()/flush()."""
+
+    def __init__(self, broker: InMemoryBroker) -> None:
+        self._broker = broker
+        self._pending: list[tuple[Callable[..., None], _Message]] = []
+
+    def produce(self, topic: str, key: bytes | None = None, value: bytes = b"", callback: Callable[..., None] | None = None) -> None:
+        msg = self._broker.append(topic, key, value)
+        if callback is not None:
+            self._pending.append((callback, msg))
+
+    def poll(self, timeout: float = 0) -> int:
+        pending, self._pending = self._pending, []
+        for callback, msg in pending:
+            callback(None, msg)
+        return len(pending)
+
+    def flush(self, timeout: float = 0) -> int:
+        self.poll()
+        return 0
+
+
+class MemoryConsumer:
+    """Consumer stand-in reading every partition it is subscribed to."""
+
+    def __init__(self, broker: InMemoryBroker) -> None:
+        self._broker = broker
+        self._positions: dict[str, int] = {}
+        self.last_batch: list[_Message] = []
+
+    def subscribe(self, topics: list[str], on_assign: Callable[[Any, list[TopicPartition]], None] | None = None) -> None:
+        partitions = [TopicPartition(topic) for topic in topics]
+        if on_assign is not None:
+            on_assign(self, partitions)
+        else:
+            self.assign(partitions)
+
+    def assign(self, partitions: list[TopicPartition]) -> None:
+        self._positions = {tp.topic: max(tp.offset, 0) for tp in partitions}
+
+    def assignment(self) -> list[TopicPartition]:
+        return [TopicPartition(topic) for topic in self._positions]
+
+    def position(self, partitions: list[TopicPartition]) -> list[TopicPartition]:
+        return [TopicPartition(tp.topic, 0, self._positions[tp.topic]) for tp in partitions]
+
+    def get_watermark_offsets(self, tp: TopicPartition, timeout: float = 0, cached: bool = False) -> tuple[int, int]:
+        return 0, self._broker.high_watermark(tp.topic)
+
+    def consume(self, num_messages: int = 1, timeout: float = -1) -> list[_Message]:
+        messages = self._broker.read(self._positions, num_messages, max(timeout, 0))
+        for msg in messages:
+            self._positions[msg.topic()] = msg.offset() + 1
+        self.last_batch = messages
+        return messages
+
+    def commit(self, asynchronous: bool = True) -> None:
+        for topic, offset in self._positions.items():
+            self._broker.trim(topic, offset)
+
+    def lag(self) -> int:
+        return sum(self._broker.high_watermark(topic) - offset for topic, offset in self._positions.items())
+
+    def close(self) -> None:
+        pass
+
+
+# ── Benchmark ────────────────────────────────────────────────────────────────
+
+def _rss_bytes() -> int | None:
+    """Current resident set size (Linux), else peak RSS, else None."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+@dataclass
+class BenchmarkResult:
+    produced: int = 0
+    consumed: int = 0
+    scored: int = 0
+    elapsed_s: float = 0.0
+    drain_s: float = 0.0
+    max_lag: int = 0
+    final_lag: int = 0
+    latencies_ms: list[float] = field(default_factory=list)      # produce -> scored, per record
+    batch_ms_per_record: list[float] = field(default_factory=list)
+    rss_start: int | None = None
+    rss_peak: int | None = None
+    rss_end: int | None = None
+    state_sizes: dict[str, int] = field(default_factory=dict)
+
+
+def run_benchmark(
+    rate: float,
+    duration: float,
+    workers: int = 2,
+    components: int = 1000,
+    suppliers: int = 50,
+    routes: int = 40,
+    batch_size: int = 500,
+    report_every: float = 5.0,
+) -> BenchmarkResult:
+    """Load producers and one risk engine, all in this process.
+
+    Producers run as threads (sharing the interpreter with the engine), so
+    the numbers are a lower bound for a separate engine process.
+    """
+    input_topics = [TOPICS[key] for key in INPUT_TOPIC_KEYS]
+    broker = InMemoryBroker(input_topics)
+    state = RiskEngineState()
+    engine_producer = MemoryProducer(broker)
+    publisher = RiskPublisher(producer=engine_producer, slack_webhook_url=None)
+    consumer = MemoryConsumer(broker)
+    result = BenchmarkResult(rss_start=_rss_bytes())
+    result.rss_peak = result.rss_start
+    # produce_json reports deliveries to the shared stats, so use those and count deltas
+    stats = delivery_stats
+    consumed_before, scored_before = stats.consumed, stats.scored
+
+    produced = [0] * workers
+
+    def produce(worker: int) -> None:
+        produced[worker] = run_load(
+            MemoryProducer(broker), rate / workers, duration, components, suppliers, routes, worker, workers,
+        )
+
+    threads = [threading.Thread(target=produce, args=(i,), name=f"bench-producer-{i}") for i in range(workers)]
+    next_sample = time.monotonic()
+    producers_done_at: float | None = None
+
+    def handle_batch(records: list[tuple[str, str | None, dict[str, Any]]]) -> None:
+        nonlocal next_sample
+        started = time.perf_counter()
+        stats.scored += process_batch(state, publisher, records)
+        finished = time.perf_counter()
+        result.batch_ms_per_record.append((finished - started) * 1000 / len(records))
+        result.latencies_ms.extend((finished - msg.produced_at) * 1000 for msg in consumer.last_batch)
+        result.max_lag = max(result.max_lag, consumer.lag())
+        if time.monotonic() >= next_sample:
+            rss = _rss_bytes()
+            if rss is not None:
+                result.rss_peak = max(result.rss_peak or 0, rss)
+            next_sample = time.monotonic() + 0.5
+
+    def should_stop() -> bool:
+        nonlocal producers_done_at
+        if any(t.is_alive() for t in threads):
+            return False
+        if producers_done_at is None:
+            producers_done_at = time.monotonic()
+        return consumer.lag() == 0
+
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    consume_batches(
+        consumer, input_topics, handle_batch, producer=engine_producer, batch_size=batch_size,
+        timeout=0.1, report_every=report_every, stats=stats, should_stop=should_stop,
+    )
+    finished = time.monotonic()
+
+    result.produced = sum(produced)
+    result.consumed = stats.consumed - consumed_before
+    result.scored = stats.scored - scored_before
+    result.elapsed_s = finished - started
+    result.drain_s = finished - (producers_done_at or finished)
+    result.final_lag = consumer.lag()
+    result.rss_end = _rss_bytes()
+    if result.rss_end is not None:
+        result.rss_peak = max(result.rss_peak or 0, result.rss_end)
+    result.state_sizes = {
+        "components": len(state.component_master),
+        "shipments": len(state.shipments),
+        "purchase_orders": len(state.purchase_orders),
+        "external_events": sum(len(events) for events in state.events_by_route.values()),
+    }
+    return result
+
+
+def _mb(value: int | None) -> str:
+    return "n/a" if value is None else f"{value / 2**20:,.1f} MB"
+
+
+def print_result(result: BenchmarkResult) -> None:
+    table = Table(title="Risk engine benchmark (in-process broker)")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    rate = result.consumed / max(result.elapsed_s, 1e-9)
+    table.add_row("Events produced / consumed", f"{result.produced:,} / {result.consumed:,}")
+    table.add_row("Components scored", f"{result.scored:,}")
+    table.add_row("Engine throughput", f"{rate:,.0f} events/s")
+    table.add_row("Engine lag max / final", f"{result.max_lag:,} / {result.final_lag:,} records")
+    table.add_row("Drain time after producers stopped", f"{result.drain_s:.2f} s")
+    for pct in (50, 95, 99):
+        table.add_row(f"End-to-end latency p{pct}", f"{percentile(result.latencies_ms, pct):,.1f} ms")
+    for pct in (50, 95, 99):
+        table.add_row(f"Scoring time per record p{pct}", f"{percentile(result.batch_ms_per_record, pct) * 1000:,.1f} µs")
+    growth = None if result.rss_end is None or result.rss_start is None else result.rss_end - result.rss_start
+    table.add_row("RSS start / peak / end", f"{_mb(result.rss_start)} / {_mb(result.rss_peak)} / {_mb(result.rss_end)}")
+    table.add_row("RSS growth", _mb(growth))
+    table.add_row("State size", ", ".join(f"{k}={v:,}" for k, v in result.state_sizes.items()))
+    console.print(table)
+
+
+@app.command()
+def main(
+    rate: float = typer.Option(5000.0, help="Target events/s across all producer workers."),
+    duration: float = typer.Option(20.0, help="Seconds to keep producing."),
+    workers: int = typer.Option(2, help="Producer worker threads."),
+    components: int = typer.Option(1000, help="Number of distinct components."),
+    suppliers: int = typer.Option(50, help="Number of distinct suppliers."),
+    routes: int = typer.Option(40, help="Number of distinct routes."),
+    batch_size: int = typer.Option(500, help="Max records consumed and scored per micro-batch."),
+) -> None:
+    console.print(
+        f"Benchmark: {rate:,.0f} events/s for {duration:.0f}s, {workers} producer(s), "
+        f"{components} components, {suppliers} suppliers, {routes} routes, batch size {batch_size}."
+    )
+    print_result(run_benchmark(rate, duration, workers, components, suppliers, routes, batch_size))
+
+
+if __name__ == "__main__":
+    app()
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Callable
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
 
 try:
     from confluent_kafka import Consumer, KafkaException, Producer
@@ -14,7 +17,7 @@ except ModuleNotFoundError:  # Allows dry-run mode without installing Kafka clie
 from .settings import KafkaSettings
 
 
-def producer_config(settings: KafkaSettings) -> dict[str, Any]:
+def producer_config(settings: KafkaSettings, linger_ms: int = 20, batch_num_messages: int = 1000) -> dict[str, Any]:
     if not settings.is_configured:
         raise ValueError("Confluent Kafka settings are missing. Check .env or run --dry-run.")
     return {
@@ -26,10 +29,16 @@ def producer_config(settings: KafkaSettings) -> dict[str, Any]:
         "client.id": settings.client_id,
         "enable.idempotence": True,
         "acks": "all",
+        # Let librdkafka batch records instead of sending each one on its own
+        "linger.ms": linger_ms,
+        "batch.num.messages": batch_num_messages,
+        "compression.type": "lz4",
+        # crc32(key) % partitions: the engine relies on this to read only its components' partitions
+        "partitioner": "consistent_random",
     }
 
 
-def consumer_config(settings: KafkaSettings, group_id: str | None = None) -> dict[str, Any]:
+def consumer_config(settings: KafkaSettings, group_id: str | None = None, auto_commit: bool = True) -> dict[str, Any]:
     if not settings.is_configured:
         raise ValueError("Confluent Kafka settings are missing. Check .env or run --dry-run.")
     return {
@@ -41,7 +50,7 @@ def consumer_config(settings: KafkaSettings, group_id: str | None = None) -> dic
         "group.id": group_id or settings.consumer_group,
         "client.id": settings.client_id,
         "auto.offset.reset": "earliest",
-        "enable.auto.commit": True,
+        "enable.auto.commit": auto_commit,
     }
 
 
@@ -53,18 +62,158 @@ def json_deserializer(value: bytes) -> dict[str, Any]:
     return json.loads(value.decode("utf-8"))
 
 
+@dataclass
+class StreamStats:
+    """Counters for the batched consume → score → publish loop."""
+
+    consumed: int = 0
+    batches: int = 0
+    scored: int = 0
+    delivered: int = 0
+    delivery_failures: int = 0
+    lag: int | None = None
+    started: float = field(default_factory=time.monotonic)
+    _window_start: float = field(default_factory=time.monotonic)
+    _window_consumed: int = 0
+
+    def record_batch(self, records: int) -> None:
+        self.consumed += records
+        self._window_consumed += records
+        self.batches += 1
+
+    def report(self) -> str:
+        now = time.monotonic()
+        rate = self._window_consumed / max(now - self._window_start, 1e-9)
+        self._window_start, self._window_consumed = now, 0
+        lag = "n/a" if self.lag is None else str(self.lag)
+        return (
+            f"consumed={self.consumed} ({rate:,.0f} msg/s) batches={self.batches} scored={self.scored} "
+            f"delivered={self.delivered} failed={self.delivery_failures} lag={lag}"
+        )
+
+
+delivery_stats = StreamStats()
+
+
 def delivery_report(err, msg) -> None:
+    # Called from producer.poll()/flush(); only failures are worth a line each
     if err is not None:
+        delivery_stats.delivery_failures += 1
         print(f"Delivery failed for record {msg.key()}: {err}")
     else:
-        print(f"Delivered to {msg.topic()} [{msg.partition()}] @ offset {msg.offset()}")
+        delivery_stats.delivered += 1
 
 
 def produce_json(producer: Any, topic: str, key: str, value: dict[str, Any]) -> None:
-    producer.produce(topic=topic, key=key.encode("utf-8"), value=json_serializer(value), callback=delivery_report)
+    try:
+        producer.produce(topic=topic, key=key.encode("utf-8"), value=json_serializer(value), callback=delivery_report)
+    except BufferError:
+        # Local queue full: serve delivery callbacks to make room, then retry once
+        producer.poll(1)
+        producer.produce(topic=topic, key=key.encode("utf-8"), value=json_serializer(value), callback=delivery_report)
     producer.poll(0)
 
 
+def consumer_lag(consumer: Any) -> int | None:
+    """Sum of (high watermark - position) over the assigned partitions."""
+    try:
+        partitions = consumer.position(consumer.assignment())
+    except KafkaException:
+        return None
+    lag = 0
+    for tp in partitions:
+        _, high = consumer.get_watermark_offsets(tp, timeout=1.0, cached=False)
+        if tp.offset >= 0:
+            lag += max(high - tp.offset, 0)
+    return lag
+
+
+def consume_batches(
+    consumer: Any,
+    topics: list[str],
+    handle_batch: Callable[[list[tuple[str, str | None, dict[str, Any]]]], None],
+    producer: Any | None = None,
+    batch_size: int = 500,
+    timeout: float = 0.5,
+    report_every: float = 10.0,
+    stats: StreamStats = delivery_stats,
+    start_offsets: dict[str, int] | None = None,
+    after_commit: Callable[[dict[str, int]], None] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+    partitions: list[Any] | None = None,
+) -> None:
+    """Consume in micro-batches and commit offsets only after the batch is published.
+
+    Each batch from ``consumer.consume`` is decoded and passed to
+    ``handle_batch`` in one call. If a producer is given, its outstanding
+    records are flushed once per batch before the offsets are committed, so
+    a crash re-delivers at most the uncommitted batch (at-least-once). A
+    batch with undelivered or failed records raises without committing;
+    ``stats`` must be the one the producer's delivery callback updates.
+    Throughput and consumer lag are printed every ``report_every`` seconds.
+
+    ``start_offsets`` ("topic:partition" -> offset, e.g. from a state
+    snapshot) override the committed offsets on assignment. After every
+    commit ``after_commit`` receives the next offset for every partition seen.
+    ``partitions`` (TopicPartitions) are assigned directly instead of
+    subscribing to ``topics`` through the consumer group.
+    The loop runs until interrupted, or until ``should_stop`` returns True.
+    """
+    positions: dict[str, int] = dict(start_offsets or {})
+
+    def on_assign(c: Any, partitions: list[Any]) -> None:
+        for tp in partitions:
+            offset = positions.get(f"{tp.topic}:{tp.partition}")
+            if offset is not None:
+                tp.offset = offset
+        c.assign(partitions)
+
+    if partitions is None:
+        consumer.subscribe(topics, on_assign=on_assign)
+        print(f"Subscribed to: {', '.join(topics)}")
+    else:
+        on_assign(consumer, partitions)
+        print(f"Assigned {len(partitions)} partitions of: {', '.join(topics)}")
+    next_report = time.monotonic() + report_every
+    try:
+        while should_stop is None or not should_stop():
+            messages = consumer.consume(num_messages=batch_size, timeout=timeout)
+            records = []
+            for msg in messages:
+                if msg.error():
+                    raise KafkaException(msg.error())
+                key = msg.key().decode("utf-8") if msg.key() else None
+                records.append((msg.topic(), key, json_deserializer(msg.value())))
+                positions[f"{msg.topic()}:{msg.partition()}"] = msg.offset() + 1
+
+            if records:
+                failures_before = stats.delivery_failures
+                handle_batch(records)
+                if producer is not None:
+                    remaining = producer.flush(30)
+                    if remaining:
+                        raise KafkaException(f"{remaining} records still undelivered; not committing offsets")
+                    failed = stats.delivery_failures - failures_before
+                    if failed:
+                        raise KafkaException(f"{failed} records failed delivery; not committing offsets")
+                consumer.commit(asynchronous=True)
+                stats.record_batch(len(records))
+                if after_commit is not None:
+                    after_commit(positions)
+            elif producer is not None:
+                producer.poll(0)
+
+            if time.monotonic() >= next_report:
+                stats.lag = consumer_lag(consumer)
+                print(f"[risk-engine] {stats.report()}")
+                next_report = time.monotonic() + report_every
+    except KeyboardInterrupt:
+        print("Stopping consumer.")
+    finally:
+        print(f"[risk-engine] {stats.report()}")
+        consumer.close()
+
+
 def consume_loop(
     consumer: Any,
     topics: list[str],
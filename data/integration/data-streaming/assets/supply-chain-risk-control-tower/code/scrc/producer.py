@@ -1,18 +1,110 @@
 from __future__ import annotations
 
+import multiprocessing
 import time
-from typing import Optional
+from typing import Any
 
-from rich.console import Console
 import typer
+from rich.console import Console
 
 from .kafka_utils import produce_json, producer_config
-from .sample_data import scenario_events
+from .sample_data import load_events, load_reference_events, scenario_events
 from .settings import TOPICS, load_settings
 
 app = typer.Typer(help="Produce synthetic supply chain events to Confluent Cloud Kafka topics.")
 console = Console()
 
+LOAD_CHUNK = 200   # events produced between pacing checks in load mode
+
+
+def run_load(
+    producer: Any | None,
+    rate: float,
+    duration: float,
+    components: int,
+    suppliers: int,
+    routes: int,
+    worker: int = 0,
+    workers: int = 1,
+    limit: int | None = None,
+) -> int:
+    """Send reference data, then load events at about ``rate`` events/s.
+
+    Pacing is checked every ``LOAD_CHUNK`` events against the elapsed time,
+    so the producer never sleeps per event. ``producer=None`` only generates
+    the events (dry run). Returns the number of events produced.
+    """
+    sent = 0
+    for topic_key, key, event in load_reference_events(components, suppliers, worker, workers):
+        if producer is not None:
+            produce_json(producer, topic=TOPICS[topic_key], key=key, value=event)
+        sent += 1
+
+    events = load_events(components, suppliers, routes, worker, workers)
+    start = time.monotonic()
+    deadline = start + duration
+    produced = 0
+    while True:
+        now = time.monotonic()
+        if now >= deadline or (limit and produced >= limit):
+            break
+        due = min(int((now - start) * rate) - produced, LOAD_CHUNK)
+        if limit:
+            due = min(due, limit - produced)
+        if due <= 0:
+            time.sleep(min(LOAD_CHUNK / rate, 0.01))
+            continue
+        for _ in range(due):
+            topic_key, key, event = next(events)
+            if producer is not None:
+                produce_json(producer, topic=TOPICS[topic_key], key=key, value=event)
+        produced += due
+
+    if producer is not None:
+        producer.flush(30)
+    return sent + produced
+
+
+def _load_worker(kwargs: dict[str, Any]) -> None:
+    dry_run = kwargs.pop("dry_run")
+    linger_ms = kwargs.pop("linger_ms")
+    batch_num_messages = kwargs.pop("batch_num_messages")
+    producer = None
+    if not dry_run:
+        from confluent_kafka import Producer
+
+        settings = load_settings()
+        producer = Producer(producer_config(settings.kafka, linger_ms=linger_ms, batch_num_messages=batch_num_messages))
+
+    started = time.monotonic()
+    sent = run_load(producer, **kwargs)
+    elapsed = time.monotonic() - started
+    console.print(f"Worker {kwargs['worker']}: produced {sent} events in {elapsed:.1f}s ({sent / max(elapsed, 1e-9):,.0f} events/s).")
+
+
+def run_load_workers(workers: int, rate: float, **kwargs: Any) -> None:
+    """Split ``rate`` and the component key space over ``workers`` processes."""
+    if workers <= 1:
+        _load_worker({**kwargs, "rate": rate, "worker": 0, "workers": 1})
+        return
+    ctx = multiprocessing.get_context("spawn")
+    procs = [
+        ctx.Process(
+            target=_load_worker,
+            args=({**kwargs, "rate": rate / workers, "worker": i, "workers": workers},),
+            name=f"producer-w{i}",
+        )
+        for i in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    try:
+        for proc in procs:
+            proc.join()
+    except KeyboardInterrupt:
+        for proc in procs:
+            proc.join()
+
 
 @app.command()
 def main(
@@ -20,8 +112,28 @@ def main(
     count: int = typer.Option(20, help="Number of event batches to generate."),
     interval: float = typer.Option(1.0, help="Seconds between individual events."),
     dry_run: bool = typer.Option(False, help="Print events without sending to Kafka."),
-    limit: Optional[int] = typer.Option(None, help="Optional hard limit of individual events."),
+    limit: int | None = typer.Option(None, help="Optional hard limit of individual events."),
+    rate: float = typer.Option(0.0, help="Load mode: target events/s across all workers (0 = scenario mode)."),
+    duration: float = typer.Option(60.0, help="Load mode: seconds to keep producing."),
+    workers: int = typer.Option(1, help="Load mode: parallel producer processes."),
+    components: int = typer.Option(1000, help="Load mode: number of distinct components."),
+    suppliers: int = typer.Option(50, help="Load mode: number of distinct suppliers."),
+    routes: int = typer.Option(40, help="Load mode: number of distinct routes."),
+    linger_ms: int = typer.Option(20, help="Load mode: producer linger.ms."),
+    batch_num_messages: int = typer.Option(1000, help="Load mode: producer batch.num.messages."),
 ) -> None:
+    if rate > 0:
+        console.print(
+            f"Load mode: {rate:,.0f} events/s for {duration:.0f}s over {workers} worker(s); "
+            f"{components} components, {suppliers} suppliers, {routes} routes."
+        )
+        run_load_workers(
+            workers, rate, duration=duration, components=components, suppliers=suppliers, routes=routes,
+            limit=limit // max(workers, 1) if limit else None, dry_run=dry_run,
+            linger_ms=linger_ms, batch_num_messages=batch_num_messages,
+        )
+        return
+
     settings = load_settings()
     producer = None
     if not dry_run:
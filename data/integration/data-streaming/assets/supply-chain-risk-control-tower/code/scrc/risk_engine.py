@@ -1,18 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import asdict
 import json
+import multiprocessing
+import time
+from dataclasses import asdict
 from typing import Any
 
+import typer
 from rich.console import Console
 from rich.panel import Panel
-import typer
 
-from .kafka_utils import consume_loop, consumer_config, produce_json, producer_config
-from .risk_logic import score_component_risk
+from .kafka_utils import (
+    consume_batches,
+    consumer_config,
+    delivery_stats,
+    produce_json,
+    producer_config,
+)
 from .sample_data import scenario_events
 from .settings import TOPICS, load_settings
 from .slack_alerts import send_slack_alert
+from .snapshot import load_snapshot, save_snapshot, snapshot_path
+from .state import COMPONENT_TOPICS, RiskEngineState
 
 app = typer.Typer(help="Consume supply chain events, calculate risk, and publish recommendations.")
 console = Console()
@@ -28,65 +37,6 @@ INPUT_TOPIC_KEYS = [
 ]
 
 
-class RiskEngineState:
-    def __init__(self) -> None:
-        self.suppliers: dict[str, dict[str, Any]] = {}
-        self.component_master: dict[str, dict[str, Any]] = {}
-        self.inventory_levels: dict[str, dict[str, Any]] = {}
-        self.purchase_orders: dict[str, dict[str, Any]] = {}
-        self.shipments: dict[str, dict[str, Any]] = {}
-        self.customer_orders_by_component: dict[str, list[dict[str, Any]]] = {}
-        self.external_risk_events: list[dict[str, Any]] = []
-
-    def update(self, topic: str, key: str | None, event: dict[str, Any]) -> set[str]:
-        """Update state and return component IDs that should be rescored."""
-        affected_components: set[str] = set()
-
-        if topic == TOPICS["supplier_profiles"]:
-            supplier_id = event["supplier_id"]
-            self.suppliers[supplier_id] = event
-            for component_id in event.get("alternate_for_components", []):
-                affected_components.add(component_id)
-
-        elif topic == TOPICS["component_master"]:
-            component_id = event["component_id"]
-            self.component_master[component_id] = event
-            affected_components.add(component_id)
-
-        elif topic == TOPICS["inventory_levels"]:
-            component_id = event["component_id"]
-            self.inventory_levels[component_id] = event
-            affected_components.add(component_id)
-
-        elif topic == TOPICS["purchase_orders"]:
-            self.purchase_orders[event["po_id"]] = event
-            affected_components.add(event["component_id"])
-
-        elif topic == TOPICS["shipments"]:
-            self.shipments[event["shipment_id"]] = event
-            affected_components.add(event["component_id"])
-
-        elif topic == TOPICS["customer_orders"]:
-            component_id = event["component_id"]
-            orders = self.customer_orders_by_component.setdefault(component_id, [])
-            orders = [order for order in orders if order["customer_order_id"] != event["customer_order_id"]]
-            orders.append(event)
-            self.customer_orders_by_component[component_id] = orders
-            affected_components.add(component_id)
-
-        elif topic == TOPICS["external_risk_events"]:
-            self.external_risk_events.append(event)
-            impacted_routes = {event.get("route_id")}
-            for shipment in self.shipments.values():
-                if shipment.get("route_id") in impacted_routes:
-                    affected_components.add(shipment["component_id"])
-
-        return affected_components
-
-    def can_score(self, component_id: str) -> bool:
-        return component_id in self.inventory_levels and component_id in self.component_master
-
-
 class RiskPublisher:
     def __init__(self, producer: Any | None, slack_webhook_url: str | None) -> None:
         self.producer = producer
@@ -97,7 +47,6 @@ class RiskPublisher:
             produce_json(self.producer, TOPICS["risk_scores"], risk["risk_id"], risk)
             produce_json(self.producer, TOPICS["recommendations"], recommendation["recommendation_id"], recommendation)
             produce_json(self.producer, TOPICS["alerts"], alert["alert_id"], alert)
-            self.producer.flush(5)
         else:
             console.print(Panel(json.dumps(risk, indent=2), title="Risk Score", expand=False))
             console.print(Panel(json.dumps(recommendation, indent=2), title="Recommendation", expand=False))
@@ -109,20 +58,145 @@ class RiskPublisher:
 
 def process_event(state: RiskEngineState, publisher: RiskPublisher, topic: str, key: str | None, event: dict[str, Any]) -> None:
     affected_components = state.update(topic, key, event)
+    score_and_publish(state, publisher, affected_components)
+
+
+def process_batch(state: RiskEngineState, publisher: RiskPublisher, records: list[tuple[str, str | None, dict[str, Any]]]) -> int:
+    """Apply a batch of records, then score each affected component once."""
+    affected_components: set[str] = set()
+    for topic, key, event in records:
+        affected_components |= state.update(topic, key, event)
+    return score_and_publish(state, publisher, affected_components)
+
+
+def score_and_publish(state: RiskEngineState, publisher: RiskPublisher, affected_components: set[str]) -> int:
+    scored = 0
     for component_id in sorted(affected_components):
         if not state.can_score(component_id):
             continue
-        risk, recommendation, alert = score_component_risk(
-            component_id=component_id,
-            suppliers=state.suppliers,
-            component_master=state.component_master,
-            inventory_levels=state.inventory_levels,
-            purchase_orders=state.purchase_orders,
-            shipments=state.shipments,
-            customer_orders_by_component=state.customer_orders_by_component,
-            external_risk_events=state.external_risk_events,
-        )
+        risk, recommendation, alert = state.score(component_id)
         publisher.publish(asdict(risk), asdict(recommendation), asdict(alert))
+        scored += 1
+    return scored
+
+
+def run_dry_run(
+    scenario: str,
+    count: int,
+    partition: tuple[int, int] | None,
+    snapshot_dir: str | None,
+) -> None:
+    """Synthetic events through one (optionally partitioned) engine, with snapshot/restore."""
+    label = f"Partition {partition[0]}/{partition[1]}" if partition else "Engine"
+    path = snapshot_path(snapshot_dir, partition) if snapshot_dir else None
+    restored = load_snapshot(path, partition) if path else None
+    state, offsets = restored or (RiskEngineState(partition=partition), {})
+    if restored:
+        console.print(f"{label}: Restored {len(state.shipments)} shipments from {path}; resuming at event {offsets.get('dry-run:0', 0)}.")
+
+    publisher = RiskPublisher(producer=None, slack_webhook_url=None)
+    position = offsets.get("dry-run:0", 0)
+    scored: set[str] = set()
+    for idx, (topic_key, key, event) in enumerate(scenario_events(scenario=scenario, count=count)):
+        if idx < position:
+            continue
+        affected = state.update(TOPICS[topic_key], key, event)
+        score_and_publish(state, publisher, affected)
+        scored |= {c for c in affected if state.can_score(c)}
+        position = idx + 1
+
+    console.print(f"{label}: scored components: {', '.join(sorted(scored)) or 'none'}")
+    if path:
+        size = save_snapshot(path, state, {"dry-run:0": position})
+        console.print(f"{label}: Snapshot written to {path} ({size} bytes).")
+
+
+def engine_assignment(partition_counts: dict[str, int], partition: tuple[int, int]) -> list[tuple[str, int]]:
+    """(topic, Kafka partition) pairs that one engine partition reads.
+
+    Component topics are keyed by component_id, and the consistent_random
+    partitioner puts a key in Kafka partition crc32(key) % P. When the
+    engine partition count divides P, Kafka partition p holds only
+    components of engine partition p % count, so each engine reads 1/count
+    of those topics. Supplier profiles and external risk events are small
+    and read in full by every engine.
+    """
+    index, count = partition
+    assigned: list[tuple[str, int]] = []
+    for topic_key in INPUT_TOPIC_KEYS:
+        topic = TOPICS[topic_key]
+        partitions = partition_counts[topic]
+        if topic_key in COMPONENT_TOPICS:
+            if partitions % count:
+                raise ValueError(
+                    f"Topic {topic} has {partitions} partitions; the engine partition count ({count}) must divide it"
+                )
+            assigned.extend((topic, p) for p in range(index, partitions, count))
+        else:
+            assigned.extend((topic, p) for p in range(partitions))
+    return assigned
+
+
+def run_engine(
+    partition: tuple[int, int] | None,
+    batch_size: int,
+    snapshot_dir: str | None,
+    snapshot_interval: float,
+) -> None:
+    """Consume, score and publish for one slice of the component key space."""
+    from confluent_kafka import Consumer, Producer, TopicPartition
+
+    settings = load_settings()
+    path = snapshot_path(snapshot_dir, partition) if snapshot_dir else None
+    restored = load_snapshot(path, partition) if path else None
+    state, offsets = restored or (RiskEngineState(partition=partition), {})
+    if restored:
+        console.print(f"Restored state from {path} ({len(offsets)} partition offsets).")
+
+    # Every engine partition reads the shared reference topics, so each commits to its own group
+    group_id = settings.kafka.consumer_group
+    if partition:
+        group_id = f"{group_id}-p{partition[0]}of{partition[1]}"
+
+    producer = Producer(producer_config(settings.kafka))
+    publisher = RiskPublisher(producer=producer, slack_webhook_url=settings.slack_webhook_url)
+    consumer = Consumer(consumer_config(settings.kafka, group_id=group_id, auto_commit=False))
+    topics = [TOPICS[key] for key in INPUT_TOPIC_KEYS]
+    assignment = None
+    if partition:
+        metadata = consumer.list_topics(timeout=10)
+        counts = {topic: len(metadata.topics[topic].partitions) for topic in topics}
+        assignment = [TopicPartition(topic, p) for topic, p in engine_assignment(counts, partition)]
+
+    def handle_batch(records: list[tuple[str, str | None, dict[str, Any]]]) -> None:
+        delivery_stats.scored += process_batch(state, publisher, records)
+
+    last_snapshot = time.monotonic()
+    latest_offsets = dict(offsets)
+
+    def after_commit(positions: dict[str, int]) -> None:
+        nonlocal last_snapshot
+        latest_offsets.update(positions)
+        if path and time.monotonic() - last_snapshot >= snapshot_interval:
+            save_snapshot(path, state, latest_offsets)
+            last_snapshot = time.monotonic()
+
+    try:
+        consume_batches(
+            consumer, topics, handle_batch, producer=producer, batch_size=batch_size,
+            start_offsets=offsets, after_commit=after_commit, partitions=assignment,
+        )
+    finally:
+        if path:
+            size = save_snapshot(path, state, latest_offsets)
+            console.print(f"Final snapshot written to {path} ({size} bytes).")
+
+
+def _run_partition(kwargs: dict[str, Any]) -> None:
+    if kwargs.pop("dry_run"):
+        run_dry_run(**kwargs)
+    else:
+        run_engine(**kwargs)
 
 
 @app.command()
@@ -130,24 +204,39 @@ def main(
     dry_run: bool = typer.Option(False, help="Run with in-memory synthetic events and print outputs."),
     scenario: str = typer.Option("supplier_delay", help="Scenario to use for dry run."),
     count: int = typer.Option(8, help="Dry-run event batches."),
+    batch_size: int = typer.Option(500, help="Max records consumed and scored per micro-batch."),
+    partition_index: int = typer.Option(0, help="This engine's slice of the component key space."),
+    partition_count: int = typer.Option(1, help="Total number of engine partitions."),
+    workers: int = typer.Option(1, help="Run this many partitions as local processes (overrides the partition options)."),
+    snapshot_dir: str | None = typer.Option(None, help="Directory for state snapshots; restored on start."),
+    snapshot_interval: float = typer.Option(60.0, help="Seconds between state snapshots."),
 ) -> None:
-    settings = load_settings()
-    state = RiskEngineState()
-
     if dry_run:
         console.print("Running risk engine in dry-run mode.")
-        publisher = RiskPublisher(producer=None, slack_webhook_url=None)
-        for topic_key, key, event in scenario_events(scenario=scenario, count=count):
-            process_event(state, publisher, TOPICS[topic_key], key, event)
+        common: dict[str, Any] = {"dry_run": True, "scenario": scenario, "count": count, "snapshot_dir": snapshot_dir}
+    else:
+        common = {"dry_run": False, "batch_size": batch_size, "snapshot_dir": snapshot_dir, "snapshot_interval": snapshot_interval}
+
+    if workers > 1:
+        ctx = multiprocessing.get_context("spawn")
+        procs = [
+            ctx.Process(target=_run_partition, args=({**common, "partition": (i, workers)},), name=f"risk-engine-p{i}")
+            for i in range(workers)
+        ]
+        for proc in procs:
+            proc.start()
+        try:
+            for proc in procs:
+                proc.join()
+        except KeyboardInterrupt:
+            for proc in procs:
+                proc.join()
         return
 
-    from confluent_kafka import Consumer, Producer
-
-    producer = Producer(producer_config(settings.kafka))
-    publisher = RiskPublisher(producer=producer, slack_webhook_url=settings.slack_webhook_url)
-    consumer = Consumer(consumer_config(settings.kafka))
-    topics = [TOPICS[key] for key in INPUT_TOPIC_KEYS]
-    consume_loop(consumer, topics, lambda topic, key, event: process_event(state, publisher, topic, key, event))
+    if not 0 <= partition_index < partition_count:
+        raise typer.BadParameter("partition-index must be between 0 and partition-count - 1")
+    partition = (partition_index, partition_count) if partition_count > 1 else None
+    _run_partition({**common, "partition": partition})
 
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
 from typing import Any
 from uuid import uuid4
 
@@ -8,7 +10,7 @@ from .models import Alert, Recommendation, RiskResult
 
 
 def utc_now() -> str:
-    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    return datetime.now(UTC).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
 def risk_band(score: int) -> str:
@@ -46,6 +48,45 @@ def choose_priority_order(customer_orders: list[dict[str, Any]]) -> dict[str, An
     )
 
 
+@dataclass(frozen=True)
+class ShipmentAggregate:
+    """Per-component summary of the shipments that are not yet delivered."""
+
+    open_shipments: int = 0
+    max_delay_hours: int = 0
+    supplier_id: str | None = None  # supplier of the most delayed shipment
+    route_ids: frozenset[str] = field(default_factory=frozenset)
+
+
+def aggregate_shipments(shipments: Iterable[dict[str, Any]]) -> ShipmentAggregate:
+    """Summarise one component's shipments, ignoring delivered ones."""
+    open_shipments = 0
+    max_delay_hours = 0
+    supplier_id = None
+    route_ids = set()
+    for shipment in shipments:
+        if shipment.get("status") == "DELIVERED":
+            continue
+        delay = int(shipment.get("delay_hours", 0))
+        # First shipment with the highest delay wins, as with max()
+        if not open_shipments or delay > max_delay_hours:
+            max_delay_hours, supplier_id = delay, shipment.get("supplier_id")
+        open_shipments += 1
+        if shipment.get("route_id"):
+            route_ids.add(shipment["route_id"])
+    return ShipmentAggregate(open_shipments, max_delay_hours, supplier_id, frozenset(route_ids))
+
+
+def aggregate_external_events(events: Iterable[dict[str, Any]]) -> tuple[int, int]:
+    """Return (max severity, max expected delay hours) over external risk events."""
+    max_severity = 0
+    max_delay_hours = 0
+    for event in events:
+        max_severity = max(max_severity, int(event.get("severity", 0)))
+        max_delay_hours = max(max_delay_hours, int(event.get("expected_delay_hours", 0)))
+    return max_severity, max_delay_hours
+
+
 def find_alternate_supplier(
     component_id: str,
     primary_supplier_id: str | None,
@@ -72,29 +113,51 @@ def score_component_risk(
     customer_orders_by_component: dict[str, list[dict[str, Any]]],
     external_risk_events: list[dict[str, Any]],
 ) -> tuple[RiskResult, Recommendation, Alert]:
-    inventory = inventory_levels.get(component_id)
-    component = component_master.get(component_id, {})
-    relevant_shipments = [s for s in shipments.values() if s.get("component_id") == component_id and s.get("status") != "DELIVERED"]
+    relevant_shipments = [s for s in shipments.values() if s.get("component_id") == component_id]
     relevant_pos = [po for po in purchase_orders.values() if po.get("component_id") == component_id]
-    customer_order = choose_priority_order(customer_orders_by_component.get(component_id, []))
+    shipment_agg = aggregate_shipments(relevant_shipments)
+    relevant_external = [e for e in external_risk_events if e.get("route_id") in shipment_agg.route_ids]
+    return score_component_aggregates(
+        component_id=component_id,
+        component=component_master.get(component_id, {}),
+        inventory=inventory_levels.get(component_id),
+        customer_orders=customer_orders_by_component.get(component_id, []),
+        shipment_agg=shipment_agg,
+        latest_po_supplier_id=relevant_pos[-1].get("supplier_id") if relevant_pos else None,
+        external_agg=aggregate_external_events(relevant_external),
+        suppliers=suppliers,
+    )
+
+
+def score_component_aggregates(
+    component_id: str,
+    component: dict[str, Any],
+    inventory: dict[str, Any] | None,
+    customer_orders: list[dict[str, Any]],
+    shipment_agg: ShipmentAggregate,
+    latest_po_supplier_id: str | None,
+    external_agg: tuple[int, int],
+    suppliers: dict[str, dict[str, Any]],
+    alternate_candidates: dict[str, dict[str, Any]] | None = None,
+) -> tuple[RiskResult, Recommendation, Alert]:
+    """Score a component from pre-aggregated inputs.
+
+    ``score_component_risk`` derives these by scanning the full state; the
+    risk engine keeps them up to date incrementally. ``alternate_candidates``
+    may be narrowed to the suppliers listing this component as an alternate.
+    """
+    customer_order = choose_priority_order(customer_orders)
 
     days_supply = calculate_days_of_supply(inventory)
-    max_delay_hours = max([int(s.get("delay_hours", 0)) for s in relevant_shipments] or [0])
+    max_delay_hours = shipment_agg.max_delay_hours
     max_delay_days = round(max_delay_hours / 24, 2)
 
-    primary_supplier_id = None
-    if relevant_shipments:
-        primary_supplier_id = max(relevant_shipments, key=lambda s: int(s.get("delay_hours", 0))).get("supplier_id")
-    elif relevant_pos:
-        primary_supplier_id = relevant_pos[-1].get("supplier_id")
+    primary_supplier_id = shipment_agg.supplier_id if shipment_agg.open_shipments else latest_po_supplier_id
 
     supplier = suppliers.get(primary_supplier_id or "", {})
     supplier_reliability = float(supplier.get("reliability_score", 100))
 
-    route_ids = {s.get("route_id") for s in relevant_shipments if s.get("route_id")}
-    relevant_external = [e for e in external_risk_events if e.get("route_id") in route_ids]
-    max_external_severity = max([int(e.get("severity", 0)) for e in relevant_external] or [0])
-    external_delay_hours = max([int(e.get("expected_delay_hours", 0)) for e in relevant_external] or [0])
+    max_external_severity, external_delay_hours = external_agg
 
     inventory_risk = 0
     if days_supply <= 0:
@@ -128,7 +191,9 @@ def score_component_risk(
 
     external_event_risk = min(20, max_external_severity * 4 + int(external_delay_hours / 12))
 
-    alternate_supplier = find_alternate_supplier(component_id, primary_supplier_id, suppliers)
+    alternate_supplier = find_alternate_supplier(
+        component_id, primary_supplier_id, suppliers if alternate_candidates is None else alternate_candidates
+    )
     mitigation_credit = 0
     if alternate_supplier:
         mitigation_credit += 10
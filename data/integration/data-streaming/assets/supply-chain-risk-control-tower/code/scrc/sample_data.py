@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from itertools import cycle
-from typing import Any, Iterable
+import random
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+from itertools import cycle, islice
+from typing import Any
 from uuid import uuid4
 
 
 def now(offset_hours: int = 0) -> str:
-    return (datetime.now(timezone.utc) + timedelta(hours=offset_hours)).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    return (datetime.now(UTC) + timedelta(hours=offset_hours)).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
 def eid(prefix: str) -> str:
@@ -15,7 +17,11 @@ def eid(prefix: str) -> str:
 
 
 def base_reference_events() -> list[tuple[str, str, dict[str, Any]]]:
-    """Reference data sent once at the start of every scenario."""
+    """Reference data sent once at the start of every scenario.
+
+    Records of component topics are keyed by component_id so that a
+    component's records land in one Kafka partition (see engine_assignment).
+    """
     return [
         (
             "supplier_profiles",
@@ -75,7 +81,7 @@ def base_reference_events() -> list[tuple[str, str, dict[str, Any]]]:
         ),
         (
             "customer_orders",
-            "CO-10491",
+            "BRG-9004",
             {
                 "event_id": eid("EVT"),
                 "customer_order_id": "CO-10491",
@@ -116,7 +122,7 @@ def scenario_events(scenario: str = "supplier_delay", count: int = 20) -> Iterab
 
         yield (
             "purchase_orders",
-            po_id,
+            "BRG-9004",
             {
                 "event_id": eid("EVT"),
                 "po_id": po_id,
@@ -130,7 +136,7 @@ def scenario_events(scenario: str = "supplier_delay", count: int = 20) -> Iterab
         )
         yield (
             "shipments",
-            shipment_id,
+            "BRG-9004",
             {
                 "event_id": eid("EVT"),
                 "shipment_id": shipment_id,
@@ -178,3 +184,145 @@ def scenario_events(scenario: str = "supplier_delay", count: int = 20) -> Iterab
                     "event_time": event_time,
                 },
             )
+
+
+# ── Load generation ──────────────────────────────────────────────────────────
+# Synthetic events over a configurable key space, for throughput tests.
+# Components are split between workers by index, so every component's
+# records come from one worker and keep their order.
+
+LOAD_SHIPMENTS_PER_COMPONENT = 3
+LOAD_EVENTS_PER_ROUTE = 8   # concurrent external risk events kept per route
+
+
+def load_reference_events(
+    components: int, suppliers: int, worker: int = 0, workers: int = 1
+) -> list[tuple[str, str, dict[str, Any]]]:
+    """Suppliers (worker 0 only) plus master data for this worker's components."""
+    events: list[tuple[str, str, dict[str, Any]]] = []
+    event_time = now()
+    if worker == 0:
+        for s in range(suppliers):
+            supplier_id = f"SUP-L{s:05d}"
+            events.append(("supplier_profiles", supplier_id, {
+                "supplier_id": supplier_id,
+                "supplier_name": f"Load Supplier {s}",
+                "region": "APAC" if s % 2 else "US-MIDWEST",
+                "country": "Taiwan" if s % 2 else "United States",
+                "reliability_score": 70 + s % 25,
+                "risk_tier": "HIGH" if s % 2 else "LOW",
+                "preferred": s % 2 == 1,
+                # Even suppliers stand in for (some of) the next supplier's components
+                "alternate_for_components": [
+                    f"CMP-L{c:06d}" for c in islice(range((s + 1) % suppliers, components, suppliers), 50)
+                ] if s % 2 == 0 else [],
+                "last_updated": event_time,
+            }))
+    for c in range(worker, components, workers):
+        component_id = f"CMP-L{c:06d}"
+        events.append(("component_master", component_id, {
+            "component_id": component_id,
+            "component_name": f"Load component {c}",
+            "criticality": ("CRITICAL", "HIGH", "MEDIUM", "LOW")[c % 4],
+            "lead_time_days": 14 + c % 21,
+            "approved_suppliers": [f"SUP-L{c % suppliers:05d}"],
+            "safety_stock_qty": 600,
+            "last_updated": event_time,
+        }))
+        events.append(("customer_orders", component_id, {
+            "event_id": f"EVT-W{worker}-REF{c}",
+            "customer_order_id": f"CO-L{c:06d}",
+            "customer_name": f"Load customer {c % 97}",
+            "component_id": component_id,
+            "required_qty": 900,
+            "committed_ship_date": now(96),
+            "priority": "STRATEGIC" if c % 5 == 0 else "STANDARD",
+            "revenue_at_risk": 10000 * (1 + c % 75),
+            "event_time": event_time,
+        }))
+    return events
+
+
+def load_events(
+    components: int,
+    suppliers: int,
+    routes: int,
+    worker: int = 0,
+    workers: int = 1,
+    seed: int = 0,
+) -> Iterator[tuple[str, str, dict[str, Any]]]:
+    """Endless stream of PO, shipment, inventory and external risk updates.
+
+    Event timestamps are refreshed every 1000 events rather than per event,
+    so generation stays cheap at high rates.
+    """
+    rng = random.Random(seed * 1000 + worker)
+    mine = list(range(worker, components, workers))
+    if not mine:
+        return
+    event_time = now()
+    n = 0
+    while True:
+        n += 1
+        if n % 1000 == 0:
+            event_time = now()
+        c = rng.choice(mine)
+        component_id = f"CMP-L{c:06d}"
+        supplier_id = f"SUP-L{c % suppliers:05d}"
+        route_id = f"ROUTE-L{c % routes:04d}"
+        event_id = f"EVT-W{worker}-{n}"
+        kind = rng.random()
+        if kind < 0.3:
+            shipment_id = f"SHP-L{c:06d}-{rng.randrange(LOAD_SHIPMENTS_PER_COMPONENT)}"
+            delay_hours = rng.choice((0, 12, 24, 48, 72, 96))
+            yield ("shipments", component_id, {
+                "event_id": event_id,
+                "shipment_id": shipment_id,
+                "po_id": f"PO-L{c:06d}",
+                "supplier_id": supplier_id,
+                "component_id": component_id,
+                "carrier": "OceanBridge Logistics",
+                "status": "DELAYED" if delay_hours >= 48 else "IN_TRANSIT",
+                "current_location": "Port of Los Angeles",
+                "eta": event_time,
+                "delay_hours": delay_hours,
+                "route_id": route_id,
+                "event_time": event_time,
+            })
+        elif kind < 0.6:
+            yield ("inventory_levels", component_id, {
+                "event_id": event_id,
+                "component_id": component_id,
+                "site_id": "PLANT-CHICAGO-01",
+                "on_hand_qty": rng.randrange(100, 1200),
+                "reserved_qty": 180,
+                "safety_stock_qty": 600,
+                "daily_usage_qty": 150,
+                "event_time": event_time,
+            })
+        elif kind < 0.9:
+            yield ("purchase_orders", component_id, {
+                "event_id": event_id,
+                "po_id": f"PO-L{c:06d}",
+                "component_id": component_id,
+                "supplier_id": supplier_id,
+                "ordered_qty": 1200,
+                "committed_eta": event_time,
+                "status": "IN_TRANSIT",
+                "event_time": event_time,
+            })
+        else:
+            severity = rng.randint(1, 5)
+            risk_event_id = f"EXT-{route_id}-{rng.randrange(LOAD_EVENTS_PER_ROUTE)}"
+            yield ("external_risk_events", risk_event_id, {
+                "event_id": risk_event_id,
+                "risk_event_id": risk_event_id,
+                "event_type": "PORT",
+                "region": "US-WEST",
+                "country": "United States",
+                "route_id": route_id,
+                "severity": severity,
+                "description": "Synthetic load-test risk event",
+                "expected_delay_hours": severity * 12,
+                "event_time": event_time,
+            })
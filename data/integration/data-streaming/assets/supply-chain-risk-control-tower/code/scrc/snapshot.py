@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+import zlib
+from pathlib import Path
+from typing import Any
+
+try:
+    import msgpack
+except ModuleNotFoundError:  # Snapshots fall back to compressed JSON.
+    msgpack = None  # type: ignore
+
+from .state import RiskEngineState
+
+_MSGPACK = b"SCRC-MP1"
+_JSON = b"SCRC-JS1"
+
+
+def snapshot_path(directory: str | Path, partition: tuple[int, int] | None) -> Path:
+    index, count = partition or (0, 1)
+    return Path(directory) / f"risk-engine-p{index}of{count}.snap"
+
+
+def encode_snapshot(state: RiskEngineState, offsets: dict[str, int]) -> bytes:
+    payload = {"version": 1, "taken_at": time.time(), "offsets": offsets, "state": state.to_snapshot()}
+    if msgpack is not None:
+        return _MSGPACK + zlib.compress(msgpack.packb(payload, use_bin_type=True))
+    return _JSON + zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_snapshot(blob: bytes) -> dict[str, Any]:
+    header, body = blob[:8], zlib.decompress(blob[8:])
+    if header == _MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("Snapshot was written with msgpack; install msgpack to restore it.")
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    if header == _JSON:
+        return json.loads(body.decode("utf-8"))
+    raise ValueError("Not a risk engine snapshot")
+
+
+def save_snapshot(path: str | Path, state: RiskEngineState, offsets: dict[str, int]) -> int:
+    """Atomically write state plus the offsets it reflects; return the size in bytes."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    blob = encode_snapshot(state, offsets)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(blob)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+    return len(blob)
+
+
+def load_snapshot(path: str | Path, partition: tuple[int, int] | None) -> tuple[RiskEngineState, dict[str, int]] | None:
+    """Restore state and offsets, or None if there is no usable snapshot.
+
+    A snapshot taken with a different partitioning is ignored, since its
+    state holds a different slice of the component key space.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    data = decode_snapshot(path.read_bytes())
+    saved = data["state"].get("partition")
+    if (tuple(saved) if saved else None) != partition:
+        return None
+    return RiskEngineState.from_snapshot(data["state"]), {k: int(v) for k, v in data["offsets"].items()}
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import heapq
+import time
+import zlib
+from datetime import datetime
+from typing import Any
+
+from .models import Alert, Recommendation, RiskResult
+from .risk_logic import (
+    ShipmentAggregate,
+    aggregate_external_events,
+    aggregate_shipments,
+    score_component_aggregates,
+)
+from .settings import TOPICS
+
+# External risk events stop contributing to scores this long after their
+# event_time, or once their expected delay has passed, whichever is later.
+EXTERNAL_EVENT_TTL_HOURS = 72
+
+_NO_SHIPMENTS = ShipmentAggregate()
+
+# Topics whose records belong to exactly one component (partitioned state)
+COMPONENT_TOPICS = ("component_master", "inventory_levels", "purchase_orders", "shipments", "customer_orders")
+
+
+def component_partition(component_id: str, partition_count: int) -> int:
+    """Stable partition index of a component (same on every engine process)."""
+    return zlib.crc32(component_id.encode("utf-8")) % partition_count
+
+
+def _event_epoch(event: dict[str, Any], default: float) -> float:
+    raw = event.get("event_time")
+    if not raw:
+        return default
+    try:
+        return datetime.fromisoformat(str(raw).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return default
+
+
+class RiskEngineState:
+    """In-memory view of the input topics, indexed for incremental scoring.
+
+    Besides the latest record per key, the state keeps secondary indexes
+    (shipments and purchase orders by component, shipments and external
+    events by route, alternate suppliers by component) plus per-component
+    shipment aggregates and per-route event aggregates. Scoring a component
+    therefore touches only that component's records, and an external event
+    only reaches the components shipping on its route. External events are
+    evicted once expired, so the event index does not grow without bound.
+
+    With ``partition=(index, count)`` the state only keeps and scores the
+    components whose ``component_partition`` equals ``index``; supplier
+    profiles and external events are small and kept by every partition.
+    """
+
+    def __init__(
+        self,
+        event_ttl_hours: float = EXTERNAL_EVENT_TTL_HOURS,
+        partition: tuple[int, int] | None = None,
+    ) -> None:
+        self.suppliers: dict[str, dict[str, Any]] = {}
+        self.component_master: dict[str, dict[str, Any]] = {}
+        self.inventory_levels: dict[str, dict[str, Any]] = {}
+        self.purchase_orders: dict[str, dict[str, Any]] = {}
+        self.shipments: dict[str, dict[str, Any]] = {}
+        self.customer_orders_by_component: dict[str, list[dict[str, Any]]] = {}
+
+        # Secondary indexes
+        self.shipments_by_component: dict[str, dict[str, dict[str, Any]]] = {}
+        self.shipments_by_route: dict[str, set[str]] = {}
+        self.purchase_orders_by_component: dict[str, dict[str, dict[str, Any]]] = {}
+        self.alternate_suppliers_by_component: dict[str, dict[str, dict[str, Any]]] = {}
+        self.events_by_route: dict[str, dict[str, dict[str, Any]]] = {}
+
+        # Incremental aggregates
+        self.shipment_aggregates: dict[str, ShipmentAggregate] = {}
+        self.route_event_aggregates: dict[str, tuple[int, int]] = {}
+
+        self.event_ttl_seconds = event_ttl_hours * 3600
+        self._event_expiry: list[tuple[float, int, str, str]] = []  # (expires_at, seq, route, event key)
+        self._event_expires_at: dict[tuple[str, str], float] = {}
+        self._event_seq = 0
+        self.partition = partition
+
+    def owns(self, component_id: str | None) -> bool:
+        if self.partition is None:
+            return True
+        if component_id is None:
+            return False
+        index, count = self.partition
+        return component_partition(component_id, count) == index
+
+    @property
+    def external_risk_events(self) -> list[dict[str, Any]]:
+        """All unexpired external risk events."""
+        return [event for events in self.events_by_route.values() for event in events.values()]
+
+    def update(self, topic: str, key: str | None, event: dict[str, Any], now: float | None = None) -> set[str]:
+        """Update state and return component IDs that should be rescored."""
+        now = time.time() if now is None else now
+        affected_components = self.evict_expired(now)
+
+        if self.partition is not None and any(topic == TOPICS[t] for t in COMPONENT_TOPICS):
+            if not self.owns(event.get("component_id")):
+                return affected_components
+
+        if topic == TOPICS["supplier_profiles"]:
+            supplier_id = event["supplier_id"]
+            previous = self.suppliers.get(supplier_id)
+            self.suppliers[supplier_id] = event
+            for component_id in (previous or {}).get("alternate_for_components", []):
+                self.alternate_suppliers_by_component.get(component_id, {}).pop(supplier_id, None)
+                affected_components.add(component_id)
+            for component_id in event.get("alternate_for_components", []):
+                self.alternate_suppliers_by_component.setdefault(component_id, {})[supplier_id] = event
+                affected_components.add(component_id)
+
+        elif topic == TOPICS["component_master"]:
+            component_id = event["component_id"]
+            self.component_master[component_id] = event
+            affected_components.add(component_id)
+
+        elif topic == TOPICS["inventory_levels"]:
+            component_id = event["component_id"]
+            self.inventory_levels[component_id] = event
+            affected_components.add(component_id)
+
+        elif topic == TOPICS["purchase_orders"]:
+            po_id = event["po_id"]
+            previous = self.purchase_orders.get(po_id)
+            self.purchase_orders[po_id] = event
+            if previous and previous.get("component_id") != event["component_id"]:
+                self.purchase_orders_by_component.get(previous.get("component_id"), {}).pop(po_id, None)
+                affected_components.add(previous.get("component_id"))
+            self.purchase_orders_by_component.setdefault(event["component_id"], {})[po_id] = event
+            affected_components.add(event["component_id"])
+
+        elif topic == TOPICS["shipments"]:
+            affected_components |= self._update_shipment(event)
+
+        elif topic == TOPICS["customer_orders"]:
+            component_id = event["component_id"]
+            orders = self.customer_orders_by_component.setdefault(component_id, [])
+            orders = [order for order in orders if order["customer_order_id"] != event["customer_order_id"]]
+            orders.append(event)
+            self.customer_orders_by_component[component_id] = orders
+            affected_components.add(component_id)
+
+        elif topic == TOPICS["external_risk_events"]:
+            affected_components |= self._add_external_event(key, event, now)
+
+        affected_components.discard(None)
+        if self.partition is not None:
+            affected_components = {c for c in affected_components if self.owns(c)}
+        return affected_components
+
+    def can_score(self, component_id: str) -> bool:
+        return component_id in self.inventory_levels and component_id in self.component_master
+
+    def score(self, component_id: str) -> tuple[RiskResult, Recommendation, Alert]:
+        """Score one component from the indexes and aggregates."""
+        shipment_agg = self.shipment_aggregates.get(component_id, _NO_SHIPMENTS)
+        route_aggs = [self.route_event_aggregates[r] for r in shipment_agg.route_ids if r in self.route_event_aggregates]
+        pos = self.purchase_orders_by_component.get(component_id)
+        return score_component_aggregates(
+            component_id=component_id,
+            component=self.component_master.get(component_id, {}),
+            inventory=self.inventory_levels.get(component_id),
+            customer_orders=self.customer_orders_by_component.get(component_id, []),
+            shipment_agg=shipment_agg,
+            latest_po_supplier_id=next(reversed(pos.values())).get("supplier_id") if pos else None,
+            external_agg=(
+                max((severity for severity, _ in route_aggs), default=0),
+                max((delay for _, delay in route_aggs), default=0),
+            ),
+            suppliers=self.suppliers,
+            alternate_candidates=self.alternate_suppliers_by_component.get(component_id, {}),
+        )
+
+    def to_snapshot(self) -> dict[str, Any]:
+        """Primary records only; indexes and aggregates are rebuilt on restore."""
+        return {
+            "partition": list(self.partition) if self.partition else None,
+            "suppliers": list(self.suppliers.values()),
+            "component_master": list(self.component_master.values()),
+            "inventory_levels": list(self.inventory_levels.values()),
+            "purchase_orders": list(self.purchase_orders.values()),
+            "shipments": list(self.shipments.values()),
+            "customer_orders": [o for orders in self.customer_orders_by_component.values() for o in orders],
+            "external_risk_events": [
+                [key, event] for events in self.events_by_route.values() for key, event in events.items()
+            ],
+        }
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        data: dict[str, Any],
+        event_ttl_hours: float = EXTERNAL_EVENT_TTL_HOURS,
+        now: float | None = None,
+    ) -> RiskEngineState:
+        """Rebuild a state (with indexes) from ``to_snapshot`` output."""
+        partition = data.get("partition")
+        state = cls(event_ttl_hours=event_ttl_hours, partition=tuple(partition) if partition else None)
+        for topic_key in ("suppliers", *COMPONENT_TOPICS):
+            topic = TOPICS["supplier_profiles" if topic_key == "suppliers" else topic_key]
+            for record in data.get(topic_key, []):
+                state.update(topic, None, record, now=now)
+        for key, event in data.get("external_risk_events", []):
+            state.update(TOPICS["external_risk_events"], key, event, now=now)
+        return state
+
+    def evict_expired(self, now: float) -> set[str]:
+        """Drop expired external events; return the components to rescore."""
+        touched_routes: set[str] = set()
+        while self._event_expiry and self._event_expiry[0][0] <= now:
+            _, _, route_id, event_key = heapq.heappop(self._event_expiry)
+            # A redelivered event may have pushed its expiry further out
+            if self._event_expires_at.get((route_id, event_key), now + 1) > now:
+                continue
+            del self._event_expires_at[(route_id, event_key)]
+            self.events_by_route[route_id].pop(event_key, None)
+            touched_routes.add(route_id)
+        affected: set[str] = set()
+        for route_id in touched_routes:
+            self._refresh_route(route_id)
+            affected |= self._components_on_route(route_id)
+        return affected
+
+    def _update_shipment(self, event: dict[str, Any]) -> set[str]:
+        shipment_id = event["shipment_id"]
+        component_id = event["component_id"]
+        route_id = event.get("route_id")
+        previous = self.shipments.get(shipment_id)
+        self.shipments[shipment_id] = event
+        affected = {component_id}
+
+        if previous:
+            previous_component = previous.get("component_id")
+            if previous_component != component_id:
+                self.shipments_by_component.get(previous_component, {}).pop(shipment_id, None)
+                self._refresh_component(previous_component)
+                affected.add(previous_component)
+            previous_route = previous.get("route_id")
+            if previous_route and previous_route != route_id:
+                self.shipments_by_route.get(previous_route, set()).discard(shipment_id)
+
+        self.shipments_by_component.setdefault(component_id, {})[shipment_id] = event
+        if route_id:
+            self.shipments_by_route.setdefault(route_id, set()).add(shipment_id)
+        self._refresh_component(component_id)
+        return affected
+
+    def _add_external_event(self, key: str | None, event: dict[str, Any], now: float) -> set[str]:
+        route_id = event.get("route_id")
+        if not route_id:
+            return set()
+        event_time = _event_epoch(event, now)
+        expected_end = event_time + int(event.get("expected_delay_hours", 0)) * 3600
+        expires_at = max(event_time + self.event_ttl_seconds, expected_end)
+        if expires_at <= now:
+            return set()
+
+        # Keyed by event_id so redelivered records are not counted twice
+        event_key = event.get("event_id") or key or f"seq-{self._event_seq}"
+        events = self.events_by_route.setdefault(route_id, {})
+        replaced = event_key in events
+        events[event_key] = event
+        self._event_seq += 1
+        self._event_expires_at[(route_id, event_key)] = expires_at
+        heapq.heappush(self._event_expiry, (expires_at, self._event_seq, route_id, event_key))
+
+        if replaced:
+            self._refresh_route(route_id)
+        else:
+            severity, delay = self.route_event_aggregates.get(route_id, (0, 0))
+            self.route_event_aggregates[route_id] = (
+                max(severity, int(event.get("severity", 0))),
+                max(delay, int(event.get("expected_delay_hours", 0))),
+            )
+        return self._components_on_route(route_id)
+
+    def _components_on_route(self, route_id: str) -> set[str]:
+        return {self.shipments[shipment_id]["component_id"] for shipment_id in self.shipments_by_route.get(route_id, ())}
+
+    def _refresh_component(self, component_id: str) -> None:
+        shipments = self.shipments_by_component.get(component_id)
+        if shipments:
+            self.shipment_aggregates[component_id] = aggregate_shipments(shipments.values())
+        else:
+            self.shipment_aggregates.pop(component_id, None)
+
+    def _refresh_route(self, route_id: str) -> None:
+        events = self.events_by_route.get(route_id)
+        if events:
+            self.route_event_aggregates[route_id] = aggregate_external_events(events.values())
+        else:
+            self.events_by_route.pop(route_id, None)
+            self.route_event_aggregates.pop(route_id, None)
@@ -1299,6 +1299,11 @@ function handleBridgeMessage(msg) {
     case 'bridge_error':
       showToast('Bridge error', msg.message, 'warning');
       break;
+
+    case 'bridge_gap':
+      // This tab fell further behind than the bridge's ring buffer holds
+      showToast('Stream gap', `${msg.missed} events skipped — tab could not keep up`, 'warning');
+      break;
   }
 }
 
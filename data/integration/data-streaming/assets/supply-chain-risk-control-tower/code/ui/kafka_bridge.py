@@ -2,7 +2,7 @@
 """
 Supply Chain Risk Control Tower — Kafka ↔ Browser SSE Bridge
 =============================================================
-Runs a single HTTP server on one process:
+Runs a single asyncio HTTP server on one process:
   GET  :8765/          — health check and uptime stats
   GET  :8765/status    — JSON process and consumer status
   GET  :8765/events    — Server-Sent Events stream (all 10 Kafka topics)
@@ -10,30 +10,37 @@ Runs a single HTTP server on one process:
   POST :8765/stop      — stop producer + risk engine
   POST :8765/restart-engine — restart just the risk engine
 
+/events accepts two optional query parameters:
+  topics=a,b       — only forward these topics (topic keys or topic names);
+                     process / control messages are always forwarded
+  lastEventId=N    — resume after event N (same as the Last-Event-ID header
+                     that EventSource sends when it reconnects)
+
 Usage (from project root, with .venv active):
   python code/ui/kafka_bridge.py
 
 Options (environment variables):
-  BRIDGE_HOST  default 0.0.0.0
-  BRIDGE_PORT  default 8765
+  BRIDGE_HOST       default 0.0.0.0
+  BRIDGE_PORT       default 8765
+  BRIDGE_RING_SIZE  default 20000  (events kept for resume / slow clients)
+  BRIDGE_BATCH_MS   default 50     (min. interval between writes per client)
 
 The Carbon UI (code/ui/index.html) connects to :8765/events as an EventSource.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-import queue
 import signal
-import socketserver
 import subprocess
 import sys
 import threading
 import time
-from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from typing import Any
+from urllib.parse import parse_qs
 
 # ── Resolve project root regardless of cwd ──────────────────────────────────
 # File lives at  <project_root>/code/ui/kafka_bridge.py
@@ -45,60 +52,147 @@ PYTHON_EXE   = str(VENV_PYTHON) if VENV_PYTHON.exists() else sys.executable
 
 HOST = os.getenv("BRIDGE_HOST", "0.0.0.0")
 PORT = int(os.getenv("BRIDGE_PORT", "8765"))
+RING_SIZE = int(os.getenv("BRIDGE_RING_SIZE", "20000"))
+BATCH_WINDOW = int(os.getenv("BRIDGE_BATCH_MS", "50")) / 1000
+
+HEARTBEAT_S = 15        # comment frame sent to idle clients (keeps proxies open)
+WRITE_TIMEOUT_S = 30    # a client that cannot take a write for this long is dropped
+MAX_FRAMES_PER_WRITE = 2000
+CONSUME_BATCH = 500     # Kafka messages handed to the event loop per call
+
+# ── Event ring ───────────────────────────────────────────────────────────────
+# All SSE clients read the same ring buffer. Each event is JSON-encoded and
+# framed once; a client only keeps a cursor (the next sequence number it
+# wants), so a slow client never holds up the others and costs no memory
+# beyond its socket buffer. The sequence number is sent as the SSE ``id``,
+# which lets EventSource resume with Last-Event-ID after a reconnect.
+
+
+class EventRing:
+    """Fixed-size ring of pre-encoded SSE frames, read by sequence cursor.
+
+    Only touched from the event loop thread; other threads go through
+    ``broadcast`` / ``_publish_batch``.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._slots: list[tuple[int, str | None, bytes] | None] = [None] * capacity
+        self.next_seq = 1
+        self._changed = asyncio.Event()
+
+    @property
+    def oldest_seq(self) -> int:
+        return max(1, self.next_seq - self.capacity)
+
+    def append(self, topic_key: str | None, data: str) -> None:
+        self._put(topic_key, data)
+        self._notify()
+
+    def extend(self, items: list[tuple[str | None, str]]) -> None:
+        for topic_key, data in items:
+            self._put(topic_key, data)
+        self._notify()
+
+    def read(self, cursor: int, topics: frozenset[str] | None) -> tuple[list[bytes], int, int]:
+        """Return (frames, new cursor, events missed because they left the ring)."""
+        missed = 0
+        if cursor < self.oldest_seq:
+            missed = self.oldest_seq - cursor
+            cursor = self.oldest_seq
+        end = min(self.next_seq, cursor + MAX_FRAMES_PER_WRITE)
+        frames: list[bytes] = []
+        for seq in range(cursor, end):
+            _, topic_key, frame = self._slots[seq % self.capacity]
+            if topics is None or topic_key is None or topic_key in topics:
+                frames.append(frame)
+        return frames, end, missed
+
+    async def wait(self, cursor: int, timeout: float) -> bool:
+        """Wait until an event at or after *cursor* exists; False on timeout."""
+        if cursor < self.next_seq:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except TimeoutError:
+            return False
+
+    def _put(self, topic_key: str | None, data: str) -> None:
+        seq = self.next_seq
+        self._slots[seq % self.capacity] = (seq, topic_key, f"id: {seq}\ndata: {data}\n\n".encode())
+        self.next_seq = seq + 1
+        _stats["events_forwarded"] += 1
+
+    def _notify(self) -> None:
+        # Wake every waiting client at once, then arm a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
 
-# ── Shared broadcast queue ───────────────────────────────────────────────────
-# Each SSE client gets its own Queue; the Kafka consumer thread puts into all.
-_clients: list[queue.Queue] = []
-_clients_lock = threading.Lock()
+
+_loop: asyncio.AbstractEventLoop | None = None
+_ring: EventRing | None = None
+_connections: set[asyncio.Task] = set()
 
 # ── Subprocess handles ───────────────────────────────────────────────────────
 _processes: dict[str, subprocess.Popen | None] = {"producer": None, "risk_engine": None}
 _process_lock = threading.Lock()
 
 # ── Stats ────────────────────────────────────────────────────────────────────
+# Mutated only on the event loop thread (threads use _set_stat).
 _stats: dict[str, Any] = {
     "events_forwarded": 0,
     "consumer_running": False,
-    "producer_running": False,
-    "risk_engine_running": False,
+    "clients": 0,
+    "client_gaps": 0,
     "start_time": time.time(),
 }
 
 
-def broadcast(msg: dict[str, Any]) -> None:
-    """Push one JSON message to every connected SSE client."""
-    data = json.dumps(msg, separators=(",", ":"), default=str)
-    _stats["events_forwarded"] += 1
-    dead: list[queue.Queue] = []
-    with _clients_lock:
-        for q in _clients:
-            try:
-                q.put_nowait(data)
-            except queue.Full:
-                dead.append(q)
-        for q in dead:
-            _clients.remove(q)
+def _encode(msg: dict[str, Any]) -> str:
+    return json.dumps(msg, separators=(",", ":"), default=str)
+
+
+def broadcast(msg: dict[str, Any], topic_key: str | None = None) -> None:
+    """Queue one JSON message for every SSE client. Safe from any thread.
+
+    Messages without a *topic_key* (process logs, control messages) bypass
+    the per-client topic filter.
+    """
+    if _loop is None or _ring is None:
+        return
+    _loop.call_soon_threadsafe(_ring.append, topic_key, _encode(msg))
+
+
+def _publish_batch(items: list[tuple[str | None, str]]) -> None:
+    if _loop is not None and _ring is not None and items:
+        _loop.call_soon_threadsafe(_ring.extend, items)
+
+
+def _set_stat(name: str, value: Any) -> None:
+    if _loop is not None:
+        _loop.call_soon_threadsafe(_stats.__setitem__, name, value)
 
 
 # ── Kafka consumer thread ─────────────────────────────────────────────────────
 
 def kafka_consumer_thread() -> None:
     """
-    Consumes ALL 10 Kafka topics and broadcasts each message to SSE clients.
-    Runs forever; restarts on transient errors.
+    Consumes ALL 10 Kafka topics and hands each poll batch to the event loop
+    in a single call. Messages are JSON-encoded here, off the loop thread.
     """
     sys.path.insert(0, str(PROJECT_ROOT / "code"))
 
     from dotenv import load_dotenv
     load_dotenv(PROJECT_ROOT / ".env")
 
-    from scrc.settings import TOPICS, load_settings
     from scrc.kafka_utils import consumer_config
+    from scrc.settings import TOPICS, load_settings
 
     settings = load_settings()
     if not settings.kafka.is_configured:
         print("[bridge] ERROR: Kafka not configured. Check .env", flush=True)
-        _stats["consumer_running"] = False
+        _set_stat("consumer_running", False)
         return
 
     # Use a dedicated consumer group so bridge never interferes with risk engine
@@ -114,49 +208,48 @@ def kafka_consumer_thread() -> None:
         consumer = Consumer(cfg)
         consumer.subscribe(all_topics)
         print(f"[bridge] Kafka consumer subscribed to {len(all_topics)} topics", flush=True)
-        _stats["consumer_running"] = True
+        _set_stat("consumer_running", True)
 
         while True:
-            msg = consumer.poll(timeout=0.5)
-            if msg is None:
-                continue
-            if msg.error():
-                raise KafkaException(msg.error())
-            try:
-                key   = msg.key().decode("utf-8") if msg.key() else None
-                value = json.loads(msg.value().decode("utf-8"))
-                topic = msg.topic()
-                broadcast({
-                    "type":      "kafka_event",
-                    "topic":     topic,
-                    "topic_key": key_by_topic.get(topic, topic),
-                    "key":       key,
-                    "value":     value,
-                    "offset":    msg.offset(),
-                    "partition": msg.partition(),
-                    "ts":        time.strftime("%H:%M:%S"),
-                })
-            except Exception as e:
-                print(f"[bridge] parse error: {e}", flush=True)
+            messages = consumer.consume(num_messages=CONSUME_BATCH, timeout=0.5)
+            batch: list[tuple[str | None, str]] = []
+            for msg in messages:
+                if msg.error():
+                    raise KafkaException(msg.error())
+                try:
+                    key       = msg.key().decode("utf-8") if msg.key() else None
+                    value     = json.loads(msg.value().decode("utf-8"))
+                    topic     = msg.topic()
+                    topic_key = key_by_topic.get(topic, topic)
+                    batch.append((topic_key, _encode({
+                        "type":      "kafka_event",
+                        "topic":     topic,
+                        "topic_key": topic_key,
+                        "key":       key,
+                        "value":     value,
+                        "offset":    msg.offset(),
+                        "partition": msg.partition(),
+                        "ts":        time.strftime("%H:%M:%S"),
+                    })))
+                except Exception as e:
+                    print(f"[bridge] parse error: {e}", flush=True)
+            _publish_batch(batch)
 
     except Exception as e:
         print(f"[bridge] Kafka consumer error: {e}", flush=True)
-        _stats["consumer_running"] = False
+        _set_stat("consumer_running", False)
         broadcast({"type": "bridge_error", "message": str(e)})
 
 
 # ── Process management ────────────────────────────────────────────────────────
+# Popen / wait are blocking, so the HTTP handlers run these in a worker
+# thread (asyncio.to_thread); output streaming keeps one thread per process.
 
 def _is_alive(name: str) -> bool:
     proc = _processes.get(name)
     return proc is not None and proc.poll() is None
 
 
-def _update_process_stats() -> None:
-    _stats["producer_running"]    = _is_alive("producer")
-    _stats["risk_engine_running"] = _is_alive("risk_engine")
-
-
 def _subprocess_env() -> dict[str, str]:
     """
     Build an env dict for subprocesses that:
@@ -208,7 +301,6 @@ def start_risk_engine() -> dict[str, Any]:
         _processes["risk_engine"] = proc
         # Stream stdout → broadcast
         threading.Thread(target=_stream_proc_output, args=("risk_engine", proc), daemon=True).start()
-        _update_process_stats()
         return {"ok": True, "pid": proc.pid, "cmd": " ".join(cmd)}
 
 
@@ -239,7 +331,6 @@ def start_producer(scenario: str, count: int, interval: float) -> dict[str, Any]
         )
         _processes["producer"] = proc
         threading.Thread(target=_stream_proc_output, args=("producer", proc), daemon=True).start()
-        _update_process_stats()
         return {"ok": True, "pid": proc.pid, "cmd": " ".join(cmd)}
 
 
@@ -254,7 +345,6 @@ def stop_process(name: str) -> dict[str, Any]:
         except subprocess.TimeoutExpired:
             proc.kill()
         _processes[name] = None
-        _update_process_stats()
         return {"ok": True, "stopped": name}
 
 
@@ -266,200 +356,266 @@ def _stream_proc_output(name: str, proc: subprocess.Popen) -> None:
         if line:
             broadcast({"type": "process_log", "process": name, "line": line})
     proc.wait()
-    _update_process_stats()
     broadcast({"type": "process_exit", "process": name, "returncode": proc.returncode})
     print(f"[bridge] {name} exited (rc={proc.returncode})", flush=True)
 
 
+def _handle_start(body: dict[str, Any]) -> dict[str, Any]:
+    scenario = body.get("scenario", "supplier_delay")
+    count    = int(body.get("count", 20))
+    interval = float(body.get("interval", 1.0))
+
+    results = {}
+    # Start risk engine first (it needs to be consuming before events arrive)
+    if not _is_alive("risk_engine"):
+        results["risk_engine"] = start_risk_engine()
+        time.sleep(1.5)   # give consumer time to subscribe
+    else:
+        results["risk_engine"] = {"ok": True, "already_running": True}
+
+    results["producer"] = start_producer(scenario, count, interval)
+    broadcast({"type": "simulation_started", "scenario": scenario,
+               "count": count, "interval": interval})
+    return {"ok": True, "results": results}
+
+
+def _handle_stop(body: dict[str, Any]) -> dict[str, Any]:
+    target = body.get("target", "all")
+    results = {}
+    if target in ("producer", "all"):
+        results["producer"] = stop_process("producer")
+    if target in ("risk_engine", "all"):
+        results["risk_engine"] = stop_process("risk_engine")
+    broadcast({"type": "simulation_stopped", "target": target})
+    return {"ok": True, "results": results}
+
+
+def _handle_restart_engine(body: dict[str, Any]) -> dict[str, Any]:
+    stop_process("risk_engine")
+    time.sleep(0.5)
+    return {"ok": True, "result": start_risk_engine()}
+
+
+POST_ROUTES = {
+    "/start":          _handle_start,
+    "/stop":           _handle_stop,
+    "/restart-engine": _handle_restart_engine,
+}
+
+
 # ── HTTP / SSE handler ────────────────────────────────────────────────────────
+# A deliberately small HTTP/1.1 implementation on asyncio streams: one
+# request per connection (Connection: close), except /events which stays
+# open as an SSE stream. Every client is a coroutine, not a thread.
 
 CORS_HEADERS = {
     "Access-Control-Allow-Origin":  "*",
     "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-    "Access-Control-Allow-Headers": "Content-Type",
+    "Access-Control-Allow-Headers": "Content-Type, Last-Event-ID",
 }
 
+REASONS = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error"}
 
-class BridgeHandler(BaseHTTPRequestHandler):
-    def log_message(self, fmt, *args):  # silence default Apache-style log
-        pass
-
-    def _cors(self, code: int = 200, content_type: str = "application/json") -> None:
-        self.send_response(code)
-        self.send_header("Content-Type", content_type)
-        for k, v in CORS_HEADERS.items():
-            self.send_header(k, v)
-        self.end_headers()
-
-    def _json(self, payload: Any, code: int = 200) -> None:
-        body = json.dumps(payload, default=str).encode()
-        self._cors(code, "application/json")
-        self.wfile.write(body)
-
-    def do_OPTIONS(self):
-        self._cors(204)
-
-    def do_GET(self):
-        path = self.path.split("?")[0]
-
-        if path == "/":
-            self._json({"service": "scrc-kafka-bridge", "status": "ok",
-                        "uptime_s": round(time.time() - _stats["start_time"]),
-                        "stats": _stats})
-
-        elif path == "/status":
-            _update_process_stats()
-            self._json({
-                "consumer_running":    _stats["consumer_running"],
-                "producer_running":    _stats["producer_running"],
-                "risk_engine_running": _stats["risk_engine_running"],
-                "events_forwarded":    _stats["events_forwarded"],
-                "uptime_s":            round(time.time() - _stats["start_time"]),
-            })
-
-        elif path == "/events":
-            # Server-Sent Events endpoint
-            self.send_response(200)
-            self.send_header("Content-Type",  "text/event-stream")
-            self.send_header("Cache-Control", "no-cache")
-            self.send_header("X-Accel-Buffering", "no")
-            for k, v in CORS_HEADERS.items():
-                self.send_header(k, v)
-            self.end_headers()
-
-            q: queue.Queue = queue.Queue(maxsize=512)
-            with _clients_lock:
-                _clients.append(q)
-
-            # Send a heartbeat immediately so the browser knows it connected
-            try:
-                self.wfile.write(b": connected\n\n")
-                self.wfile.flush()
-            except Exception:
-                with _clients_lock:
-                    if q in _clients:
-                        _clients.remove(q)
-                return
 
-            try:
-                while True:
-                    try:
-                        data = q.get(timeout=15)
-                        self.wfile.write(f"data: {data}\n\n".encode())
-                        self.wfile.flush()
-                    except queue.Empty:
-                        # Heartbeat to keep connection alive through proxies
-                        self.wfile.write(b": ping\n\n")
-                        self.wfile.flush()
-            except Exception:
-                pass
-            finally:
-                with _clients_lock:
-                    if q in _clients:
-                        _clients.remove(q)
+def _head(code: int, content_type: str, extra: dict[str, str] | None = None) -> bytes:
+    lines = [f"HTTP/1.1 {code} {REASONS.get(code, 'OK')}", f"Content-Type: {content_type}"]
+    lines += [f"{k}: {v}" for k, v in {**CORS_HEADERS, **(extra or {})}.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
 
-        else:
-            self._json({"error": "not found"}, 404)
-
-    def do_POST(self):
-        path  = self.path.split("?")[0]
-        length = int(self.headers.get("Content-Length", 0))
-        body   = json.loads(self.rfile.read(length)) if length else {}
-
-        if path == "/start":
-            scenario = body.get("scenario", "supplier_delay")
-            count    = int(body.get("count", 20))
-            interval = float(body.get("interval", 1.0))
-
-            results = {}
-            # Start risk engine first (it needs to be consuming before events arrive)
-            if not _is_alive("risk_engine"):
-                results["risk_engine"] = start_risk_engine()
-                time.sleep(1.5)   # give consumer time to subscribe
-            else:
-                results["risk_engine"] = {"ok": True, "already_running": True}
-
-            results["producer"] = start_producer(scenario, count, interval)
-            broadcast({"type": "simulation_started", "scenario": scenario,
-                       "count": count, "interval": interval})
-            self._json({"ok": True, "results": results})
-
-        elif path == "/stop":
-            target = body.get("target", "all")
-            results = {}
-            if target in ("producer", "all"):
-                results["producer"] = stop_process("producer")
-            if target in ("risk_engine", "all"):
-                results["risk_engine"] = stop_process("risk_engine")
-            broadcast({"type": "simulation_stopped", "target": target})
-            self._json({"ok": True, "results": results})
-
-        elif path == "/restart-engine":
-            stop_process("risk_engine")
-            time.sleep(0.5)
-            result = start_risk_engine()
-            self._json({"ok": True, "result": result})
 
-        else:
-            self._json({"error": "not found"}, 404)
+async def _send_json(writer: asyncio.StreamWriter, payload: Any, code: int = 200) -> None:
+    body = json.dumps(payload, default=str).encode()
+    writer.write(_head(code, "application/json",
+                       {"Content-Length": str(len(body)), "Connection": "close"}) + body)
+    await writer.drain()
+
+
+def _status() -> dict[str, Any]:
+    return {
+        "consumer_running":    _stats["consumer_running"],
+        "producer_running":    _is_alive("producer"),
+        "risk_engine_running": _is_alive("risk_engine"),
+        "events_forwarded":    _stats["events_forwarded"],
+        "clients":             _stats["clients"],
+        "uptime_s":            round(time.time() - _stats["start_time"]),
+    }
+
+
+def _parse_topics(raw: str | None) -> frozenset[str] | None:
+    """Topic filter from ``?topics=``; topic names are mapped to their keys."""
+    if not raw:
+        return None
+    wanted = {t.strip() for t in raw.split(",") if t.strip()}
+    try:
+        sys.path.insert(0, str(PROJECT_ROOT / "code"))
+        from scrc.settings import TOPICS
+        key_by_topic = {v: k for k, v in TOPICS.items()}
+    except Exception:
+        key_by_topic = {}
+    return frozenset(key_by_topic.get(t, t) for t in wanted) or None
+
+
+def _resume_cursor(last_event_id: str | None) -> int:
+    """First sequence number a (re)connecting client should receive."""
+    assert _ring is not None
+    try:
+        last = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last = None
+    # No id, or an id from a previous bridge process: start with new events
+    if last is None or last >= _ring.next_seq:
+        return _ring.next_seq
+    return last + 1
+
+
+async def _stream_events(writer: asyncio.StreamWriter, headers: dict[str, str],
+                         query: dict[str, list[str]]) -> None:
+    assert _ring is not None
+    topics = _parse_topics(",".join(query.get("topics", [])))
+    cursor = _resume_cursor(headers.get("last-event-id") or (query.get("lastEventId") or [None])[0])
+
+    writer.write(_head(200, "text/event-stream",
+                       {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}))
+    # Send a heartbeat immediately so the browser knows it connected
+    writer.write(b"retry: 3000\n: connected\n\n")
+    await writer.drain()
+
+    _stats["clients"] += 1
+    try:
+        while True:
+            if not await _ring.wait(cursor, HEARTBEAT_S):
+                # Heartbeat to keep connection alive through proxies
+                writer.write(b": ping\n\n")
+            else:
+                frames, cursor, missed = _ring.read(cursor, topics)
+                if missed:
+                    _stats["client_gaps"] += 1
+                    writer.write(f"data: {_encode({'type': 'bridge_gap', 'missed': missed})}\n\n".encode())
+                writer.writelines(frames)
+            await asyncio.wait_for(writer.drain(), WRITE_TIMEOUT_S)
+            # Let events accumulate so busy streams go out as one write per window
+            await asyncio.sleep(BATCH_WINDOW)
+    finally:
+        _stats["clients"] -= 1
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    task = asyncio.current_task()
+    _connections.add(task)
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10)
+        request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+        method, target, _ = request_line.split(" ", 2)
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        path, _, raw_query = target.partition("?")
+        query = parse_qs(raw_query)
+
+        if method == "OPTIONS":
+            writer.write(_head(204, "text/plain", {"Content-Length": "0", "Connection": "close"}))
+            await writer.drain()
+
+        elif method == "GET":
+            if path == "/":
+                await _send_json(writer, {"service": "scrc-kafka-bridge", "status": "ok",
+                                          "uptime_s": round(time.time() - _stats["start_time"]),
+                                          "stats": {**_stats, "ring_size": _ring.capacity,
+                                                    "ring_next_id": _ring.next_seq}})
+            elif path == "/status":
+                await _send_json(writer, _status())
+            elif path == "/events":
+                await _stream_events(writer, headers, query)
+            else:
+                await _send_json(writer, {"error": "not found"}, 404)
 
+        elif method == "POST":
+            length = int(headers.get("content-length", 0))
+            raw = await reader.readexactly(length) if length else b""
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                await _send_json(writer, {"error": "invalid JSON body"}, 400)
+                return
+            route = POST_ROUTES.get(path)
+            if route is None:
+                await _send_json(writer, {"error": "not found"}, 404)
+            else:
+                await _send_json(writer, await asyncio.to_thread(route, body))
 
-# ── Threading mixin — fixes WinError 10053 on Windows ────────────────────────
-# Plain HTTPServer handles one request at a time on a single thread.
-# When the /events SSE handler blocks indefinitely reading from the queue,
-# every subsequent request (e.g. /status poll) must wait for that thread,
-# causing Windows to abort the waiting connection with WinError 10053.
-# ThreadingHTTPServer spawns a new daemon thread per request so SSE and
-# short-lived API calls never compete for the same thread.
+        else:
+            await _send_json(writer, {"error": "method not allowed"}, 405)
 
-class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
-    daemon_threads = True   # threads die when the main process exits
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, TimeoutError,
+            ConnectionError, ValueError):
+        pass   # client went away, sent garbage, or stopped reading
+    except asyncio.CancelledError:
+        pass   # bridge shutting down
+    except Exception as e:
+        print(f"[bridge] request error: {e}", flush=True)
+    finally:
+        _connections.discard(task)
+        writer.close()
 
 
 # ── Entry point ───────────────────────────────────────────────────────────────
 
-def main() -> None:
-    print(f"[bridge] Project root : {PROJECT_ROOT}", flush=True)
-    print(f"[bridge] Python       : {PYTHON_EXE}", flush=True)
-    print(f"[bridge] Starting HTTP server on http://{HOST}:{PORT}", flush=True)
-    print(f"[bridge] SSE events   : http://localhost:{PORT}/events", flush=True)
-    print(f"[bridge] Control API  : POST http://localhost:{PORT}/start  /stop  /status", flush=True)
+async def serve() -> None:
+    global _loop, _ring
+    _loop = asyncio.get_running_loop()
+    _ring = EventRing(RING_SIZE)
 
     # Start Kafka consumer in background thread
-    t = threading.Thread(target=kafka_consumer_thread, daemon=True)
-    t.start()
-
-    server = ThreadingHTTPServer((HOST, PORT), BridgeHandler)
-    # SO_REUSEADDR so the port is released immediately on restart (avoids
-    # "Address already in use" when the previous process is still in TIME_WAIT)
-    server.socket.setsockopt(__import__('socket').SOL_SOCKET,
-                             __import__('socket').SO_REUSEADDR, 1)
-
-    # ── Shutdown helper — runs in a daemon thread so it never deadlocks ───────
-    # On Windows, calling server.shutdown() from inside a signal handler that
-    # was raised on the main thread (which is blocked inside serve_forever)
-    # causes a deadlock.  We schedule the shutdown on a separate thread instead.
-    def _do_shutdown():
+    threading.Thread(target=kafka_consumer_thread, daemon=True).start()
+
+    # reuse_address (default on POSIX) releases the port immediately on restart
+    server = await asyncio.start_server(handle_connection, HOST, PORT)
+    stop = asyncio.Event()
+
+    def _request_stop(*_: Any) -> None:
+        _loop.call_soon_threadsafe(stop.set)
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            _loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            # Windows: no loop signal handlers, hand the signal over to the loop
+            signal.signal(sig, _request_stop)
+
+    async with server:
+        await stop.wait()
         print("\n[bridge] Shutting down …", flush=True)
+        server.close()
+        # Open SSE streams would otherwise keep the server from closing
+        for task in list(_connections):
+            task.cancel()
+        await asyncio.gather(*_connections, return_exceptions=True)
         for name in list(_processes.keys()):
             try:
-                stop_process(name)
+                await asyncio.to_thread(stop_process, name)
             except Exception:
                 pass
-        server.shutdown()      # unblocks serve_forever() on the main thread
-        print("[bridge] Done.", flush=True)
+    print("[bridge] Done.", flush=True)
 
-    def _signal_handler(sig, frame):
-        threading.Thread(target=_do_shutdown, daemon=True).start()
 
-    signal.signal(signal.SIGINT,  _signal_handler)
-    signal.signal(signal.SIGTERM, _signal_handler)
+def main() -> None:
+    print(f"[bridge] Project root : {PROJECT_ROOT}", flush=True)
+    print(f"[bridge] Python       : {PYTHON_EXE}", flush=True)
+    print(f"[bridge] Starting HTTP server on http://{HOST}:{PORT}", flush=True)
+    print(f"[bridge] SSE events   : http://localhost:{PORT}/events", flush=True)
+    print(f"[bridge] Control API  : POST http://localhost:{PORT}/start  /stop  /status", flush=True)
 
     try:
-        server.serve_forever()   # blocks until server.shutdown() is called
+        asyncio.run(serve())
     except KeyboardInterrupt:
         # Ctrl+C on Windows may bypass the signal handler; handle it here too
-        _do_shutdown()
+        for name in list(_processes.keys()):
+            try:
+                stop_process(name)
+            except Exception:
+                pass
 
 
 if __name__ == "__main__":
@@ -5,7 +5,9 @@ set -euo pipefail
 #
 # Runs the risk logic unit tests from scripts/tests/.
 # Tests cover: risk band thresholds, days-of-supply calculation,
-# and a full end-to-end CRITICAL scenario scoring check.
+# a full end-to-end CRITICAL scenario scoring check, the indexed
+# engine state (indexed vs full-scan scoring, route index, event expiry),
+# and a short load benchmark against the in-process broker stand-in.
 #
 # No Kafka connection required — all tests use in-memory synthetic data.
 #
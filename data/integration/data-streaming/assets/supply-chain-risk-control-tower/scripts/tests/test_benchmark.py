@@ -0,0 +1,44 @@
+from itertools import islice
+
+import pytest
+from scrc.benchmark import InMemoryBroker, MemoryConsumer, MemoryProducer, run_benchmark
+from scrc.kafka_utils import KafkaException, StreamStats, consume_batches, json_serializer
+from scrc.sample_data import load_events, load_reference_events
+
+
+def test_load_workers_split_component_key_space():
+    seen = []
+    for worker in range(3):
+        events = list(islice(load_events(components=30, suppliers=5, routes=4, worker=worker, workers=3), 500))
+        seen.append({event["component_id"] for topic_key, _, event in events if topic_key != "external_risk_events"})
+    assert set.union(*seen) == {f"CMP-L{c:06d}" for c in range(30)}
+    assert not (seen[0] & seen[1] or seen[1] & seen[2] or seen[0] & seen[2])
+
+    reference = load_reference_events(components=30, suppliers=5, worker=1, workers=3)
+    assert not any(topic_key == "supplier_profiles" for topic_key, _, _ in reference)
+
+
+def test_benchmark_drains_all_produced_events():
+    result = run_benchmark(rate=1500, duration=1.0, workers=2, components=50, suppliers=5, routes=5, batch_size=200)
+    assert result.produced > 0
+    assert result.consumed == result.produced
+    assert result.final_lag == 0
+    assert result.scored > 0
+    assert len(result.latencies_ms) == result.consumed
+    assert result.state_sizes["components"] == 50
+
+
+def test_consume_batches_does_not_commit_failed_deliveries():
+    broker = InMemoryBroker(["in", "out"])
+    broker.append("in", b"k", json_serializer({"n": 1}))
+    consumer, producer = MemoryConsumer(broker), MemoryProducer(broker)
+    stats = StreamStats()
+    committed = []
+    consumer.commit = lambda asynchronous=True: committed.append(True)
+
+    def handle_batch(records):
+        producer.produce("out", b"k", b"{}", callback=lambda err, msg: setattr(stats, "delivery_failures", 1))
+
+    with pytest.raises(KafkaException, match="1 records failed delivery"):
+        consume_batches(consumer, ["in"], handle_batch, producer=producer, stats=stats, timeout=0)
+    assert not committed
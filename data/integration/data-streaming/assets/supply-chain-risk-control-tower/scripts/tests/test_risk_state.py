@@ -0,0 +1,103 @@
+import zlib
+
+import pytest
+from scrc.risk_engine import INPUT_TOPIC_KEYS, engine_assignment
+from scrc.risk_logic import score_component_risk
+from scrc.sample_data import scenario_events
+from scrc.settings import TOPICS
+from scrc.snapshot import load_snapshot, save_snapshot, snapshot_path
+from scrc.state import RiskEngineState, component_partition
+
+
+def _full_scan_score(state, component_id):
+    return score_component_risk(
+        component_id,
+        state.suppliers,
+        state.component_master,
+        state.inventory_levels,
+        state.purchase_orders,
+        state.shipments,
+        state.customer_orders_by_component,
+        state.external_risk_events,
+    )
+
+
+def test_indexed_score_matches_full_scan():
+    state = RiskEngineState()
+    for topic_key, key, event in scenario_events(scenario="supplier_delay", count=12):
+        for component_id in state.update(TOPICS[topic_key], key, event):
+            if not state.can_score(component_id):
+                continue
+            indexed, _, _ = state.score(component_id)
+            scanned, _, _ = _full_scan_score(state, component_id)
+            assert indexed.risk_score == scanned.risk_score
+            assert indexed.scoring_factors == scanned.scoring_factors
+            assert indexed.supplier_id == scanned.supplier_id
+
+
+def test_external_event_reaches_only_components_on_route():
+    state = RiskEngineState()
+    state.update(TOPICS["shipments"], "S1", {"shipment_id": "S1", "component_id": "C1", "route_id": "R1"})
+    state.update(TOPICS["shipments"], "S2", {"shipment_id": "S2", "component_id": "C2", "route_id": "R2"})
+
+    affected = state.update(TOPICS["external_risk_events"], "E1", {"event_id": "E1", "route_id": "R1", "severity": 4})
+    assert affected == {"C1"}
+
+    # Moving the shipment to another route updates the route index
+    state.update(TOPICS["shipments"], "S1", {"shipment_id": "S1", "component_id": "C1", "route_id": "R2"})
+    affected = state.update(TOPICS["external_risk_events"], "E2", {"event_id": "E2", "route_id": "R1", "severity": 2})
+    assert affected == set()
+
+
+def test_expired_external_events_are_evicted():
+    state = RiskEngineState(event_ttl_hours=1)
+    state.update(TOPICS["shipments"], "S1", {"shipment_id": "S1", "component_id": "C1", "route_id": "R1"}, now=0)
+    event = {"event_id": "E1", "route_id": "R1", "severity": 5, "expected_delay_hours": 0, "event_time": "1970-01-01T00:00:00Z"}
+    state.update(TOPICS["external_risk_events"], "E1", event, now=0)
+    assert state.route_event_aggregates["R1"] == (5, 0)
+
+    affected = state.update(TOPICS["component_master"], "C1", {"component_id": "C1"}, now=3601)
+    assert "C1" in affected
+    assert state.external_risk_events == []
+    assert "R1" not in state.route_event_aggregates
+
+
+def test_partitions_split_component_key_space():
+    states = [RiskEngineState(partition=(i, 3)) for i in range(3)]
+    for n in range(30):
+        event = {"component_id": f"C-{n}", "on_hand_qty": 1}
+        for state in states:
+            state.update(TOPICS["inventory_levels"], f"C-{n}", event)
+    assert sum(len(state.inventory_levels) for state in states) == 30
+    assert all(state.owns(c) for state in states for c in state.inventory_levels)
+
+
+def test_snapshot_round_trip_restores_indexes(tmp_path):
+    state = RiskEngineState()
+    for topic_key, key, event in scenario_events(scenario="supplier_delay", count=4):
+        state.update(TOPICS[topic_key], key, event)
+
+    path = snapshot_path(tmp_path, None)
+    save_snapshot(path, state, {"shipments:0": 42})
+    restored, offsets = load_snapshot(path, None)
+
+    assert offsets == {"shipments:0": 42}
+    assert restored.shipment_aggregates == state.shipment_aggregates
+    assert restored.route_event_aggregates == state.route_event_aggregates
+    assert restored.score("BRG-9004")[0].risk_score == state.score("BRG-9004")[0].risk_score
+    # A snapshot taken with different partitioning is not reused
+    assert load_snapshot(path, (0, 2)) is None
+
+
+def test_engine_assignment_covers_each_component_once():
+    counts = {TOPICS[key]: 6 for key in INPUT_TOPIC_KEYS}
+    assignments = [set(engine_assignment(counts, (i, 3))) for i in range(3)]
+    for n in range(30):
+        component_id = f"C-{n}"
+        kafka_partition = zlib.crc32(component_id.encode("utf-8")) % 6
+        readers = [i for i, assigned in enumerate(assignments) if (TOPICS["shipments"], kafka_partition) in assigned]
+        assert readers == [component_partition(component_id, 3)]
+    # Reference topics are read in full by every engine partition
+    assert all((TOPICS["supplier_profiles"], p) in assigned for assigned in assignments for p in range(6))
+    with pytest.raises(ValueError):
+        engine_assignment(counts, (0, 4))
@@ -4,11 +4,17 @@ IBM watsonx.data Intelligence – Lineage Impact Analyzer
 CLI tool for column-level impact analysis using the Manta lineage graph
 exposed through the watsonx.data Intelligence REST API.
 
-Given a source asset, this tool:
+Given one or more source assets, this tool:
   1. Resolves the downstream lineage graph via GET /data_lineage/impact_analysis
-  2. Renders a human-readable dependency tree
-  3. Generates a machine-readable JSON impact report
-  4. Optionally archives the report to IBM COS
+  2. Caches fetched subgraphs on disk and indexes them as an adjacency list
+  3. Renders a human-readable dependency tree
+  4. Generates a machine-readable JSON impact report
+  5. Optionally archives the report to IBM COS
+
+Batch mode (--batch-dir) analyses an asset list in parallel, writes compact
+gzip reports, diffs each against the previous report (added/removed
+downstream nodes and edges, detected via hashed node/edge sets) and only
+writes / uploads the reports that changed.
 
 Usage
 -----
@@ -21,16 +27,29 @@ Usage
     # Archive to IBM COS
     python impact_analyzer.py --asset-id <asset-id> --archive-cos
 
-Environment variables: IBM_API_KEY, WXDI_PROJECT_ID, WXDI_REGION (or WXDI_BASE_URL)
+    # Several assets, fetched concurrently; reports shared downstream assets
+    python impact_analyzer.py --asset-id <id-1> --asset-id <id-2>,<id-3> --workers 8
+
+    # Nightly sweep: diff against the last reports, upload only what changed
+    python impact_analyzer.py --asset-file assets.txt --batch-dir reports/ --archive-cos
+
+Environment variables: IBM_API_KEY, WXDI_PROJECT_ID, WXDI_REGION (or WXDI_BASE_URL),
+LINEAGE_CACHE_DIR (default .lineage_cache), LINEAGE_CACHE_TTL (seconds, default 3600)
 """
 from __future__ import annotations
 
+import gzip
+import hashlib
 import json
+import re
 import logging
 import os
 import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import Any
+from pathlib import Path
+from typing import Any, Iterable
 
 import click
 import ibm_boto3
@@ -93,88 +112,505 @@ def _get_graph(token: str, base_url: str, project_id: str, asset_id: str, depth:
     return resp.json()
 
 
+# ---------------------------------------------------------------------------
+# Local lineage graph store
+# ---------------------------------------------------------------------------
+
+def _node_id(node: dict) -> str:
+    return str(node.get("asset_id") or node.get("id") or node.get("name") or "unknown")
+
+
+def _iter_edges(asset_id: str, impact: dict, graph: dict) -> Iterable[tuple[str, str, dict]]:
+    """Yield (source, target, target attributes) edges from both API payloads.
+
+    The impact payload is a nested tree (downstream_assets / children); the
+    graph payload lists edges (source/target or from/to) next to its nodes.
+    """
+    stack = [(asset_id, child) for child in impact.get("downstream_assets", impact.get("nodes", []))]
+    while stack:
+        parent, node = stack.pop()
+        nid = _node_id(node)
+        yield parent, nid, node
+        for child in node.get("downstream_assets", node.get("children", [])):
+            stack.append((nid, child))
+
+    nodes = {_node_id(n): n for n in graph.get("nodes", []) if isinstance(n, dict)}
+    for edge in graph.get("edges", []):
+        source = edge.get("source") or edge.get("from") or edge.get("source_id")
+        target = edge.get("target") or edge.get("to") or edge.get("target_id")
+        if source and target:
+            yield str(source), str(target), nodes.get(str(target), {})
+
+
+class LineageGraphStore:
+    """On-disk cache of fetched lineage subgraphs plus an in-memory adjacency index.
+
+    Each (asset, depth) fetch is stored as one JSON file under ``cache_dir``,
+    keyed by the instance and project it came from as well, and reused until
+    it is older than ``ttl`` seconds. Every subgraph loaded or fetched is
+    merged into ``downstream`` (node -> direct dependents), so closure and
+    shared-dependency questions are answered locally.
+    """
+
+    def __init__(self, cache_dir: str | os.PathLike, ttl: float, base_url: str, project_id: str) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.base_url = base_url
+        self.project_id = project_id
+        self.downstream: dict[str, set[str]] = defaultdict(set)
+        self.attributes: dict[str, dict] = {}
+
+    def _path(self, asset_id: str, depth: int) -> Path:
+        # The same asset id can exist in another project or on another instance
+        key = "\0".join((self.base_url, self.project_id, asset_id))
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return self.cache_dir / f"{digest}-d{depth}.json"
+
+    def get(self, asset_id: str, depth: int) -> tuple[dict, dict] | None:
+        """Return cached (impact, graph) for the asset, or None if missing/expired."""
+        path = self._path(asset_id, depth)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        self.index(asset_id, entry["impact"], entry["graph"])
+        return entry["impact"], entry["graph"]
+
+    def put(self, asset_id: str, depth: int, impact: dict, graph: dict) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(asset_id, depth)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"asset_id": asset_id, "impact": impact, "graph": graph}, separators=(",", ":")))
+        os.replace(tmp, path)
+        self.index(asset_id, impact, graph)
+
+    def index(self, asset_id: str, impact: dict, graph: dict) -> None:
+        for source, target, attrs in _iter_edges(asset_id, impact, graph):
+            self.downstream[source].add(target)
+            if attrs and target not in self.attributes:
+                self.attributes[target] = {k: attrs[k] for k in ("name", "asset_type") if k in attrs}
+
+    def closure(self, asset_id: str) -> set[str]:
+        """All assets reachable downstream of ``asset_id`` (cycle-safe BFS)."""
+        seen: set[str] = set()
+        queue = deque(self.downstream.get(asset_id, ()))
+        while queue:
+            node = queue.popleft()
+            if node in seen or node == asset_id:
+                continue
+            seen.add(node)
+            queue.extend(self.downstream.get(node, ()))
+        return seen
+
+    def shared_dependencies(self, asset_ids: Iterable[str]) -> dict[str, list[str]]:
+        """Downstream assets impacted by more than one of ``asset_ids``."""
+        impacted_by: dict[str, list[str]] = defaultdict(list)
+        for asset_id in asset_ids:
+            for node in self.closure(asset_id):
+                impacted_by[node].append(asset_id)
+        return {node: sources for node, sources in impacted_by.items() if len(sources) > 1}
+
+
+def _fetch_asset(
+    store: LineageGraphStore | None,
+    token: str,
+    base_url: str,
+    project_id: str,
+    asset_id: str,
+    depth: int,
+) -> tuple[dict, dict, bool]:
+    """Return (impact, graph, from_cache), using the store when it has a fresh entry."""
+    if store is not None:
+        cached = store.get(asset_id, depth)
+        if cached is not None:
+            return cached[0], cached[1], True
+    impact = _get_impact(token, base_url, project_id, asset_id)
+    graph = _get_graph(token, base_url, project_id, asset_id, depth)
+    if store is not None:
+        store.put(asset_id, depth, impact, graph)
+    return impact, graph, False
+
+
 # ---------------------------------------------------------------------------
 # Report rendering
 # ---------------------------------------------------------------------------
 
-def _render_tree(impact: dict, indent: int = 0) -> str:
-    """Recursively render the impact graph as a human-readable tree."""
+def _render_tree(impact: dict) -> str:
+    """Render the impact graph as a human-readable tree.
+
+    Iterative (explicit stack), so arbitrarily deep graphs cannot hit the
+    recursion limit; lines are collected once and joined at the end.
+    """
     lines: list[str] = []
-    nodes = impact.get("downstream_assets", impact.get("nodes", []))
-    for node in nodes:
+    roots = impact.get("downstream_assets", impact.get("nodes", []))
+    stack = [(node, 0) for node in reversed(roots)]
+    while stack:
+        node, indent = stack.pop()
         name = node.get("name") or node.get("asset_id", "unknown")
         asset_type = node.get("asset_type", "")
-        lines.append("  " * indent + f"└── {name}  [{asset_type}]")
+        lines.append(f"{'  ' * indent}└── {name}  [{asset_type}]")
         children = node.get("downstream_assets", node.get("children", []))
-        if children:
-            lines.append(_render_tree({"downstream_assets": children}, indent + 1))
+        stack.extend((child, indent + 1) for child in reversed(children))
     return "\n".join(lines)
 
 
 def _build_report(asset_id: str, impact: dict, graph: dict) -> dict:
-    return {
+    report = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "source_asset_id": asset_id,
         "impact_summary": impact,
         "lineage_graph": graph,
     }
+    report["fingerprint"] = _fingerprint(report)
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Structural diffs between reports
+# ---------------------------------------------------------------------------
+
+def _structure(report: dict) -> tuple[set[str], set[tuple[str, str]]]:
+    """Downstream node set and edge set of a report (also works for older reports)."""
+    edges = {
+        (source, target)
+        for source, target, _ in _iter_edges(
+            report["source_asset_id"], report.get("impact_summary", {}), report.get("lineage_graph", {})
+        )
+    }
+    return {target for _, target in edges}, edges
+
+
+def _set_hash(items: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for item in sorted(items):
+        digest.update(item.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _fingerprint(report: dict) -> dict[str, str]:
+    nodes, edges = _structure(report)
+    return {"nodes": _set_hash(nodes), "edges": _set_hash(f"{s}\x1f{t}" for s, t in edges)}
+
+
+def _diff_reports(previous: dict | None, current: dict) -> dict:
+    """Compare two reports; equal fingerprints short-circuit the set comparison."""
+    if previous is None:
+        nodes, edges = _structure(current)
+        return {"status": "new", "nodes": len(nodes), "edges": len(edges)}
+    if (previous.get("fingerprint") or _fingerprint(previous)) == current["fingerprint"]:
+        return {"status": "unchanged"}
+    old_nodes, old_edges = _structure(previous)
+    new_nodes, new_edges = _structure(current)
+    return {
+        "status": "changed",
+        "added_nodes": sorted(new_nodes - old_nodes),
+        "removed_nodes": sorted(old_nodes - new_nodes),
+        "added_edges": sorted([list(e) for e in new_edges - old_edges]),
+        "removed_edges": sorted([list(e) for e in old_edges - new_edges]),
+    }
+
+
+def _encode_report(report: dict) -> bytes:
+    """Compact JSON, gzip-compressed (mtime pinned so equal reports are equal bytes)."""
+    return gzip.compress(json.dumps(report, separators=(",", ":")).encode("utf-8"), mtime=0)
+
+
+def _decode_report(data: bytes, compressed: bool = True) -> dict:
+    return json.loads(gzip.decompress(data) if compressed else data)
 
 
 # ---------------------------------------------------------------------------
 # IBM COS archiving
 # ---------------------------------------------------------------------------
 
-def _archive_to_cos(report: dict, asset_id: str) -> str:
-    client = ibm_boto3.client(
+def _cos_client():
+    return ibm_boto3.client(
         "s3",
         ibm_api_key_id=os.environ["COS_API_KEY"],
         ibm_service_instance_id=os.environ["COS_INSTANCE_CRN"],
         config=Config(signature_version="oauth"),
         endpoint_url=os.getenv("COS_ENDPOINT", "https://s3.us-south.cloud-object-storage.appdomain.cloud"),
     )
+
+
+def _archive_to_cos(report: dict, asset_id: str, client=None, compressed: bool = False) -> str:
+    client = client or _cos_client()
     bucket = os.environ["COS_BUCKET"]
     ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    key = f"lineage-reports/{asset_id}/{ts}.json"
-    client.put_object(Bucket=bucket, Key=key, Body=json.dumps(report, indent=2), ContentType="application/json")
+    if compressed:
+        key = f"lineage-reports/{asset_id}/{ts}.json.gz"
+        fingerprint = report["fingerprint"]
+        client.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=_encode_report(report),
+            ContentType="application/gzip",
+            Metadata={"nodes-sha256": fingerprint["nodes"], "edges-sha256": fingerprint["edges"]},
+        )
+    else:
+        key = f"lineage-reports/{asset_id}/{ts}.json"
+        client.put_object(Bucket=bucket, Key=key, Body=json.dumps(report, indent=2), ContentType="application/json")
     logger.info("Impact report archived: s3://%s/%s", bucket, key)
     return key
 
 
+def _latest_archive(client, bucket: str, asset_id: str) -> str | None:
+    """Key of the most recent archived report for an asset (keys sort by timestamp)."""
+    latest = None
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=f"lineage-reports/{asset_id}/"):
+        for obj in page.get("Contents", []):
+            if latest is None or obj["Key"] > latest:
+                latest = obj["Key"]
+    return latest
+
+
+def _load_archive(client, bucket: str, key: str) -> dict:
+    body = client.get_object(Bucket=bucket, Key=key)["Body"].read()
+    return _decode_report(body, compressed=key.endswith(".gz"))
+
+
+# ---------------------------------------------------------------------------
+# Batch mode
+# ---------------------------------------------------------------------------
+
+def _report_path(batch_dir: Path, asset_id: str) -> Path:
+    return batch_dir / f"{re.sub(r'[^A-Za-z0-9._-]', '_', asset_id)}.json.gz"
+
+
+def _batch_asset(
+    store: LineageGraphStore | None,
+    token: str,
+    base_url: str,
+    project_id: str,
+    asset_id: str,
+    depth: int,
+    batch_dir: Path,
+    cos_client=None,
+) -> dict:
+    """Analyse one asset, diff against its previous report, persist only if changed.
+
+    The previous report is the local one in ``batch_dir``; without it, the
+    latest COS archive is downloaded. Whether to upload is decided from the
+    fingerprint stored in the archive's object metadata (a HEAD request), so
+    unchanged assets cost no download or upload.
+    """
+    impact, graph, _ = _fetch_asset(store, token, base_url, project_id, asset_id, depth)
+    report = _build_report(asset_id, impact, graph)
+    path = _report_path(batch_dir, asset_id)
+    previous = _decode_report(path.read_bytes()) if path.exists() else None
+
+    archived_fp = None
+    archived_key = None
+    if cos_client is not None:
+        bucket = os.environ["COS_BUCKET"]
+        archived_key = _latest_archive(cos_client, bucket, asset_id)
+        if archived_key:
+            meta = cos_client.head_object(Bucket=bucket, Key=archived_key).get("Metadata", {})
+            if "nodes-sha256" in meta and "edges-sha256" in meta:
+                archived_fp = {"nodes": meta["nodes-sha256"], "edges": meta["edges-sha256"]}
+            if previous is None or archived_fp is None:
+                archived = _load_archive(cos_client, bucket, archived_key)
+                archived_fp = archived_fp or archived.get("fingerprint") or _fingerprint(archived)
+                previous = previous or archived
+
+    local_exists = path.exists()
+    entry = {"asset_id": asset_id, **_diff_reports(previous, report)}
+    if entry["status"] != "unchanged" or not local_exists:
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(_encode_report(report))
+        os.replace(tmp, path)
+        entry["report"] = str(path)
+    if cos_client is not None:
+        if archived_fp != report["fingerprint"]:
+            entry["archived"] = _archive_to_cos(report, asset_id, client=cos_client, compressed=True)
+        else:
+            entry["archived"] = archived_key
+    return entry
+
+
+def _run_batch(
+    ids: list[str],
+    store: LineageGraphStore | None,
+    token: str,
+    base_url: str,
+    project_id: str,
+    depth: int,
+    batch_dir: Path,
+    archive_cos: bool,
+    workers: int,
+) -> dict:
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    cos_client = _cos_client() if archive_cos else None
+    entries: list[dict] = []
+    failed: dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(ids)))) as pool:
+        futures = {
+            pool.submit(_batch_asset, store, token, base_url, project_id, asset_id, depth, batch_dir, cos_client): asset_id
+            for asset_id in ids
+        }
+        for future in as_completed(futures):
+            asset_id = futures[future]
+            try:
+                entries.append(future.result())
+            except Exception as exc:
+                logger.error("Impact analysis failed for %s: %s", asset_id, exc)
+                failed[asset_id] = str(exc)
+
+    entries.sort(key=lambda e: e["asset_id"])
+    summary = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "depth": depth,
+        "counts": {
+            status: sum(1 for e in entries if e["status"] == status) for status in ("new", "changed", "unchanged")
+        },
+        "assets": entries,
+        "failed": failed,
+    }
+    (batch_dir / "summary.json").write_text(json.dumps(summary, separators=(",", ":")))
+    return summary
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
+def _split_ids(values: Iterable[str]) -> list[str]:
+    ids: list[str] = []
+    for value in values:
+        ids.extend(part.strip() for part in value.split(",") if part.strip())
+    return list(dict.fromkeys(ids))
+
+
 @click.command()
-@click.option("--asset-id", required=True, help="watsonx.data Intelligence asset ID to analyse")
+@click.option("--asset-id", "asset_ids", multiple=True,
+              help="watsonx.data Intelligence asset ID to analyse (repeat or comma-separate for several)")
+@click.option("--asset-file", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="File with one asset ID per line (# comments allowed)")
 @click.option("--depth", default=5, show_default=True, help="Lineage graph traversal depth")
 @click.option("--output", default=None, help="Save JSON report to file (optional)")
 @click.option("--archive-cos", is_flag=True, help="Archive JSON report to IBM COS")
-def cli(asset_id: str, depth: int, output: str | None, archive_cos: bool) -> None:
-    """IBM watsonx.data Intelligence – downstream impact analysis for a data asset."""
+@click.option("--workers", default=8, show_default=True, help="Concurrent fetches when several assets are given")
+@click.option("--refresh", is_flag=True, help="Ignore cached subgraphs and fetch from the API")
+@click.option("--no-cache", is_flag=True, help="Do not read or write the local graph cache")
+@click.option("--batch-dir", default=None, type=click.Path(file_okay=False),
+              help="Batch mode: write compressed reports and diffs here; only changed reports are written/uploaded")
+def cli(
+    asset_ids: tuple[str, ...],
+    asset_file: str | None,
+    depth: int,
+    output: str | None,
+    archive_cos: bool,
+    workers: int,
+    refresh: bool,
+    no_cache: bool,
+    batch_dir: str | None,
+) -> None:
+    """IBM watsonx.data Intelligence – downstream impact analysis for data assets."""
     api_key = os.environ["IBM_API_KEY"]
     project_id = os.environ["WXDI_PROJECT_ID"]
     region = os.getenv("WXDI_REGION", "us-south")
     base_url = os.getenv("WXDI_BASE_URL", f"https://api.{region}.dai.cloud.ibm.com").rstrip("/")
 
-    token = _get_token(api_key)
+    values = list(asset_ids)
+    if asset_file:
+        with open(asset_file) as fh:
+            values.extend(line.split("#", 1)[0] for line in fh)
+    ids = _split_ids(values)
+    if not ids:
+        raise click.UsageError("Provide --asset-id or --asset-file")
+    store = None
+    if not no_cache:
+        store = LineageGraphStore(
+            os.getenv("LINEAGE_CACHE_DIR", ".lineage_cache"),
+            0 if refresh else float(os.getenv("LINEAGE_CACHE_TTL", "3600")),
+            base_url,
+            project_id,
+        )
 
-    click.echo(f"\nAnalysing downstream impact for asset: {asset_id}")
-    impact = _get_impact(token, base_url, project_id, asset_id)
-    graph = _get_graph(token, base_url, project_id, asset_id, depth)
-
-    click.echo("\n── Downstream Dependencies ──────────────────────────")
-    click.echo(_render_tree(impact))
-
-    report = _build_report(asset_id, impact, graph)
+    token = _get_token(api_key)
 
-    if output:
+    if batch_dir:
+        summary = _run_batch(ids, store, token, base_url, project_id, depth, Path(batch_dir), archive_cos, workers)
+        for entry in summary["assets"]:
+            detail = ""
+            if entry["status"] == "changed":
+                detail = (
+                    f"  nodes +{len(entry['added_nodes'])}/-{len(entry['removed_nodes'])}"
+                    f"  edges +{len(entry['added_edges'])}/-{len(entry['removed_edges'])}"
+                )
+            click.echo(f"{entry['asset_id']}: {entry['status']}{detail}")
+        counts = summary["counts"]
+        click.echo(
+            f"\n{counts['new']} new, {counts['changed']} changed, {counts['unchanged']} unchanged, "
+            f"{len(summary['failed'])} failed. Summary: {Path(batch_dir) / 'summary.json'}"
+        )
+        if summary["failed"]:
+            raise click.ClickException(f"Impact analysis failed for: {', '.join(summary['failed'])}")
+        return
+
+    results: dict[str, tuple[dict, dict]] = {}
+    failed: dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(ids)))) as pool:
+        futures = {
+            pool.submit(_fetch_asset, store, token, base_url, project_id, asset_id, depth): asset_id
+            for asset_id in ids
+        }
+        for future in as_completed(futures):
+            asset_id = futures[future]
+            try:
+                impact, graph, from_cache = future.result()
+            except Exception as exc:
+                logger.error("Impact analysis failed for %s: %s", asset_id, exc)
+                failed[asset_id] = str(exc)
+                continue
+            logger.info("Lineage for %s %s", asset_id, "loaded from cache" if from_cache else "fetched")
+            results[asset_id] = (impact, graph)
+
+    reports: dict[str, dict] = {}
+    for asset_id in ids:
+        if asset_id not in results:
+            continue
+        impact, graph = results[asset_id]
+        click.echo(f"\nAnalysing downstream impact for asset: {asset_id}")
+        click.echo("\n── Downstream Dependencies ──────────────────────────")
+        click.echo(_render_tree(impact))
+        if store is not None:
+            click.echo(f"\nTotal downstream assets: {len(store.closure(asset_id))}")
+        reports[asset_id] = _build_report(asset_id, impact, graph)
+
+    shared: dict[str, list[str]] = {}
+    if store is not None and len(reports) > 1:
+        shared = store.shared_dependencies(reports)
+        click.echo("\n── Shared Downstream Dependencies ───────────────────")
+        for node, sources in sorted(shared.items(), key=lambda item: (-len(item[1]), item[0])):
+            name = store.attributes.get(node, {}).get("name", node)
+            click.echo(f"{name}  <- {', '.join(sources)}")
+
+    if output and reports:
+        if len(ids) == 1:
+            document: dict = next(iter(reports.values()))
+        else:
+            document = {
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "reports": reports,
+                "shared_dependencies": shared,
+                "failed": failed,
+            }
         with open(output, "w") as fh:
-            json.dump(report, fh, indent=2)
+            json.dump(document, fh, indent=2)
         click.echo(f"\nReport saved to: {output}")
 
     if archive_cos:
-        key = _archive_to_cos(report, asset_id)
-        click.echo(f"Report archived to COS: {key}")
+        for asset_id, report in reports.items():
+            key = _archive_to_cos(report, asset_id)
+            click.echo(f"Report archived to COS: {key}")
+
+    if failed:
+        raise click.ClickException(f"Impact analysis failed for: {', '.join(failed)}")
 
 
 if __name__ == "__main__":
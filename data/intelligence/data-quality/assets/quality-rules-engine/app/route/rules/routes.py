@@ -3,9 +3,10 @@ from __future__ import annotations
 import logging, os
 from fastapi import APIRouter, HTTPException, Security
 from fastapi.security import APIKeyHeader
-from starlette.status import HTTP_403_FORBIDDEN, HTTP_500_INTERNAL_SERVER_ERROR
-from app.src.model.RulesModel import DQRuleCreate
-from app.src.model.ResultsModel import QualityScoreResponse
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
+from app.src.model.RulesModel import DQRuleCreate, LocalExecuteRequest
+from app.src.model.ResultsModel import LocalExecutionResponse, QualityScoreResponse
+from app.src.utils.dq_engine import RuleDefinitionError
 import app.src.services.RulesService as rules_svc
 
 logger = logging.getLogger(__name__)
@@ -37,6 +38,22 @@ async def list_rules(_: str = Security(_auth)) -> dict:
         raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc))
 
 
+@router.post("/execute-local", summary="Evaluate DQ rules over a local CSV/Parquet file",
+             response_model=LocalExecutionResponse)
+def execute_rules_locally(request: LocalExecuteRequest, _: str = Security(_auth)) -> LocalExecutionResponse:
+    # Plain def: the scan is CPU-bound, so FastAPI runs it in its threadpool
+    try:
+        rules = [rule.model_dump(exclude_none=True) for rule in request.rules]
+        return LocalExecutionResponse(**rules_svc.execute_rules_locally(
+            rules, request.source_path, request.format, request.chunk_rows))
+    except (RuleDefinitionError, PermissionError) as exc:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(exc))
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=f"File not found: {exc}")
+    except Exception as exc:
+        raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc))
+
+
 @router.post("/{rule_id}/execute", summary="Execute a DQ rule")
 async def execute_rule(rule_id: str, _: str = Security(_auth)) -> dict:
     try:
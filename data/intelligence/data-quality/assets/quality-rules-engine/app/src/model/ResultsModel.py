@@ -12,6 +12,27 @@ class QualityScoreResponse(BaseModel):
     failed_rules: int = 0
 
 
+class RuleResult(BaseModel):
+    rule_name: str
+    type: str
+    columns: list[str]
+    status: str
+    score: float | None
+    threshold: float
+    rows_checked: int
+    rows_failed: int
+
+
+class LocalExecutionResponse(BaseModel):
+    execution_id: str
+    status: str
+    source: str
+    rows_scanned: int
+    duration_ms: float
+    results: list[RuleResult]
+    summary: QualityScoreResponse
+
+
 class ProfilingJobRequest(BaseModel):
     asset_id: str
     columns: list[str] | None = None
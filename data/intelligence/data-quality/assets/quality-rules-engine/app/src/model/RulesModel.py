@@ -19,6 +19,14 @@ class DQRuleCreate(BaseModel):
     allowed_values: list[Any] | None = None
 
 
+class LocalExecuteRequest(BaseModel):
+    source_path: str = Field(..., description="CSV or Parquet file to validate, under DQ_LOCAL_DATA_DIR (relative paths are resolved against it)")
+    format: Literal["csv", "parquet"] | None = Field(None, description="Inferred from the file extension if omitted")
+    rules: list[DQRuleCreate] = Field(..., min_length=1)
+    chunk_rows: int | None = Field(None, ge=1_000, le=5_000_000,
+                                   description="Rows per scanned chunk (default: DQ_LOCAL_CHUNK_ROWS)")
+
+
 class RuleExecuteResponse(BaseModel):
     rule_id: str
     execution_id: str
@@ -1,7 +1,9 @@
 """DQ Rules service."""
 from __future__ import annotations
-import logging
+import logging, os
+from pathlib import Path
 from typing import Any
+from app.src.utils import dq_engine
 from app.src.utils.wxdi_client import WXDIClient
 
 logger = logging.getLogger(__name__)
@@ -26,3 +28,30 @@ def execute_rule(rule_id: str) -> dict:
 
 def get_quality_score() -> dict:
     return _get().get_quality_score()
+
+
+def _resolve_local_path(source_path: str) -> Path:
+    """Resolve *source_path* (relative paths against DQ_LOCAL_DATA_DIR), confined to that directory."""
+    root = os.getenv("DQ_LOCAL_DATA_DIR")
+    if not root:
+        raise PermissionError("Local execution is disabled; set DQ_LOCAL_DATA_DIR to the directory it may read")
+    root_path = Path(root).expanduser().resolve()
+    path = (root_path / Path(source_path).expanduser()).resolve()
+    if not path.is_relative_to(root_path):
+        raise PermissionError(f"{source_path} is outside DQ_LOCAL_DATA_DIR")
+    if not path.is_file():
+        raise FileNotFoundError(source_path)
+    return path
+
+
+def execute_rules_locally(rules: list[dict[str, Any]], source_path: str, fmt: str | None = None,
+                          chunk_rows: int | None = None) -> dict:
+    """Run rule definitions over a local file in one chunked pass; no WXDI job involved."""
+    run = dq_engine.run_rules(rules, _resolve_local_path(source_path), fmt,
+                              chunk_rows or dq_engine.DEFAULT_CHUNK_ROWS)
+    passed = sum(1 for r in run["results"] if r["status"] == "passed")
+    total = len(run["results"])
+    run["summary"] = {"project_id": os.getenv("WXDI_PROJECT_ID", "local"),
+                      "quality_score": round(passed / total, 4) if total else None,
+                      "total_rules": total, "passed_rules": passed, "failed_rules": total - passed}
+    return run
@@ -0,0 +1,282 @@
+"""
+Local data quality rule engine.
+
+Evaluates DQRuleCreate-style rule definitions against a CSV or Parquet file
+without a remote job. The file is scanned once, in chunks, reading only the
+columns the rules reference; every rule updates its own counters from each
+chunk with vectorised pandas operations, so memory is bounded by the chunk
+size (plus 8-16 bytes per row for uniqueness / consistency rules).
+Columns used by uniqueness / consistency rules are read from CSV as strings,
+so their row hashes do not depend on the dtype pandas infers per chunk.
+
+Scoring (pass when score >= threshold):
+  completeness  non-null cells / cells in the rule's columns
+  validity      non-null values matching regex_pattern and/or allowed_values
+  accuracy      non-null values found in allowed_values (the reference set)
+  uniqueness    distinct key rows / rows, key = all rule columns
+  consistency   rows whose first column maps to a single combination of the
+                other columns (e.g. zip code -> country) / rows
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = int(os.getenv("DQ_LOCAL_CHUNK_ROWS", "250000"))
+
+
+class RuleDefinitionError(ValueError):
+    """A rule cannot be evaluated locally as defined."""
+
+
+# ---------------------------------------------------------------------------
+# Per-rule accumulators
+# ---------------------------------------------------------------------------
+
+class _Rule:
+    def __init__(self, rule: dict[str, Any]) -> None:
+        self.rule = rule
+        self.columns: list[str] = list(rule["columns"])
+        if not self.columns:
+            raise RuleDefinitionError(f"Rule '{rule['name']}' has no columns")
+        self.checked = 0
+        self.failed = 0
+
+    @property
+    def text_columns(self) -> list[str]:
+        """Columns this rule needs read as strings (for dtype-independent hashing)."""
+        return []
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    def finish(self) -> None:
+        pass
+
+    def result(self) -> dict[str, Any]:
+        self.finish()
+        threshold = float(self.rule.get("threshold", 0.99))
+        score = 1 - self.failed / self.checked if self.checked else None
+        return {
+            "rule_name": self.rule["name"],
+            "type": self.rule["type"],
+            "columns": self.columns,
+            "status": "passed" if score is not None and score >= threshold else "failed",
+            "score": round(score, 6) if score is not None else None,
+            "threshold": threshold,
+            "rows_checked": self.checked,
+            "rows_failed": self.failed,
+        }
+
+
+class _Completeness(_Rule):
+    def update(self, chunk: pd.DataFrame) -> None:
+        nulls = chunk[self.columns].isna().to_numpy()
+        self.checked += nulls.size
+        self.failed += int(nulls.sum())
+
+
+class _ValueSet(_Rule):
+    """Validity (regex and/or allowed values) and accuracy (reference values)."""
+
+    def __init__(self, rule: dict[str, Any]) -> None:
+        super().__init__(rule)
+        pattern = rule.get("regex_pattern")
+        allowed = rule.get("allowed_values")
+        if rule["type"] == "accuracy":
+            pattern = None
+            if not allowed:
+                raise RuleDefinitionError(
+                    f"Accuracy rule '{rule['name']}' needs allowed_values as the reference set"
+                )
+        elif pattern is None and not allowed:
+            raise RuleDefinitionError(f"Validity rule '{rule['name']}' needs regex_pattern or allowed_values")
+        self.pattern = re.compile(pattern) if pattern else None
+        self.allowed = pd.Index(allowed) if allowed else None
+        self.allowed_str = pd.Index([str(v) for v in allowed]) if allowed else None
+        self._allowed_by_dtype: dict[Any, pd.Index] = {}
+
+    def _allowed_for(self, dtype: Any) -> pd.Index:
+        """Allowed values in the column's kind, so isin() stays vectorised.
+
+        ``["1", "2"]`` against an int column becomes ``[1.0, 2.0]``; ``[1, "a"]``
+        against a string column becomes ``["1", "a"]``. Object (mixed) columns
+        keep the values as given and rely on the string fallback in update().
+        """
+        if dtype not in self._allowed_by_dtype:
+            if dtype == object:
+                cast = self.allowed
+            elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                numeric = pd.to_numeric(pd.Series(list(self.allowed), dtype=object), errors="coerce")
+                cast = pd.Index(numeric.dropna().astype(float))
+            elif pd.api.types.is_string_dtype(dtype):
+                cast = self.allowed_str
+            else:
+                cast = self.allowed
+            self._allowed_by_dtype[dtype] = cast
+        return self._allowed_by_dtype[dtype]
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        for column in self.columns:
+            values = chunk[column].dropna()
+            if values.empty:
+                continue
+            ok = np.ones(len(values), dtype=bool)
+            if self.allowed is not None:
+                ok = values.isin(self._allowed_for(values.dtype)).to_numpy(copy=True)
+                if not ok.all() and values.dtype == object:
+                    # Fall back to string form for the misses (e.g. CSV ints vs "1", "2")
+                    ok[~ok] = values[~ok].astype(str).isin(self.allowed_str).to_numpy()
+            if self.pattern is not None:
+                ok &= values.astype(str).str.fullmatch(self.pattern).fillna(False).to_numpy(dtype=bool)
+            self.checked += len(values)
+            self.failed += int((~ok).sum())
+
+
+class _Uniqueness(_Rule):
+    def __init__(self, rule: dict[str, Any]) -> None:
+        super().__init__(rule)
+        self._hashes: list[np.ndarray] = []
+
+    @property
+    def text_columns(self) -> list[str]:
+        return self.columns
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self._hashes.append(pd.util.hash_pandas_object(chunk[self.columns], index=False).to_numpy())
+
+    def finish(self) -> None:
+        if not self._hashes:
+            return
+        hashes = np.sort(np.concatenate(self._hashes))
+        self._hashes = []
+        distinct = 1 + int(np.count_nonzero(hashes[1:] != hashes[:-1])) if len(hashes) else 0
+        self.checked = len(hashes)
+        self.failed = len(hashes) - distinct
+
+
+class _Consistency(_Rule):
+    def __init__(self, rule: dict[str, Any]) -> None:
+        super().__init__(rule)
+        if len(self.columns) < 2:
+            raise RuleDefinitionError(
+                f"Consistency rule '{rule['name']}' needs a key column and at least one dependent column"
+            )
+        self._keys: list[np.ndarray] = []
+        self._values: list[np.ndarray] = []
+
+    @property
+    def text_columns(self) -> list[str]:
+        return self.columns
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self._keys.append(pd.util.hash_pandas_object(chunk[self.columns[:1]], index=False).to_numpy())
+        self._values.append(pd.util.hash_pandas_object(chunk[self.columns[1:]], index=False).to_numpy())
+
+    def finish(self) -> None:
+        if not self._keys:
+            return
+        pairs = pd.DataFrame({"k": np.concatenate(self._keys), "v": np.concatenate(self._values)})
+        self._keys, self._values = [], []
+        variants = pairs.groupby("k", sort=False)["v"].transform("nunique")
+        self.checked = len(pairs)
+        self.failed = int((variants > 1).sum())
+
+
+_RULE_TYPES: dict[str, type[_Rule]] = {
+    "completeness": _Completeness,
+    "validity": _ValueSet,
+    "accuracy": _ValueSet,
+    "uniqueness": _Uniqueness,
+    "consistency": _Consistency,
+}
+
+
+# ---------------------------------------------------------------------------
+# Chunked readers
+# ---------------------------------------------------------------------------
+
+def _detect_format(path: Path, fmt: str | None) -> str:
+    if fmt:
+        return fmt.lower()
+    suffixes = [s.lower() for s in path.suffixes]
+    if ".parquet" in suffixes or ".pq" in suffixes:
+        return "parquet"
+    if ".csv" in suffixes:
+        return "csv"
+    raise RuleDefinitionError(f"Cannot infer file format of '{path.name}'; pass format='csv' or 'parquet'")
+
+
+def _iter_chunks(path: Path, fmt: str, columns: list[str], chunk_rows: int,
+                 text_columns: list[str]) -> Iterator[pd.DataFrame]:
+    # Parquet columns have one type for the whole file; CSV types are guessed per chunk
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError("Reading Parquet requires pyarrow (pip install pyarrow)") from exc
+        parquet = pq.ParquetFile(path)
+        missing = set(columns) - set(parquet.schema_arrow.names)
+        if missing:
+            raise RuleDefinitionError(f"Columns not found in {path.name}: {sorted(missing)}")
+        for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    elif fmt == "csv":
+        header = pd.read_csv(path, nrows=0).columns
+        missing = set(columns) - set(header)
+        if missing:
+            raise RuleDefinitionError(f"Columns not found in {path.name}: {sorted(missing)}")
+        dtype = {column: pd.StringDtype() for column in text_columns}
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows, dtype=dtype)
+    else:
+        raise RuleDefinitionError(f"Unsupported format '{fmt}' (use csv or parquet)")
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def run_rules(
+    rules: list[dict[str, Any]],
+    path: str | os.PathLike,
+    fmt: str | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> dict[str, Any]:
+    """Evaluate all *rules* over the file at *path* in a single chunked scan.
+
+    Returns ``execution_id``, ``rows_scanned``, ``duration_ms`` and one
+    result per rule (status ``passed`` / ``failed``, score, counts).
+    """
+    path = Path(path)
+    evaluators = [_RULE_TYPES[rule["type"]](rule) for rule in rules]
+    columns = list(dict.fromkeys(c for e in evaluators for c in e.columns))
+    text_columns = list(dict.fromkeys(c for e in evaluators for c in e.text_columns))
+    fmt = _detect_format(path, fmt)
+
+    started = time.perf_counter()
+    rows = 0
+    for chunk in _iter_chunks(path, fmt, columns, chunk_rows, text_columns):
+        rows += len(chunk)
+        for evaluator in evaluators:
+            evaluator.update(chunk)
+    results = [e.result() for e in evaluators]
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("Local DQ run: %d rules over %d rows of %s in %.0f ms", len(rules), rows, path.name, duration_ms)
+    return {
+        "execution_id": f"local-{uuid.uuid4()}",
+        "status": "completed",
+        "source": str(path),
+        "rows_scanned": rows,
+        "duration_ms": duration_ms,
+        "results": results,
+    }
@@ -1,25 +1,27 @@
+import asyncio
 import json
 import os
 import uvicorn
 import sys
 import time
 import requests
-import jaydebeapi
-import pymysql
-import pandas as pd
-import prestodb
+import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-from pymongo import MongoClient
 from dotenv import load_dotenv
 
 # Fast API
 from fastapi import FastAPI, Security, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.security.api_key import APIKeyHeader
-from starlette.status import HTTP_403_FORBIDDEN
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN, HTTP_502_BAD_GATEWAY, HTTP_503_SERVICE_UNAVAILABLE
 from fastapi.middleware.cors import CORSMiddleware
 
+import db_pool
+
 
 # Custom type classes
 from customTypes.texttosqlRequest import texttosqlRequest
@@ -57,49 +59,20 @@ ibm_cloud_api_key = os.environ.get("IBM_CLOUD_API_KEY")
 project_id = os.environ.get("WXD_PROJECT_ID")
 text_to_sql_endpoint = os.environ.get("TEXT_TO_SQL_ENDPOINT")
 
-# DB2 Creds
-db2_creds = {
-    "db_hostname": os.environ.get("DB2_HOSTNAME"),
-    "db_port": os.environ.get("DB2_PORT"),
-    "db_user": os.environ.get("DB2_USERNAME"),
-    "db_password": os.environ.get("DB2_PASSWORD"),
-    "db_database": os.environ.get("DB2_DATABASE"),
-    "db_schema": os.environ.get("DB2_SCHEMA")
-}
-
-mysql_creds = {
-    "db_hostname": os.environ.get("MYSQL_HOSTNAME"),
-    "db_port": os.environ.get("MYSQL_PORT"),
-    "db_user": os.environ.get("MYSQL_USERNAME"),
-    "db_password": os.environ.get("MYSQL_PASSWORD"),
-    "db_database": os.environ.get("MYSQL_DATABASE"),
-    "tls_location": os.environ.get("MYSQL_TLS_LOCATION")
-}
-
-mdb_creds = {
-    "db_hostname": os.environ.get("MDB_HOSTNAME"),
-    "db_port": os.environ.get("MDB_PORT"),
-    "db_user": os.environ.get("MDB_USERNAME"),
-    "db_password": os.environ.get("MDB_PASSWORD"),
-    "db_database": os.environ.get("MDB_DATABASE"),
-    "db_schema": os.environ.get("MDB_SCHEMA"),
-    "tls_location": os.environ.get("MDB_TLS_LOCATION")
-}
-
-presto_creds = {
-    "db_hostname": os.environ.get("PRESTO_HOSTNAME"),
-    "db_port": os.environ.get("PRESTO_PORT"),
-    "db_user": os.environ.get("PRESTO_USERNAME"),
-    "db_password": os.environ.get("PRESTO_PASSWORD"),
-    "db_catalog": os.environ.get("PRESTO_CATALOG"),
-    "db_schema": os.environ.get("PRESTO_SCHEMA"),
-    "tls_location": os.environ.get("PRESTO_TLS_LOCATION")
-}
+# Query execution: blocking driver calls run here, off the event loop
+DB_MAX_WORKERS = int(os.environ.get("DB_MAX_WORKERS", "8"))
+# Row caps for /texttosql (materialized) and /texttosql/stream (streamed)
+DB_MAX_ROWS = int(os.environ.get("DB_MAX_ROWS", "10000"))
+DB_STREAM_MAX_ROWS = int(os.environ.get("DB_STREAM_MAX_ROWS", "1000000"))
+
+db_executor = ThreadPoolExecutor(max_workers=DB_MAX_WORKERS, thread_name_prefix="db")
+http_session = requests.Session()
 
 
 token_updated_at = None
 token = None
 headers = None
+token_lock = threading.Lock()
 
 def get_auth_token(api_key):
     auth_url = "https://iam.cloud.ibm.com/identity/token"
@@ -113,7 +86,7 @@ def get_auth_token(api_key):
         "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
         "apikey": api_key
     }
-    response = requests.post(auth_url, headers=headers, data=data, verify=False)
+    response = http_session.post(auth_url, headers=headers, data=data, verify=False)
     
     if response.status_code == 200:
         return response.json().get("access_token")
@@ -122,14 +95,16 @@ def get_auth_token(api_key):
 
 def update_token_if_needed(api_key):
     global token, token_updated_at, headers
-    if token is None or datetime.now() - token_updated_at > timedelta(minutes=20):
-        token =  get_auth_token(api_key)
-        token_updated_at = datetime.now()
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Authorization": f"Bearer {token}"
-        }
+    with token_lock:
+        if token is None or datetime.now() - token_updated_at > timedelta(minutes=20):
+            token =  get_auth_token(api_key)
+            token_updated_at = datetime.now()
+            headers = {
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "Authorization": f"Bearer {token}"
+            }
+    return headers
 
 # Basic security for accessing the App
 async def get_api_key(api_key_header: str = Security(api_key_header)):
@@ -144,115 +119,147 @@ async def get_api_key(api_key_header: str = Security(api_key_header)):
 def index():
     return {"IBM": "Build Engineering"}
 
-# Caching database connection
-db_connections = {}
-async def get_db_connection(dbtype):
-    if dbtype in db_connections:
-        return db_connections[dbtype]
+def generate_sql(request):
+    """Call the watsonx.data text-to-SQL endpoint (blocking)."""
+    auth_headers = update_token_if_needed(ibm_cloud_api_key)
 
-    if dbtype == "db2":
-        SQL_DATABASE_URL = "jdbc:db2://" + str(db2_creds["db_hostname"]) + ":" + str(db2_creds["db_port"]) + "/" + str(db2_creds["db_database"]) + ":currentSchema=" + str(db2_creds["db_schema"]) + ";user=" + str(db2_creds["db_user"]) + ";password=" + str(db2_creds["db_password"]) + ";sslConnection=true;"
-        print("SQL created " + SQL_DATABASE_URL)
-        conn = jaydebeapi.connect("com.ibm.db2.jcc.DB2Driver", SQL_DATABASE_URL, None, "db2jcc4.jar")
-    
-    elif dbtype == "mysql":
-
-        conn = pymysql.connect(
-                        host=str(mysql_creds["db_hostname"]),
-                        port=int(mysql_creds["db_port"]),
-                        database=str(mysql_creds["db_database"]),
-                        user=str(mysql_creds["db_user"]),
-                        passwd=str(mysql_creds["db_password"]),
-                        ssl={'ca': None})
-    
-    elif dbtype == "mongodb":
-        tls_ca_file =  str(mdb_creds["tls_location"])
-        username = str(mdb_creds["db_user"])
-        password = str(mdb_creds["db_password"]) 
-        host = str(mdb_creds["db_hostname"])
-        port = str(mdb_creds["db_port"])  # default MongoDB port
-        conn =  MongoClient(f'mongodb://{username}:{password}@{host}:{port}',tls=True,tlsCAFile=tls_ca_file)
-    elif dbtype == "presto":
-        #print("in presto" + str(presto_creds["db_password"]) + " " + str(presto_creds["db_user"]) + " " + str(presto_creds["db_hostname"]))
-        with prestodb.dbapi.connect(
-            host=str(presto_creds["db_hostname"]),
-            port=str(presto_creds["db_port"]),
-            user=str(presto_creds["db_user"]),
-            catalog=str(presto_creds["db_catalog"]),
-            schema=str(presto_creds["db_schema"]),
-            http_scheme='https',
-            auth=prestodb.auth.BasicAuthentication(str(presto_creds["db_user"]), str(presto_creds["db_password"]))
-            )as conn:
-             #conn._http_session.verify = str(presto_creds["tls_location"])
-             conn._http_session.verify = False
-    else:
-        raise ValueError("Unsupported database type")
+    payload= {
+        "query": request.question,
+        "raw_output": request.raw_output
+    }
 
-    db_connections[dbtype] = conn
-    return conn
+    params = {'container_id': request.container_id, 'container_type': request.container_type, 'dialect': request.dialect, 'top_n': request.top_n}
 
-async def query_exec(query, dbtype):
-    conn = await get_db_connection(dbtype)
-        
-    cur = conn.cursor()
-    cur.execute(query)
-    rows = cur.fetchall()
+    return http_session.post(text_to_sql_endpoint, headers=auth_headers, json=payload, params=params, verify=False).json()
 
-    # Get column names from cursor description
-    columns = [description[0] for description in cur.description]
-    
-    # Convert rows to a list of dictionaries
+
+def describe_generation(request, response):
+    """NL response fields for a text-to-SQL result; raises IndexError if no SQL was generated."""
+    nlResponse = {}
+    nlResponse['nl_question'] = request.question
+    nlResponse['sql_query'] = response['generated_sql_queries'][0]['sql']
+    nlResponse['score'] = response['generated_sql_queries'][0]['score']
+    nlResponse['model_id'] = response['model_id']
+    nlResponse['token_count'] = response['resource_usage']['token_count']
+    nlResponse['cuh'] = response['resource_usage']['cuh']
+    if request.raw_output=="true":
+        nlResponse['raw_output'] = response['wx_ai_raw_output']
+    return nlResponse
+
+
+def row_limit(requested, cap):
+    return min(requested, cap) if requested else cap
+
+
+def query_exec(query, dbtype, max_rows):
+    """Run a query in the worker pool; returns (rows as dicts, truncated)."""
     results = []
-    for row in rows:
-        results.append(dict(zip(columns, row)))
-    return results
+    truncated = False
+    columns = []
+    for kind, value in db_pool.iter_query(query, dbtype, max_rows):
+        if kind == "columns":
+            columns = value
+        elif kind == "rows":
+            # Convert rows to a list of dictionaries
+            results.extend(dict(zip(columns, row)) for row in value)
+        else:
+            truncated = value
+    return results, truncated
+
+
+def close_later(rows, pending):
+    """Close a query generator on the DB worker pool once its in-flight step is done.
+
+    *pending* is the concurrent future from db_executor.submit(), not the
+    asyncio wrapper: a cancelled asyncio future reports done while the
+    worker thread may still be inside next(rows).
+    """
+    if pending is None:
+        db_executor.submit(rows.close)
+    else:
+        # Runs immediately if the step has already finished
+        pending.add_done_callback(lambda _: db_executor.submit(rows.close))
+
 
 @app.post("/texttosql")
 async def texttosql(request: texttosqlRequest, api_key: str = Security(get_api_key)):
-    question=request.question
-    container_id=request.container_id
-    container_type=request.container_type
-    dialect=request.dialect
-    top_n=request.top_n
-    raw_output=request.raw_output
-    db_execute=request.db_execute
-    
-    update_token_if_needed(ibm_cloud_api_key)
-
-    payload= {
-        "query": question,
-        "raw_output": raw_output
-    }
-    
-    params = {'container_id': container_id, 'container_type': container_type, 'dialect': dialect, 'top_n': top_n}
-    
-    response = requests.post(text_to_sql_endpoint, headers=headers, json=payload, params=params, verify=False).json()
-
-    nlResponse = {}
+    response = await run_in_threadpool(generate_sql, request)
 
     try:
-        query = response['generated_sql_queries'][0]['sql']
-        score = response['generated_sql_queries'][0]['score']
-        nlResponse['nl_question'] = question
-        nlResponse['sql_query'] = query
-        nlResponse['score'] = score
-        nlResponse['model_id'] = response['model_id']
-        nlResponse['token_count'] = response['resource_usage']['token_count']
-        nlResponse['cuh'] = response['resource_usage']['cuh']
-        if raw_output=="true":
-            nlResponse['raw_output'] = response['wx_ai_raw_output']
-        if db_execute=="true":
-           queryresponse = await query_exec(query.replace(';', ''), dialect)
-           nlResponse['query_response'] = queryresponse
+        nlResponse = describe_generation(request, response)
+        if request.db_execute=="true":
+            loop = asyncio.get_running_loop()
+            max_rows = row_limit(request.max_rows, DB_MAX_ROWS)
+            try:
+                queryresponse, truncated = await loop.run_in_executor(
+                    db_executor, query_exec, nlResponse['sql_query'].replace(';', ''), request.dialect, max_rows)
+                nlResponse['query_response'] = queryresponse
+                nlResponse['query_truncated'] = truncated
+            except (ValueError, TimeoutError) as e:
+                logger.error(f"SQL Execute Error: {str(e)}")
+                nlResponse['query_error'] = str(e)
         logger.info("Query tranaction complete")
     except IndexError as e:
         logger.error(f"SQL Generate Error: {str(e)}")
-        nlResponse['sql_generate_error'] = str(e)
-  
-  
+        nlResponse = {'sql_generate_error': str(e)}
+
+
     return texttosqlResponse(response=nlResponse)
 
 
+@app.post("/texttosql/stream")
+async def texttosql_stream(request: texttosqlRequest, api_key: str = Security(get_api_key)):
+    """Generate SQL, execute it and stream the result as NDJSON.
+
+    Line 1 is the generation metadata plus "columns", then one JSON object
+    per row, then {"row_count": n, "truncated": bool}. Rows are fetched in
+    DB_FETCH_SIZE batches while the response is being sent.
+    """
+    response = await run_in_threadpool(generate_sql, request)
+    try:
+        nlResponse = describe_generation(request, response)
+    except IndexError as e:
+        logger.error(f"SQL Generate Error: {str(e)}")
+        raise HTTPException(status_code=HTTP_502_BAD_GATEWAY, detail=f"SQL Generate Error: {str(e)}")
+
+    rows = db_pool.iter_query(nlResponse['sql_query'].replace(';', ''), request.dialect,
+                              row_limit(request.max_rows, DB_STREAM_MAX_ROWS))
+    # Start the query before answering so connection and SQL errors get a proper status code
+    pending = db_executor.submit(next, rows)
+    try:
+        _, columns = await asyncio.wrap_future(pending)
+    except asyncio.CancelledError:
+        # Client went away while the query was starting
+        close_later(rows, pending)
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+    except TimeoutError as e:
+        raise HTTPException(status_code=HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    async def ndjson():
+        pending = None
+        row_count = 0
+        try:
+            yield json.dumps({**nlResponse, "columns": columns}, default=str) + "\n"
+            while True:
+                pending = db_executor.submit(next, rows, None)
+                item = await asyncio.wrap_future(pending)
+                if item is None:
+                    break
+                kind, value = item
+                if kind == "rows":
+                    row_count += len(value)
+                    yield "".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in value)
+                else:
+                    yield json.dumps({"row_count": row_count, "truncated": value}) + "\n"
+            logger.info(f"Streamed {row_count} rows")
+        finally:
+            close_later(rows, pending)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 if __name__ == '__main__':
     if 'uvicorn' not in sys.argv[0]:
         uvicorn.run("app:app", host='0.0.0.0', port=4050, reload=True)
\ No newline at end of file
@@ -10,4 +10,5 @@ class texttosqlRequest(BaseModel):
     raw_output: str = Field(default="false", title="show raw output form watsonx", description="show raw output form watsonx")
     top_n: str = Field(default="5", title="top n value", description="top n value")
     db_execute: str = Field(default="false", title="Execute the generated SQL", description="Execute the generated SQL")
+    max_rows: Optional[int] = Field(default=None, gt=0, title="Maximum rows returned", description="Maximum rows returned when executing the SQL (capped by DB_MAX_ROWS / DB_STREAM_MAX_ROWS)")
     
\ No newline at end of file
@@ -0,0 +1,266 @@
+"""
+Per-backend database connection pools for the text-to-SQL app.
+
+Every backend (presto, mysql, db2) gets a bounded pool of open connections.
+A connection that has been idle longer than DB_POOL_HEALTHCHECK_INTERVAL is
+pinged before reuse and replaced if the ping fails; a connection whose query
+failed or was abandoned mid-result is closed instead of returned.
+
+iter_query() runs a query on a pooled connection and yields rows in
+DB_FETCH_SIZE batches (unbuffered cursor for MySQL, paged HTTP results for
+Presto), so callers can stream results with flat memory.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+HEALTHCHECK_INTERVAL = float(os.environ.get("DB_POOL_HEALTHCHECK_INTERVAL", "60"))
+FETCH_SIZE = int(os.environ.get("DB_FETCH_SIZE", "1000"))
+
+# DB2 Creds
+db2_creds = {
+    "db_hostname": os.environ.get("DB2_HOSTNAME"),
+    "db_port": os.environ.get("DB2_PORT"),
+    "db_user": os.environ.get("DB2_USERNAME"),
+    "db_password": os.environ.get("DB2_PASSWORD"),
+    "db_database": os.environ.get("DB2_DATABASE"),
+    "db_schema": os.environ.get("DB2_SCHEMA")
+}
+
+mysql_creds = {
+    "db_hostname": os.environ.get("MYSQL_HOSTNAME"),
+    "db_port": os.environ.get("MYSQL_PORT"),
+    "db_user": os.environ.get("MYSQL_USERNAME"),
+    "db_password": os.environ.get("MYSQL_PASSWORD"),
+    "db_database": os.environ.get("MYSQL_DATABASE"),
+    "tls_location": os.environ.get("MYSQL_TLS_LOCATION")
+}
+
+presto_creds = {
+    "db_hostname": os.environ.get("PRESTO_HOSTNAME"),
+    "db_port": os.environ.get("PRESTO_PORT"),
+    "db_user": os.environ.get("PRESTO_USERNAME"),
+    "db_password": os.environ.get("PRESTO_PASSWORD"),
+    "db_catalog": os.environ.get("PRESTO_CATALOG"),
+    "db_schema": os.environ.get("PRESTO_SCHEMA"),
+    "tls_location": os.environ.get("PRESTO_TLS_LOCATION")
+}
+
+
+# ---------------------------------------------------------------------------
+# Connection factories and health checks
+# ---------------------------------------------------------------------------
+
+def _connect_db2():
+    import jaydebeapi
+
+    SQL_DATABASE_URL = "jdbc:db2://" + str(db2_creds["db_hostname"]) + ":" + str(db2_creds["db_port"]) + "/" + str(db2_creds["db_database"]) + ":currentSchema=" + str(db2_creds["db_schema"]) + ";user=" + str(db2_creds["db_user"]) + ";password=" + str(db2_creds["db_password"]) + ";sslConnection=true;"
+    return jaydebeapi.connect("com.ibm.db2.jcc.DB2Driver", SQL_DATABASE_URL, None, "db2jcc4.jar")
+
+
+def _connect_mysql():
+    import pymysql
+
+    # autocommit: a pooled connection must not keep one read snapshot across requests
+    return pymysql.connect(
+        host=str(mysql_creds["db_hostname"]),
+        port=int(mysql_creds["db_port"]),
+        database=str(mysql_creds["db_database"]),
+        user=str(mysql_creds["db_user"]),
+        passwd=str(mysql_creds["db_password"]),
+        ssl={'ca': None},
+        autocommit=True)
+
+
+def _connect_presto():
+    import prestodb
+
+    conn = prestodb.dbapi.connect(
+        host=str(presto_creds["db_hostname"]),
+        port=str(presto_creds["db_port"]),
+        user=str(presto_creds["db_user"]),
+        catalog=str(presto_creds["db_catalog"]),
+        schema=str(presto_creds["db_schema"]),
+        http_scheme='https',
+        auth=prestodb.auth.BasicAuthentication(str(presto_creds["db_user"]), str(presto_creds["db_password"]))
+    )
+    #conn._http_session.verify = str(presto_creds["tls_location"])
+    conn._http_session.verify = False
+    return conn
+
+
+def _select_one(sql):
+    def ping(conn):
+        cur = conn.cursor()
+        try:
+            cur.execute(sql)
+            cur.fetchall()
+        finally:
+            cur.close()
+    return ping
+
+
+def _ping_mysql(conn):
+    conn.ping(reconnect=False)
+
+
+# ---------------------------------------------------------------------------
+# Pools
+# ---------------------------------------------------------------------------
+
+class ConnectionPool:
+    """Bounded pool of DB-API connections for one backend."""
+
+    def __init__(self, name, connect, ping, size=POOL_SIZE):
+        self.name = name
+        self._connect = connect
+        self._ping = ping
+        self._idle = queue.LifoQueue()          # (connection, last returned at)
+        self._slots = threading.BoundedSemaphore(size)
+        self._discarded = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """Lease a healthy connection; it goes back to the pool on exit unless discarded."""
+        if not self._slots.acquire(timeout=POOL_TIMEOUT):
+            raise TimeoutError(f"No {self.name} connection available within {POOL_TIMEOUT:g}s")
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        except Exception:
+            self.discard(conn)
+            raise
+        finally:
+            if conn is not None:
+                with self._lock:
+                    broken = id(conn) in self._discarded
+                    self._discarded.discard(id(conn))
+                if broken:
+                    self._close(conn)
+                else:
+                    self._idle.put((conn, time.monotonic()))
+            self._slots.release()
+
+    def discard(self, conn):
+        """Close *conn* instead of returning it to the pool when its lease ends."""
+        if conn is not None:
+            with self._lock:
+                self._discarded.add(id(conn))
+
+    def _checkout(self):
+        while True:
+            try:
+                conn, returned_at = self._idle.get_nowait()
+            except queue.Empty:
+                logger.info(f"Opening new {self.name} connection")
+                return self._connect()
+            if time.monotonic() - returned_at < HEALTHCHECK_INTERVAL:
+                return conn
+            try:
+                self._ping(conn)
+                return conn
+            except Exception as e:
+                logger.warning(f"Dropping stale {self.name} connection: {e}")
+                self._close(conn)
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing {self.name} connection: {e}")
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(dbtype):
+    """Process-wide pool for *dbtype*; raises ValueError for unknown backends."""
+    with _pools_lock:
+        if dbtype not in _pools:
+            if dbtype == "db2":
+                _pools[dbtype] = ConnectionPool("db2", _connect_db2, _select_one("SELECT 1 FROM SYSIBM.SYSDUMMY1"))
+            elif dbtype == "mysql":
+                _pools[dbtype] = ConnectionPool("mysql", _connect_mysql, _ping_mysql)
+            elif dbtype == "presto":
+                _pools[dbtype] = ConnectionPool("presto", _connect_presto, _select_one("SELECT 1"))
+            else:
+                raise ValueError("Unsupported database type")
+        return _pools[dbtype]
+
+
+# ---------------------------------------------------------------------------
+# Query execution
+# ---------------------------------------------------------------------------
+
+def _open_cursor(conn, dbtype):
+    if dbtype == "mysql":
+        import pymysql.cursors
+
+        # Unbuffered: rows are read from the socket as they are fetched
+        return conn.cursor(pymysql.cursors.SSCursor)
+    cur = conn.cursor()
+    cur.arraysize = FETCH_SIZE
+    return cur
+
+
+def _abandon(pool, conn, cur, dbtype):
+    """Stop a query whose result was not read to the end."""
+    if dbtype == "mysql":
+        # Closing an unbuffered cursor drains the rest of the result; drop the socket instead
+        pool.discard(conn)
+        return
+    try:
+        if dbtype == "presto":
+            cur.cancel()
+        cur.close()
+    except Exception as e:
+        logger.warning(f"Could not cancel {dbtype} query, discarding connection: {e}")
+        pool.discard(conn)
+
+
+def iter_query(query, dbtype, max_rows):
+    """Run *query* on a pooled connection and stream its result.
+
+    Yields ("columns", [names]), then ("rows", [tuples]) batches of at most
+    DB_FETCH_SIZE rows, then ("end", truncated) where truncated is True if
+    the result had more than *max_rows* rows. Closing the generator early
+    cancels the query and releases the connection.
+    """
+    pool = get_pool(dbtype)
+    with pool.connection() as conn:
+        cur = _open_cursor(conn, dbtype)
+        finished = False
+        try:
+            cur.execute(query)
+            # Presto only knows the columns once the first page has arrived
+            rows = cur.fetchmany(min(FETCH_SIZE, max_rows)) if max_rows > 0 else []
+            yield "columns", [description[0] for description in cur.description or []]
+            remaining = max_rows
+            while rows:
+                remaining -= len(rows)
+                yield "rows", rows
+                if remaining <= 0:
+                    break
+                rows = cur.fetchmany(min(FETCH_SIZE, remaining))
+            truncated = remaining <= 0 and cur.fetchone() is not None
+            finished = not truncated
+            yield "end", truncated
+        finally:
+            if finished:
+                cur.close()
+            else:
+                _abandon(pool, conn, cur, dbtype)
@@ -1,5 +1,8 @@
 import os
+import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from logs.logging_config import setup_logging
 
@@ -9,24 +12,48 @@ load_dotenv()
 AUTH_URL = os.getenv('AUTH_URL')
 API_KEY = os.getenv('API_KEY')
 
+# Refresh the token this many seconds before IAM says it expires
+TOKEN_REFRESH_MARGIN = int(os.getenv('TOKEN_REFRESH_MARGIN', '300'))
+
 # Inizialise logger
 logger = setup_logging()
 
+# Process-wide HTTP session: keep-alive connections shared by all API calls
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+_token = None
+_token_expires_at = 0.0
+_token_lock = threading.Lock()
+
+
 def access_token():
     """
-    Get the bearer token required for api calls to watsonx.data Intelligence
-    args: api_key(str) - IBM Cloud API Access key
+    Get the bearer token required for api calls to watsonx.data Intelligence.
+    The token is cached for the process and refreshed TOKEN_REFRESH_MARGIN
+    seconds before it expires, so most calls cost no IAM round trip.
     return: access_token (str)
     """
-    try:
-        auth_response = requests.post(
-            AUTH_URL,
-            data={"apikey": API_KEY, "grant_type": "urn:ibm:params:oauth:grant-type:apikey"},
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
-        )
-        # get access token
-        access_token = auth_response.json()["access_token"]
-        logger.info(f"Generated beared token")
-        return access_token
-    except Exception as ex:
-        logger.info(f"ERROR: {ex}")
\ No newline at end of file
+    global _token, _token_expires_at
+    with _token_lock:
+        if _token is not None and time.time() < _token_expires_at - TOKEN_REFRESH_MARGIN:
+            return _token
+        try:
+            auth_response = session.post(
+                AUTH_URL,
+                data={"apikey": API_KEY, "grant_type": "urn:ibm:params:oauth:grant-type:apikey"},
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=30
+            )
+            auth_response.raise_for_status()
+            token_data = auth_response.json()
+            # get access token
+            _token = token_data["access_token"]
+            _token_expires_at = token_data.get("expiration") or time.time() + token_data.get("expires_in", 3600)
+            logger.info(f"Generated beared token")
+        except Exception as ex:
+            logger.info(f"ERROR: {ex}")
+            # Keep using a token that has not actually expired yet
+            if _token is not None and time.time() >= _token_expires_at:
+                _token = None
+        return _token
@@ -4,7 +4,7 @@ from pydantic import BaseModel
 from config import access_token
 from logs.logging_config import setup_logging
 from metadata_enrichment import MetaDataEnrichment
-from text2sql_generation import Text2SQLGeneration
+from text2sql_generation import get_text2sql_client
 
 logger = setup_logging()
 
@@ -18,6 +18,10 @@ class PrestoData(BaseModel):
 # Request body for text2sql generation
 class Text2sqlData(BaseModel):
     query: str
+    use_cache: bool = True
+
+# Enrichment jobs whose completion already invalidated the Text2SQL cache
+_enriched_jobs = set()
 
 @app.get("/")
 def read_root():
@@ -43,6 +47,7 @@ def import_data_wxdi(PrestoData: PrestoData):
         job_response = mdeObj.execute_metadata_enrichment_job(data_asset_ids, PrestoData.file_name)
         logger.info("Job ID generated for metadata enrichment")
         job_id = job_response.json()['entity']['job']['id']
+        get_text2sql_client().cache.invalidate(f"asset {data_asset_ids} imported")
 
         return {
                 "message": f"Metadata enrichment started for asset id {data_asset_ids}. Use the enrichment_job_id to check the job status",
@@ -55,18 +60,25 @@ def import_data_wxdi(PrestoData: PrestoData):
 
 
 @app.get("/check_enrichment_status/{job_id}")
-def check_enrichment_status(job_id : str):
+def check_enrichment_status(job_id : str, wait_seconds: float = 0):
     """
         It checks the status of metadata enrichment job.
-        args: job_id(str) (Metadata enrichment job id)
+        args: job_id(str) (Metadata enrichment job id),
+              wait_seconds(float) (Optional: keep polling up to this long for the job to finish)
         return: state (str) (Returns completed or failed status)
     """
     try:
         mdeObj = MetaDataEnrichment()
         logger.info("Check the metadata enrichment job status")
-        state = mdeObj.check_job_status(job_id)
+        if wait_seconds > 0:
+            state = mdeObj.wait_for_job(job_id, wait_seconds)
+        else:
+            state = mdeObj.check_job_status(job_id)
         print(state)
         if state == "Completed":
+            if job_id not in _enriched_jobs:
+                _enriched_jobs.add(job_id)
+                get_text2sql_client().cache.invalidate(f"enrichment job {job_id} completed")
             return {
                 "message": "Data imported to watsonx.data intelligence successfully. Performed metadata enrichment successfully",
                 "enrichment_status": "Completed"
@@ -89,7 +101,7 @@ def onboard_text2sql():
         return: container_details (JSON) (Returns container id(ie, project id) and container type)
     """
     try:
-        text2sqlObj = Text2SQLGeneration()
+        text2sqlObj = get_text2sql_client()
         response = text2sqlObj.onboard_text2sql_capabilities()
         response = {
             "container_details" : response,
@@ -105,13 +117,15 @@ def onboard_text2sql():
 @app.post("/generate_text2sql/")
 def generate_text2sql(Text2sqlData: Text2sqlData):
     """
-        It checks the status of metadata enrichment job.
-        args: query(str) (User's request to create an sql command)
+        It generates SQL for the user's question. Repeated questions (ignoring
+        whitespace and trailing punctuation, but not case) are answered from a cache
+        until the project metadata changes; set use_cache to false to force a new generation.
+        args: query(str) (User's request to create an sql command), use_cache(bool)
         return: Text2SQL_Generation (JSON) (Returns a json response with generated_sql_queries in it)
     """
     try:
-        text2sqlObj = Text2SQLGeneration()
-        response = text2sqlObj.generate_text2sql_content(Text2sqlData)
+        text2sqlObj = get_text2sql_client()
+        response = text2sqlObj.generate_text2sql_content(Text2sqlData, use_cache=Text2sqlData.use_cache)
         response = {
             "Text2SQL_Generation" : response,
             "message" : "Text2SQL generation completed successfully"
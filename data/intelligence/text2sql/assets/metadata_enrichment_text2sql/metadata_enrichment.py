@@ -2,10 +2,9 @@ import os
 import time
 import json
 import uuid
-import requests
 from datetime import datetime
 from dotenv import load_dotenv
-from config import access_token
+from config import access_token, session
 from logs.logging_config import setup_logging
 
 # Load variables from .env file
@@ -14,9 +13,13 @@ load_dotenv()
 # Logger
 logger = setup_logging()    
 
-POLLING_INTERVAL = 10 # in seconds
+POLLING_INTERVAL = 10 # in seconds, longest wait between two status checks
+POLLING_INITIAL_INTERVAL = float(os.getenv('POLLING_INITIAL_INTERVAL', '0.5')) # in seconds
+POLLING_BACKOFF = 1.5
 REQUEST_TIMEOUT = 60 # in seconds
 
+MDE_TERMINAL_STATES = {"Completed", "Failed", "Canceled", "CompletedWithErrors"}
+
 class MetaDataEnrichment:
 
     def __init__(self):
@@ -109,7 +112,7 @@ class MetaDataEnrichment:
                 
             }
             # logger.info(f"Posting file to IKC")
-            response = requests.post(register_url, headers=headers, params=params, data=json.dumps(payload))
+            response = session.post(register_url, headers=headers, params=params, data=json.dumps(payload), timeout=REQUEST_TIMEOUT)
             logger.info(f"File successfully registered to IKC project {response}")
 
             response_data = response.json()
@@ -174,7 +177,7 @@ class MetaDataEnrichment:
                 "tags": ["test"]
             } 
             # Get the response
-            response = requests.post(url, headers=headers, data=json.dumps(payload))
+            response = session.post(url, headers=headers, data=json.dumps(payload), timeout=REQUEST_TIMEOUT)
             self.logger.info(f"Get the metadata enrichment job response")
             response.raise_for_status()
             return response
@@ -192,10 +195,10 @@ class MetaDataEnrichment:
             status_url = f"{self.wxdi_url}/v2/jobs/{job_id}/runs?project_id={self.project_id}"
             MDE_STATES = {"Running", "Completed", "Failed", "Canceled", "Paused", "CompletedWithErrors"}
             headers = {
-                    "Authorization": f"Bearer {self.token}",
+                    "Authorization": f"Bearer {access_token()}",
                     "Content-Type": "application/json"
                 }
-            response = requests.get(status_url, headers=headers, timeout=REQUEST_TIMEOUT)
+            response = session.get(status_url, headers=headers, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             job_run_data = response.json()
             state = job_run_data['results'][0]['entity']['job_run']['state']
@@ -205,4 +208,23 @@ class MetaDataEnrichment:
                 self.logger.info(f"Job has reached terminal state: {state}")
                 return state
         except Exception as ex:
-            return { "ERROR": f"MDE job status check failed {ex}"}
\ No newline at end of file
+            return { "ERROR": f"MDE job status check failed {ex}"}
+
+    def wait_for_job(self, job_id, timeout):
+        """
+        Poll the MDE job until it reaches a terminal state or timeout seconds pass.
+        Polling starts at POLLING_INITIAL_INTERVAL and backs off to POLLING_INTERVAL,
+        so short jobs are seen finishing quickly and long ones cost few requests.
+        args: job_id(str) - Metadata Enrichment job ID, timeout(float) - seconds to wait
+        return: state (str) (last state seen) or the error returned by check_job_status
+        """
+        deadline = time.monotonic() + timeout
+        interval = POLLING_INITIAL_INTERVAL
+        while True:
+            state = self.check_job_status(job_id)
+            remaining = deadline - time.monotonic()
+            # check_job_status returns a dict when the status call itself failed
+            if isinstance(state, dict) or state in MDE_TERMINAL_STATES or remaining <= 0:
+                return state
+            time.sleep(min(interval, remaining))
+            interval = min(interval * POLLING_BACKOFF, POLLING_INTERVAL)
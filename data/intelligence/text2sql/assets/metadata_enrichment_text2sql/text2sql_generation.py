@@ -1,11 +1,10 @@
 import os
+import re
 import time
-import json
-import uuid
-import requests
-from datetime import datetime
+import threading
+from collections import OrderedDict
 from dotenv import load_dotenv
-from config import access_token
+from config import access_token, session
 from logs.logging_config import setup_logging
 
 
@@ -13,26 +12,116 @@ from logs.logging_config import setup_logging
 load_dotenv()
 
 # Logger
-logger = setup_logging()    
+logger = setup_logging()
 
 POLLING_INTERVAL = 10 # in seconds
 REQUEST_TIMEOUT = 60 # in seconds
 
+# Generated SQL cache
+CACHE_TTL = int(os.getenv('TEXT2SQL_CACHE_TTL', '3600'))  # in seconds, 0 disables the cache
+CACHE_SIZE = int(os.getenv('TEXT2SQL_CACHE_SIZE', '256'))
+
+DIALECT = "presto"
+MODEL_ID = "meta-llama/llama-3-3-70b-instruct"
+
+
+def normalize_question(question):
+    """Whitespace and trailing punctuation do not change the generated SQL.
+
+    Case is kept: quoted literals ("status = 'Shipped'") are case-sensitive.
+    """
+    return re.sub(r"\s+", " ", question).strip().rstrip("?.!").strip()
+
+
+class SQLCache:
+    """
+    LRU cache of Text2SQL responses keyed by normalized question and schema version.
+    The schema version is bumped whenever the project's metadata changes (data
+    import, onboarding, completed enrichment), which retires every earlier entry.
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.schema_version = 0
+        self._entries = OrderedDict()      # key -> (stored at, response)
+        self._inflight = {}                # key -> Event set when the first caller finishes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, project_id, question):
+        return (project_id, DIALECT, MODEL_ID, self.schema_version, normalize_question(question))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, response):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_generate(self, key, generate):
+        """Return (response, cached). Concurrent callers with the same key share one generation."""
+        while True:
+            response = self.get(key)
+            if response is not None:
+                return response, True
+            with self._lock:
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Same question already being generated: wait, then re-check (and take over if it failed)
+            waiter.wait(REQUEST_TIMEOUT)
+        try:
+            response = generate()
+            if response.get("generated_sql_queries"):
+                self.put(key, response)
+            return response, False
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def invalidate(self, reason):
+        with self._lock:
+            self.schema_version += 1
+            self._entries.clear()
+        logger.info(f"Text2SQL cache invalidated: {reason}")
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "schema_version": self.schema_version}
+
+
 class Text2SQLGeneration:
 
     def __init__(self):
         self.project_id = os.getenv('PROJECT_ID')
         self.text2sql_ob_url = os.getenv('TEXT2SQL_ONBOARD_URL')
         self.text2sql_gen_url = os.getenv('TEXT2SQL_GENERATE_URL')
-        # get access token
-        self.token = access_token()
+        self.cache = SQLCache()
         self.logger = logger
-        self.header = {
-                "Authorization": f"Bearer {self.token}",
+
+    @property
+    def header(self):
+        # access_token() is cached process-wide and refreshed before expiry
+        return {
+                "Authorization": f"Bearer {access_token()}",
                 "Content-Type": "application/json"
             }
 
-
     def onboard_text2sql_capabilities(self):
         """
             It is to onboard the text2sql capability to the watsonx.data intelligence project.
@@ -49,36 +138,63 @@ class Text2SQLGeneration:
                 ]
             }
             self.logger.info(f"Text2SQL onboarding initiated")
-            response = requests.get(self.text2sql_ob_url, headers=self.header, json=payload)
+            response = session.get(self.text2sql_ob_url, headers=self.header, json=payload, timeout=REQUEST_TIMEOUT)
             response = response.json()
+            self.cache.invalidate("project onboarded")
             self.logger.info(f"Text2SQL onboarding completed")
             return response
-        
+
         except Exception as ex:
             return {
                 "ERROR" : f"Text2SQL onboarding failed{ex}"
             }
-        
-    def generate_text2sql_content(self, text2sql_data):
+
+    def generate_text2sql_content(self, text2sql_data, use_cache=True):
         """
-            It checks the status of metadata enrichment job.
+            Generate SQL for the user's question, answering repeated questions from the cache.
             args: query(str) (User's request to create a sql command)
             return: Text2SQL_Generation (JSON) (Returns a json response with generated_sql_queries in it)
         """
         try:
-            
-            payload = {
-                "query": text2sql_data.query,
-                "raw_output": True
-                }
-            text2sql_url = f"{self.text2sql_gen_url}?container_id={self.project_id}&container_type=project&dialect=presto&model_id=meta-llama%2Fllama-3-3-70b-instruct"
-            self.logger.info(f"Text2SQL generation initiated")
-            response = requests.post(text2sql_url, headers=self.header, json=payload)
-            response = response.json()
-            self.logger.info(f"Text2SQL generation completed")
+            if not use_cache or CACHE_TTL <= 0:
+                return self._generate(text2sql_data.query)
+            key = self.cache.key(self.project_id, text2sql_data.query)
+            response, cached = self.cache.get_or_generate(key, lambda: self._generate(text2sql_data.query))
+            if cached:
+                self.logger.info(f"Text2SQL generation served from cache")
             return response
-        
+
         except Exception as ex:
             return {
                 "ERROR" : f"Text2SQL generation failed{ex}"
-            }
\ No newline at end of file
+            }
+
+    def _generate(self, query):
+        payload = {
+            "query": query,
+            "raw_output": True
+            }
+        params = {
+            "container_id": self.project_id,
+            "container_type": "project",
+            "dialect": DIALECT,
+            "model_id": MODEL_ID
+        }
+        self.logger.info(f"Text2SQL generation initiated")
+        response = session.post(self.text2sql_gen_url, headers=self.header, params=params, json=payload, timeout=REQUEST_TIMEOUT)
+        response = response.json()
+        self.logger.info(f"Text2SQL generation completed")
+        return response
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_text2sql_client():
+    """Process-wide Text2SQLGeneration, so the token, HTTP session and SQL cache are shared."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = Text2SQLGeneration()
+        return _client
@@ -100,8 +100,8 @@ def main() -> int:
     import building_blocks_mcp_remote.data_loader as dl
     import os
     local = os.environ.pop(dl.LOCAL_PATH_ENV, None)
-    real_build = dl._build_registry
-    dl._build_registry = lambda: (_ for _ in ()).throw(RuntimeError("simulated GitHub outage"))
+    real_source = dl._CatalogSource
+    dl._CatalogSource = lambda: (_ for _ in ()).throw(RuntimeError("simulated GitHub outage"))
     dl.invalidate()
     try:
         reg = dl.load_registry()
@@ -114,7 +114,7 @@ def main() -> int:
         print(f"FAIL  cold-start fallback snapshot — raised {exc}")
         FAILURES.append(f"fallback: {exc}")
     finally:
-        dl._build_registry = real_build
+        dl._CatalogSource = real_source
         dl.invalidate()
         if local:
             os.environ[dl.LOCAL_PATH_ENV] = local
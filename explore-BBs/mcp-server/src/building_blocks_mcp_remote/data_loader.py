@@ -3,7 +3,10 @@ Data loader for the marketplace MCP server.
 
 Fetches the markdown catalog from `explore-BBs/bb-catalog/` in the main
 building-blocks repo, parses YAML frontmatter, validates with pydantic, and
-caches the assembled registry in memory with a TTL.
+caches the assembled registry in memory with a TTL. Stale entries are served
+while one background thread refreshes them; a refresh only refetches files
+whose blob SHA changed, and skips the tree entirely when the branch head has
+not moved.
 
 Produces the same Python dict structures v1's `registry.py` exports
 (CORE_CAPABILITIES, GROUPS, BUILDING_BLOCKS, DOCS_PAGES) so the existing
@@ -31,6 +34,7 @@ import logging
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -42,6 +46,7 @@ from .github_client import (
     DOCS_REPO_NAME,
     REPO_NAME,
     REPO_OWNER,
+    fetch_branch_sha,
     fetch_raw_file,
     fetch_tree,
 )
@@ -60,6 +65,8 @@ REPO_BASE_URL = f"https://github.com/{REPO_OWNER}/{REPO_NAME}"
 DOCS_SITE_URL = "https://ibm-self-serve-assets.github.io/building-blocks-docs"
 
 LOADER_TTL_SECONDS = 300  # 5 minutes — see plan: "5-min cache means..."
+LOADER_RETRY_SECONDS = 30  # wait after a failed background refresh
+CATALOG_FETCH_WORKERS = 8  # concurrent raw-file fetches per build
 
 LOCAL_PATH_ENV = "BB_CATALOG_LOCAL_PATH"
 
@@ -153,31 +160,78 @@ def _local_root() -> Path | None:
     return root
 
 
-def _list_markdown_paths(subdir: str) -> list[str]:
-    """List relative markdown paths under {CATALOG_PATH}/{subdir} (e.g. 'blocks')."""
-    local = _local_root()
-    if local is not None:
-        dir_path = local / subdir
-        if not dir_path.is_dir():
-            return []
-        return sorted(f"{subdir}/{p.name}" for p in dir_path.iterdir() if p.suffix == ".md")
-    prefix = f"{CATALOG_PATH}/{subdir}/"
-    tree = fetch_tree()
-    return sorted(
-        item["path"][len(CATALOG_PATH) + 1 :]
-        for item in tree
-        if item.get("type") == "blob"
-        and item.get("path", "").startswith(prefix)
-        and item["path"].endswith(".md")
-    )
+class _CatalogSource:
+    """One consistent view of the catalog: a local directory or a GitHub commit.
+
+    In GitHub mode the branch head is resolved to a commit SHA once, and every
+    file is read at that commit, so a build never mixes two revisions. The
+    tree lists each file's blob SHA; files whose blob SHA matches the previous
+    build are reused from `_file_cache` instead of being fetched again, and the
+    rest are fetched concurrently.
+    """
 
+    def __init__(self) -> None:
+        self.local = _local_root()
+        self.ref: str | None = None if self.local is not None else fetch_branch_sha()
+        self._blob_shas: dict[str, str] | None = None
+
+    @property
+    def blob_shas(self) -> dict[str, str]:
+        """Relative markdown path -> blob SHA (tree fetched on first use)."""
+        if self._blob_shas is None:
+            prefix = f"{CATALOG_PATH}/"
+            self._blob_shas = {
+                item["path"][len(prefix):]: item.get("sha", "")
+                for item in fetch_tree(ref=self.ref)
+                if item.get("type") == "blob"
+                and item.get("path", "").startswith(prefix)
+                and item["path"].endswith(".md")
+            }
+        return self._blob_shas
+
+    def list_markdown(self, subdir: str) -> list[str]:
+        """List relative markdown paths under {CATALOG_PATH}/{subdir} (e.g. 'blocks')."""
+        if self.local is not None:
+            dir_path = self.local / subdir
+            if not dir_path.is_dir():
+                return []
+            return sorted(f"{subdir}/{p.name}" for p in dir_path.iterdir() if p.suffix == ".md")
+        return sorted(path for path in self.blob_shas if path.startswith(f"{subdir}/"))
+
+    def read_all(self, relative_paths: list[str]) -> dict[str, str]:
+        """Read markdown files by path relative to the catalog root."""
+        if self.local is not None:
+            return {path: (self.local / path).read_text(encoding="utf-8") for path in relative_paths}
+
+        contents: dict[str, str] = {}
+        missing: list[str] = []
+        with _file_cache_lock:
+            for path in relative_paths:
+                cached = _file_cache.get(path)
+                sha = self.blob_shas.get(path)
+                if cached is not None and sha and cached[0] == sha:
+                    contents[path] = cached[1]
+                else:
+                    missing.append(path)
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=CATALOG_FETCH_WORKERS) as pool:
+                fetched = pool.map(
+                    lambda path: fetch_raw_file(f"{CATALOG_PATH}/{path}", ref=self.ref), missing
+                )
+                contents.update(zip(missing, fetched))
+        logger.info(
+            "Catalog files: %d unchanged, %d fetched (commit %s)",
+            len(relative_paths) - len(missing), len(missing), (self.ref or "")[:7],
+        )
 
-def _read_markdown(relative_path: str) -> str:
-    """Read a markdown file by path relative to the catalog root."""
-    local = _local_root()
-    if local is not None:
-        return (local / relative_path).read_text(encoding="utf-8")
-    return fetch_raw_file(f"{CATALOG_PATH}/{relative_path}")
+        with _file_cache_lock:
+            for path in missing:
+                if self.blob_shas.get(path):
+                    _file_cache[path] = (self.blob_shas[path], contents[path])
+            for path in set(_file_cache) - set(self.blob_shas):
+                del _file_cache[path]
+        return contents
 
 
 # ---------------------------------------------------------------------------
@@ -190,9 +244,10 @@ def _index_by_id(items: list[dict]) -> dict[str, dict]:
     return {item["id"]: {k: v for k, v in item.items() if k != "id"} for item in items}
 
 
-def _parse_list_file(filename: str, top_key: str, schema: type[BaseModel]) -> list[dict]:
+def _parse_list_file(
+    filename: str, content: str, top_key: str, schema: type[BaseModel]
+) -> list[dict]:
     """Parse a list-style file (capabilities.md / groups.md / docs-pages.md)."""
-    content = _read_markdown(filename)
     meta = frontmatter.loads(content)
     raw_items = meta.metadata.get(top_key, [])
     validated: list[dict] = []
@@ -205,10 +260,9 @@ def _parse_list_file(filename: str, top_key: str, schema: type[BaseModel]) -> li
     return validated
 
 
-def _parse_block_files() -> dict[str, dict]:
+def _parse_block_files(contents: dict[str, str]) -> dict[str, dict]:
     blocks: dict[str, dict] = {}
-    for rel_path in _list_markdown_paths("blocks"):
-        content = _read_markdown(rel_path)
+    for rel_path, content in contents.items():
         meta = frontmatter.loads(content)
         try:
             validated = BlockSchema(**meta.metadata)
@@ -221,12 +275,11 @@ def _parse_block_files() -> dict[str, dict]:
     return blocks
 
 
-def _parse_skill_files() -> dict[str, dict]:
+def _parse_skill_files(contents: dict[str, str]) -> dict[str, dict]:
     """Parse the generated skills catalog (skills/*.md). Absence is not an
     error — an older catalog checkout may predate the skills layer."""
     skills: dict[str, dict] = {}
-    for rel_path in _list_markdown_paths("skills"):
-        content = _read_markdown(rel_path)
+    for rel_path, content in contents.items():
         meta = frontmatter.loads(content)
         try:
             validated = SkillSchema(**meta.metadata)
@@ -239,15 +292,23 @@ def _parse_skill_files() -> dict[str, dict]:
     return skills
 
 
-def _build_registry() -> dict[str, Any]:
+def _build_registry(source: _CatalogSource) -> dict[str, Any]:
     """Fetch and parse the full catalog. Returns the assembled registry dicts."""
-    source = "local disk" if _local_root() else "GitHub"
-    logger.info("Loading catalog from %s...", source)
-    capabilities = _parse_list_file("capabilities.md", "capabilities", CapabilitySchema)
-    groups = _parse_list_file("groups.md", "groups", GroupSchema)
-    docs_pages = _parse_list_file("docs-pages.md", "pages", DocsPageSchema)
-    blocks = _parse_block_files()
-    skills = _parse_skill_files()
+    logger.info("Loading catalog from %s...", "local disk" if source.local else "GitHub")
+    block_paths = source.list_markdown("blocks")
+    skill_paths = source.list_markdown("skills")
+    list_files = ["capabilities.md", "groups.md", "docs-pages.md"]
+    contents = source.read_all(list_files + block_paths + skill_paths)
+
+    capabilities = _parse_list_file(
+        "capabilities.md", contents["capabilities.md"], "capabilities", CapabilitySchema
+    )
+    groups = _parse_list_file("groups.md", contents["groups.md"], "groups", GroupSchema)
+    docs_pages = _parse_list_file(
+        "docs-pages.md", contents["docs-pages.md"], "pages", DocsPageSchema
+    )
+    blocks = _parse_block_files({p: contents[p] for p in block_paths})
+    skills = _parse_skill_files({p: contents[p] for p in skill_paths})
     logger.info(
         "Loaded %d capabilities, %d groups, %d blocks, %d docs pages, %d skills",
         len(capabilities),
@@ -276,34 +337,87 @@ def _load_snapshot() -> dict[str, Any]:
 # Cache and public API
 # ---------------------------------------------------------------------------
 
-_lock = threading.Lock()
+_lock = threading.Lock()          # guards the cache globals below
+_build_lock = threading.Lock()    # one catalog build at a time
 _cache: dict[str, Any] = {}
 _cache_ts: float = 0.0
+_cache_ref: str | None = None     # commit the cached registry was built from
+_refreshing = False
+_retry_at: float = 0.0
+
+# Catalog file contents by relative path, with the blob SHA they were read at
+_file_cache: dict[str, tuple[str, str]] = {}
+_file_cache_lock = threading.Lock()
+
+
+def _is_fresh() -> bool:
+    return bool(_cache) and (time.monotonic() - _cache_ts) < LOADER_TTL_SECONDS
+
+
+def _rebuild(force: bool = False) -> dict[str, Any]:
+    """Build the registry and install it as the cache (one build at a time)."""
+    global _cache, _cache_ts, _cache_ref
+    with _build_lock:
+        with _lock:
+            # Another caller may have finished a build while we waited
+            if not force and _is_fresh():
+                return _cache
+            previous, previous_ref = _cache, _cache_ref
+        source = _CatalogSource()
+        if previous and source.ref is not None and source.ref == previous_ref:
+            registry = previous   # branch head unchanged: nothing to refetch
+        else:
+            registry = _build_registry(source)
+        with _lock:
+            _cache, _cache_ts, _cache_ref = registry, time.monotonic(), source.ref
+        return registry
+
+
+def _background_refresh() -> None:
+    global _refreshing, _retry_at
+    try:
+        _rebuild()
+    except Exception as exc:
+        logger.error("Catalog refresh failed (%s) — serving STALE cached catalog", exc)
+        with _lock:
+            _retry_at = time.monotonic() + LOADER_RETRY_SECONDS
+    finally:
+        with _lock:
+            _refreshing = False
 
 
 def load_registry(force: bool = False) -> dict[str, Any]:
     """Return the parsed catalog, fetching from source if cache is stale.
 
-    Thread-safe. In local-disk mode the cache is bypassed so edits are picked up
-    immediately (TTL-based caching only applies to GitHub fetches).
+    Thread-safe, stale-while-revalidate: once a catalog is cached, callers
+    always get it immediately; when it is older than the TTL, a single
+    background thread refreshes it. Only a cold start (or `force=True`) waits
+    for the build. In local-disk mode the cache is bypassed so edits are
+    picked up immediately (TTL-based caching only applies to GitHub fetches).
     """
-    global _cache, _cache_ts
+    global _cache, _cache_ts, _refreshing
     if _local_root() is not None:
         # Local development: always re-read so file edits show up instantly.
-        return _build_registry()
+        return _build_registry(_CatalogSource())
 
     with _lock:
-        fresh = _cache and (time.monotonic() - _cache_ts) < LOADER_TTL_SECONDS
-        if not force and fresh:
+        if not force and _is_fresh():
             return _cache
-        try:
-            _cache = _build_registry()
-            _cache_ts = time.monotonic()
+        if not force and _cache:
+            if not _refreshing and time.monotonic() >= _retry_at:
+                _refreshing = True
+                threading.Thread(
+                    target=_background_refresh, name="catalog-refresh", daemon=True
+                ).start()
             return _cache
-        except Exception as exc:
-            # Degrade gracefully: stale in-memory cache first, then the
-            # bundled snapshot. A cold start with GitHub unreachable must
-            # never leave the server with no catalog at all.
+
+    try:
+        return _rebuild(force=force)
+    except Exception as exc:
+        # Degrade gracefully: stale in-memory cache first, then the
+        # bundled snapshot. A cold start with GitHub unreachable must
+        # never leave the server with no catalog at all.
+        with _lock:
             if _cache:
                 logger.error(
                     "Catalog refresh failed (%s) — serving STALE cached catalog", exc
@@ -315,17 +429,21 @@ def load_registry(force: bool = False) -> dict[str, Any]:
                     "FALLBACK SNAPSHOT; data may be outdated", exc
                 )
                 _cache = _load_snapshot()
-                _cache_ts = 0.0  # never counts as fresh; retry upstream next call
+                _cache_ts = 0.0  # never counts as fresh; refreshed in the background
                 return _cache
-            raise
+        raise
 
 
 def invalidate() -> None:
-    """Force the next load_registry() call to re-fetch from source."""
-    global _cache, _cache_ts
+    """Force the next load_registry() call to re-fetch from source.
+
+    Files whose blob SHA is unchanged are still reused (same SHA, same bytes).
+    """
+    global _cache, _cache_ts, _cache_ref
     with _lock:
         _cache = {}
         _cache_ts = 0.0
+        _cache_ref = None
     logger.info("Catalog cache invalidated")
 
 
@@ -24,6 +24,18 @@ Every response from api.github.com logs the rate-limit headers
 (X-RateLimit-Resource, X-RateLimit-Remaining, X-RateLimit-Limit) at INFO level
 so you can wire a dashboard or alert on remaining budget.
 
+HTTP cache
+----------
+Responses are kept in an in-process LRU (CACHE_MAX_ENTRIES) with a TTL per
+kind of call (raw files and contents 5 min, trees 10 min, search 2 min).
+Entries keep the response ETag: once an entry expires it is revalidated with
+If-None-Match, and a 304 (free against the core rate limit) extends it.
+
+Set BB_GITHUB_CACHE_PATH to a file path to back the LRU with SQLite, so
+cached bodies and ETags survive restarts and can be shared by pods on the
+same volume. Cache hits / misses / revalidations are appended to the
+rate-limit log line and available from cache_stats().
+
 Server-wide budget for code search
 ----------------------------------
 GitHub's search API enforces a hard 30/min cap, separate from the 5K/hr core
@@ -35,10 +47,13 @@ returns an explicit error instead of letting GitHub return 403.
 from __future__ import annotations
 
 import base64
+import json
 import logging
 import os
+import sqlite3
 import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any, Optional
 
@@ -62,8 +77,13 @@ USER_AGENT = "building-blocks-mcp-remote-marketplace/0.3.0"
 CACHE_TTL_DEFAULT = 300   # 5 minutes
 CACHE_TTL_TREE = 600      # 10 minutes
 CACHE_TTL_SEARCH = 120    # 2 minutes
+CACHE_TTL_HEAD = 0        # branch heads: always revalidate (304s are free)
 CACHE_MAX_ENTRIES = 500
 
+# Optional persistent store for the HTTP cache (unset = memory only)
+CACHE_PATH_ENV = "BB_GITHUB_CACHE_PATH"
+CACHE_DISK_MAX_AGE = 7 * 24 * 3600   # rows older than this are pruned on open
+
 # Server-wide search budget (GitHub hard cap is 30/min; we stay at 25 to leave headroom)
 SEARCH_BUDGET_MAX = 25
 SEARCH_BUDGET_REFILL_PER_SEC = 25 / 60.0
@@ -71,8 +91,6 @@ SEARCH_BUDGET_REFILL_PER_SEC = 25 / 60.0
 # Installation token refresh: refresh when within this many seconds of expiry
 TOKEN_REFRESH_BUFFER = 60
 
-_cache: dict[str, tuple[float, Any]] = {}
-_cache_lock = threading.Lock()
 
 
 # ---------------------------------------------------------------------------
@@ -255,8 +273,7 @@ def reset_client() -> None:
         _client = None
     with _auth_state_lock:
         _auth_state = None
-    with _cache_lock:
-        _cache.clear()
+    _cache.clear()
 
 
 # ---------------------------------------------------------------------------
@@ -276,53 +293,181 @@ def _api_get(url: str, **kwargs):
     # Structured rate-limit observability — emit even on 4xx so dashboards see throttling.
     remaining = resp.headers.get("X-RateLimit-Remaining")
     if remaining is not None:
+        stats = _cache.stats
         logger.info(
-            "github_api resource=%s remaining=%s/%s status=%d url=%s",
+            "github_api resource=%s remaining=%s/%s status=%d url=%s "
+            "cache_hits=%d cache_misses=%d cache_revalidated=%d",
             resp.headers.get("X-RateLimit-Resource", "core"),
             remaining,
             resp.headers.get("X-RateLimit-Limit", "?"),
             resp.status_code,
             url,
+            stats["hits"],
+            stats["misses"],
+            stats["revalidated"],
         )
     return resp
 
 
 # ---------------------------------------------------------------------------
-# Caching helpers (unchanged)
+# HTTP cache: O(1) LRU with per-call TTL + ETags, optionally persisted
 # ---------------------------------------------------------------------------
 
 
-def _cache_get(key: str) -> Any | None:
-    with _cache_lock:
-        entry = _cache.get(key)
-        if entry is None:
-            return None
-        ts, val = entry
-        if time.monotonic() - ts > CACHE_TTL_DEFAULT:
-            del _cache[key]
-            return None
-        return val
+class _HttpCache:
+    """LRU of parsed response values keyed by call, with the response ETag.
 
+    `lookup()` takes the TTL of the caller's class of request. Expired entries
+    that carry an ETag are kept so the caller can revalidate them; `touch()`
+    records a 304 and `store()` a fresh 200. With a `path`, every entry is
+    written through to SQLite and memory misses fall back to it.
+    """
 
-def _cache_get_with_ttl(key: str, ttl: float) -> Any | None:
-    with _cache_lock:
-        entry = _cache.get(key)
-        if entry is None:
+    def __init__(self, max_entries: int, path: Optional[str] = None) -> None:
+        self.max_entries = max_entries
+        self.path = path
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "disk_hits": 0, "evictions": 0}
+        # key -> (stored_at wall-clock, value, etag)
+        self._entries: OrderedDict[str, tuple[float, Any, Optional[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_opened = False
+
+    # -- persistent store ----------------------------------------------------
+
+    def _open_db(self) -> Optional[sqlite3.Connection]:
+        if self._db_opened:
+            return self._db
+        self._db_opened = True
+        if not self.path:
             return None
-        ts, val = entry
-        if time.monotonic() - ts > ttl:
-            del _cache[key]
+        try:
+            db = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS http_cache ("
+                "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, etag TEXT, value TEXT NOT NULL)"
+            )
+            db.execute("DELETE FROM http_cache WHERE stored_at < ?", (time.time() - CACHE_DISK_MAX_AGE,))
+            self._db = db
+            logger.info("GitHub HTTP cache persisted at %s", self.path)
+        except sqlite3.Error as exc:
+            logger.warning("GitHub HTTP cache: cannot open %s (%s); memory only", self.path, exc)
+        return self._db
+
+    def _disk(self, sql: str, args: tuple) -> Optional[tuple]:
+        db = self._open_db()
+        if db is None:
+            return None
+        try:
+            return db.execute(sql, args).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("GitHub HTTP cache: disk access failed (%s); memory only", exc)
+            self._db = None
             return None
-        return val
 
+    # -- LRU -----------------------------------------------------------------
+
+    def _put(self, key: str, entry: tuple[float, Any, Optional[str]]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def lookup(self, key: str, ttl: float) -> tuple[Any, Optional[str], bool]:
+        """Return (value, etag, fresh). `value` is None when there is nothing usable."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            else:
+                row = self._disk("SELECT stored_at, etag, value FROM http_cache WHERE key = ?", (key,))
+                if row is not None:
+                    entry = (row[0], json.loads(row[2]), row[1])
+                    self.stats["disk_hits"] += 1
+                    self._put(key, entry)
+            if entry is None:
+                return None, None, False
+            stored_at, value, etag = entry
+            if time.time() - stored_at <= ttl:
+                self.stats["hits"] += 1
+                return value, etag, True
+            if etag is None:
+                del self._entries[key]
+                return None, None, False
+            return value, etag, False
+
+    def store(self, key: str, value: Any, etag: Optional[str] = None) -> None:
+        """Record a value fetched from GitHub (counted as a miss)."""
+        now = time.time()
+        with self._lock:
+            self.stats["misses"] += 1
+            self._put(key, (now, value, etag))
+            self._disk(
+                "INSERT OR REPLACE INTO http_cache (key, stored_at, etag, value) VALUES (?, ?, ?, ?)",
+                (key, now, etag, json.dumps(value)),
+            )
 
-def _cache_set(key: str, value: Any) -> None:
-    with _cache_lock:
-        if len(_cache) >= CACHE_MAX_ENTRIES:
-            sorted_keys = sorted(_cache, key=lambda k: _cache[k][0])
-            for k in sorted_keys[:100]:
-                del _cache[k]
-        _cache[key] = (time.monotonic(), value)
+    def touch(self, key: str) -> None:
+        """Record a 304: the cached value is current again."""
+        now = time.time()
+        with self._lock:
+            self.stats["revalidated"] += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._put(key, (now, entry[1], entry[2]))
+            self._disk("UPDATE http_cache SET stored_at = ? WHERE key = ?", (now, key))
+
+    def clear(self) -> None:
+        """Drop in-memory entries and counters; reopen the store on next use."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = dict.fromkeys(self.stats, 0)
+            if self._db is not None:
+                self._db.close()
+            self._db, self._db_opened = None, False
+            self.path = os.environ.get(CACHE_PATH_ENV) or None
+
+
+_cache = _HttpCache(CACHE_MAX_ENTRIES, os.environ.get(CACHE_PATH_ENV) or None)
+
+
+def cache_stats() -> dict[str, int]:
+    """Counters of the HTTP cache since start (or the last reset_client())."""
+    with _cache._lock:
+        return {**_cache.stats, "entries": len(_cache._entries)}
+
+
+def _cached_get(
+    cache_key: str,
+    ttl: float,
+    url: str,
+    parse,
+    *,
+    api: bool = True,
+    headers: Optional[dict] = None,
+    params: Optional[dict] = None,
+) -> Any:
+    """GET through the HTTP cache, revalidating expired entries by ETag."""
+    value, etag, fresh = _cache.lookup(cache_key, ttl)
+    if fresh:
+        return value
+
+    headers = dict(headers or {})
+    if etag:
+        headers["If-None-Match"] = etag
+    if api:
+        resp = _api_get(url, headers=headers, params=params)
+    else:
+        resp = _get_client().get(url, headers=headers, params=params)
+    if resp.status_code == 304 and value is not None:
+        _cache.touch(cache_key)
+        return value
+    resp.raise_for_status()
+    value = parse(resp)
+    _cache.store(cache_key, value, resp.headers.get("ETag"))
+    return value
 
 
 # ---------------------------------------------------------------------------
@@ -330,40 +475,24 @@ def _cache_set(key: str, value: Any) -> None:
 # ---------------------------------------------------------------------------
 
 
-def fetch_raw_file(path: str, repo: str = REPO_NAME) -> str:
+def fetch_raw_file(path: str, repo: str = REPO_NAME, ref: str = DEFAULT_BRANCH) -> str:
     """Fetch raw file content from raw.githubusercontent.com.
 
     Public repos: no auth required, served via CDN, does NOT count against the
     GitHub API rate limit. The vast majority of MCP traffic flows through here.
+    Pass a commit SHA as `ref` to read an immutable revision of the file.
     """
-    cache_key = f"raw:{repo}:{path}"
-    cached = _cache_get(cache_key)
-    if cached is not None:
-        return cached
-
-    url = f"{RAW_BASE}/{REPO_OWNER}/{repo}/{DEFAULT_BRANCH}/{path}"
-    client = _get_client()
-    resp = client.get(url)
-    resp.raise_for_status()
-    content = resp.text
-    _cache_set(cache_key, content)
-    return content
+    url = f"{RAW_BASE}/{REPO_OWNER}/{repo}/{ref}/{path}"
+    return _cached_get(f"raw:{repo}:{ref}:{path}", CACHE_TTL_DEFAULT, url, lambda r: r.text, api=False)
 
 
 def fetch_contents(path: str, repo: str = REPO_NAME) -> list[dict] | dict:
     """Fetch directory listing or file metadata via GitHub Contents API."""
-    cache_key = f"contents:{repo}:{path}"
-    cached = _cache_get(cache_key)
-    if cached is not None:
-        return cached
-
-    url = f"{API_BASE}/repos/{REPO_OWNER}/{repo}/contents/{path}?ref={DEFAULT_BRANCH}"
-    resp = _api_get(url)
-    resp.raise_for_status()
-    data = resp.json()
-
-    if isinstance(data, list):
-        result = [
+    def parse(resp) -> list[dict] | dict:
+        data = resp.json()
+        if not isinstance(data, list):
+            return data
+        return [
             {
                 "name": item["name"],
                 "type": item["type"],
@@ -373,26 +502,37 @@ def fetch_contents(path: str, repo: str = REPO_NAME) -> list[dict] | dict:
             }
             for item in data
         ]
-    else:
-        result = data
 
-    _cache_set(cache_key, result)
-    return result
+    url = f"{API_BASE}/repos/{REPO_OWNER}/{repo}/contents/{path}?ref={DEFAULT_BRANCH}"
+    return _cached_get(f"contents:{repo}:{path}", CACHE_TTL_DEFAULT, url, parse)
 
 
-def fetch_tree(repo: str = REPO_NAME) -> list[dict]:
-    """Fetch the full recursive tree for a repo (single API call). Cached 10 min."""
-    cache_key = f"tree:{repo}"
-    cached = _cache_get_with_ttl(cache_key, CACHE_TTL_TREE)
-    if cached is not None:
-        return cached
+def fetch_branch_sha(repo: str = REPO_NAME, branch: str = DEFAULT_BRANCH) -> str:
+    """Return the head commit SHA of a branch.
 
-    url = f"{API_BASE}/repos/{REPO_OWNER}/{repo}/git/trees/{DEFAULT_BRANCH}?recursive=1"
-    resp = _api_get(url)
-    resp.raise_for_status()
-    tree = resp.json().get("tree", [])
-    _cache_set(cache_key, tree)
-    return tree
+    Uses a conditional request (If-None-Match with the last ETag), so an
+    unchanged branch costs a 304 response, which GitHub does not count against
+    the rate limit for authenticated calls. Always revalidated: callers use
+    it to decide whether anything needs refetching.
+    """
+    url = f"{API_BASE}/repos/{REPO_OWNER}/{repo}/commits/{branch}"
+    return _cached_get(
+        f"head:{repo}:{branch}",
+        CACHE_TTL_HEAD,
+        url,
+        lambda r: r.text.strip(),
+        headers={"Accept": "application/vnd.github.sha"},
+    )
+
+
+def fetch_tree(repo: str = REPO_NAME, ref: str = DEFAULT_BRANCH) -> list[dict]:
+    """Fetch the full recursive tree for a repo (single API call). Cached 10 min.
+
+    Each blob entry carries its git blob `sha`, which changes exactly when the
+    file content changes.
+    """
+    url = f"{API_BASE}/repos/{REPO_OWNER}/{repo}/git/trees/{ref}?recursive=1"
+    return _cached_get(f"tree:{repo}:{ref}", CACHE_TTL_TREE, url, lambda r: r.json().get("tree", []))
 
 
 class SearchBudgetExceeded(RuntimeError):
@@ -412,8 +552,8 @@ def search_code(query: str, repo: str = REPO_NAME) -> list[dict]:
     25/min raise SearchBudgetExceeded.
     """
     cache_key = f"search:{repo}:{query}"
-    cached = _cache_get_with_ttl(cache_key, CACHE_TTL_SEARCH)
-    if cached is not None:
+    cached, _, fresh = _cache.lookup(cache_key, CACHE_TTL_SEARCH)
+    if fresh:
         return cached
 
     if not _search_budget.take():
@@ -435,5 +575,5 @@ def search_code(query: str, repo: str = REPO_NAME) -> list[dict]:
         }
         for item in items
     ]
-    _cache_set(cache_key, result)
+    _cache.store(cache_key, result)
     return result
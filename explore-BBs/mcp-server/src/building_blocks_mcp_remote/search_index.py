@@ -0,0 +1,330 @@
+"""
+Ranked full-text search over the catalog (blocks + docs pages).
+
+One inverted index per process, built from the registry returned by
+`data_loader.load_registry()`. When the loader installs a new registry, the
+index is updated incrementally: only documents whose indexed fields changed
+are re-tokenized.
+
+Ranking is BM25F: per-field term frequencies are length-normalized, weighted
+by a field boost (name > tags > products > description), summed, then passed
+through BM25 saturation and multiplied by the term's IDF. Query terms are
+stemmed the same way as documents; a term with no exact match falls back to
+prefix matches ("terra" -> "terraform") and then to fuzzy matches within a
+small edit distance ("guardrials" -> "guardrail"), each at a discount.
+
+Public API
+----------
+    search(registry, query, kinds=("building_block", "docs_page"), limit=None) -> list[dict]
+
+Thread-safe.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import logging
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from .data_loader import DOCS_SITE_URL, REPO_BASE_URL
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Field boosts per document kind. Field order is the posting tuple order.
+FIELD_BOOSTS: dict[str, dict[str, float]] = {
+    "building_block": {"name": 3.0, "tags": 2.0, "products": 1.5, "description": 1.0},
+    "docs_page": {"title": 3.0, "section": 1.0},
+}
+
+PREFIX_DISCOUNT = 0.6      # weight of a prefix expansion vs an exact term
+FUZZY_DISCOUNT = 0.4       # weight of an edit-distance match
+PREFIX_MIN_LENGTH = 3      # shorter query terms only match exactly
+MAX_EXPANSIONS = 10        # prefix / fuzzy terms considered per query term
+PHRASE_BOOST = 1.5         # multi-word query found verbatim in a field
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from how i in is it of on or the to with".split()
+)
+
+
+# ---------------------------------------------------------------------------
+# Tokenization
+# ---------------------------------------------------------------------------
+
+
+def _stem(token: str) -> str:
+    """Light suffix stripping (plural / -ing / -ed / -ly), enough for catalog text.
+
+    Deliberately conservative: it only has to map the same word in a query and
+    a document to the same key, not produce dictionary roots.
+    """
+    if len(token) <= 3 or token.isdigit():
+        return token
+    for suffix, replacement in (
+        ("ies", "y"), ("sses", "ss"), ("ing", ""), ("ed", ""), ("ly", ""), ("es", ""), ("s", ""),
+    ):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == "s" and token.endswith("ss"):
+                return token
+            if suffix == "es" and not token.endswith(("ches", "shes", "xes", "zes", "sses")):
+                continue
+            return token[: -len(suffix)] + replacement
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords, stem."""
+    return [_stem(t) for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _edit_distance_at_most(a: str, b: str, limit: int) -> bool:
+    """True if the Levenshtein distance between a and b is <= limit."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+# ---------------------------------------------------------------------------
+# Documents
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Document:
+    key: str
+    kind: str
+    fields: dict[str, str]
+    payload: dict[str, Any]
+    signature: str = ""
+    lengths: tuple[int, ...] = ()
+    phrase_text: str = ""
+
+
+def _documents(registry: dict[str, Any]) -> Iterable[_Document]:
+    for bid, block in registry.get("BUILDING_BLOCKS", {}).items():
+        yield _Document(
+            key=f"block:{bid}",
+            kind="building_block",
+            fields={
+                "name": block["name"],
+                "tags": " ".join(block.get("tags", [])),
+                "products": " ".join(block.get("products", [])),
+                "description": block["description"],
+            },
+            payload={
+                "type": "building_block",
+                "id": bid,
+                "title": block["name"],
+                "description": block["description"],
+                "group": block["group"],
+                "url": f"{REPO_BASE_URL}/tree/main/{block['repo_path']}",
+            },
+        )
+    for page in registry.get("DOCS_PAGES", []):
+        yield _Document(
+            key=f"docs:{page['path']}",
+            kind="docs_page",
+            fields={"title": page["title"], "section": page["section"]},
+            payload={
+                "type": "docs_page",
+                "title": page["title"],
+                "section": page["section"],
+                "path": page["path"],
+                "url": f"{DOCS_SITE_URL}/{page['path'].replace('.md', '/')}",
+            },
+        )
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SearchIndex:
+    """Inverted index: term -> {document key: per-field term counts}."""
+
+    documents: dict[str, _Document] = field(default_factory=dict)
+    postings: dict[str, dict[str, tuple[int, ...]]] = field(default_factory=dict)
+    vocabulary: list[str] = field(default_factory=list)   # sorted, for prefix lookup
+    # kind -> per-field total token count (for average field lengths)
+    _length_totals: dict[str, list[int]] = field(default_factory=dict)
+    _kind_counts: dict[str, int] = field(default_factory=dict)
+
+    def update(self, documents: Iterable[_Document]) -> tuple[int, int]:
+        """Bring the index in line with *documents*; return (reindexed, removed)."""
+        incoming: dict[str, _Document] = {}
+        for doc in documents:
+            doc.signature = hashlib.sha1(
+                "\x1f".join(doc.fields.values()).encode("utf-8")
+            ).hexdigest()
+            incoming[doc.key] = doc
+
+        removed = [k for k in self.documents if k not in incoming]
+        changed = [
+            d for k, d in incoming.items()
+            if k not in self.documents or self.documents[k].signature != d.signature
+        ]
+        for key in removed + [d.key for d in changed if d.key in self.documents]:
+            self._remove(self.documents.pop(key))
+        for doc in changed:
+            self._add(doc)
+        # Unchanged documents keep their postings but pick up the new payload
+        for key, doc in incoming.items():
+            self.documents[key].payload = doc.payload
+        if changed or removed:
+            self.vocabulary = sorted(self.postings)
+        return len(changed), len(removed)
+
+    def _add(self, doc: _Document) -> None:
+        field_names = list(FIELD_BOOSTS[doc.kind])
+        counts: dict[str, list[int]] = {}
+        lengths = []
+        for i, name in enumerate(field_names):
+            tokens = tokenize(doc.fields.get(name, ""))
+            lengths.append(len(tokens))
+            for token in tokens:
+                counts.setdefault(token, [0] * len(field_names))[i] += 1
+        doc.lengths = tuple(lengths)
+        doc.phrase_text = " ".join(" ".join(tokenize(v)) for v in doc.fields.values())
+        for token, per_field in counts.items():
+            self.postings.setdefault(token, {})[doc.key] = tuple(per_field)
+        totals = self._length_totals.setdefault(doc.kind, [0] * len(field_names))
+        for i, n in enumerate(lengths):
+            totals[i] += n
+        self._kind_counts[doc.kind] = self._kind_counts.get(doc.kind, 0) + 1
+        self.documents[doc.key] = doc
+
+    def _remove(self, doc: _Document) -> None:
+        for token in set(tokenize(" ".join(doc.fields.values()))):
+            docs = self.postings.get(token)
+            if docs is not None:
+                docs.pop(doc.key, None)
+                if not docs:
+                    del self.postings[token]
+        totals = self._length_totals[doc.kind]
+        for i, n in enumerate(doc.lengths):
+            totals[i] -= n
+        self._kind_counts[doc.kind] -= 1
+
+    # -- querying ----------------------------------------------------------
+
+    def _expand(self, term: str) -> list[tuple[str, float]]:
+        """Index terms matching a query term, with their weights."""
+        if term in self.postings:
+            return [(term, 1.0)]
+        matches: list[tuple[str, float]] = []
+        if len(term) >= PREFIX_MIN_LENGTH:
+            i = bisect.bisect_left(self.vocabulary, term)
+            while (
+                i < len(self.vocabulary)
+                and self.vocabulary[i].startswith(term)
+                and len(matches) < MAX_EXPANSIONS
+            ):
+                matches.append((self.vocabulary[i], PREFIX_DISCOUNT))
+                i += 1
+        if not matches and len(term) >= 4:
+            limit = 1 if len(term) < 8 else 2
+            for candidate in self.vocabulary:
+                if _edit_distance_at_most(term, candidate, limit):
+                    matches.append((candidate, FUZZY_DISCOUNT))
+                    if len(matches) >= MAX_EXPANSIONS:
+                        break
+        return matches
+
+    def search(self, query: str, kinds: Iterable[str]) -> list[tuple[float, _Document]]:
+        kinds = set(kinds)
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        total_docs = max(len(self.documents), 1)
+        avg_lengths = {
+            kind: [t / max(self._kind_counts.get(kind, 0), 1) or 1.0 for t in totals]
+            for kind, totals in self._length_totals.items()
+        }
+
+        scores: dict[str, float] = {}
+        for term in terms:
+            for index_term, weight in self._expand(term):
+                docs = self.postings[index_term]
+                idf = math.log(1 + (total_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                for key, per_field in docs.items():
+                    doc = self.documents[key]
+                    if doc.kind not in kinds:
+                        continue
+                    boosts = FIELD_BOOSTS[doc.kind].values()
+                    avg = avg_lengths[doc.kind]
+                    tf = sum(
+                        boost * count / (1 - BM25_B + BM25_B * doc.lengths[i] / avg[i])
+                        for i, (boost, count) in enumerate(zip(boosts, per_field))
+                        if count
+                    )
+                    scores[key] = scores.get(key, 0.0) + weight * idf * tf * (BM25_K1 + 1) / (tf + BM25_K1)
+
+        phrase = " ".join(terms) if len(terms) > 1 else ""
+        ranked = []
+        for key, value in scores.items():
+            doc = self.documents[key]
+            if phrase and phrase in doc.phrase_text:
+                value *= PHRASE_BOOST
+            ranked.append((value, doc))
+        ranked.sort(key=lambda item: (-item[0], item[1].key))
+        return ranked
+
+
+# ---------------------------------------------------------------------------
+# Process-wide index, refreshed with the registry
+# ---------------------------------------------------------------------------
+
+_index = SearchIndex()
+_indexed_registry: dict[str, Any] | None = None
+_index_lock = threading.Lock()
+
+
+def _index_for(registry: dict[str, Any]) -> SearchIndex:
+    global _indexed_registry
+    with _index_lock:
+        # load_registry() returns the same dict until the loader installs a new one
+        if registry is not _indexed_registry:
+            reindexed, removed = _index.update(_documents(registry))
+            _indexed_registry = registry
+            logger.info(
+                "Search index updated: %d reindexed, %d removed, %d documents, %d terms",
+                reindexed, removed, len(_index.documents), len(_index.postings),
+            )
+        return _index
+
+
+def search(
+    registry: dict[str, Any],
+    query: str,
+    kinds: Iterable[str] = ("building_block", "docs_page"),
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """Rank catalog documents of the given kinds for *query*.
+
+    Returns result payloads (best first), each with a `score` field.
+    """
+    index = _index_for(registry)
+    with _index_lock:
+        ranked = index.search(query, kinds)
+        results = [{**doc.payload, "score": round(score, 3)} for score, doc in ranked]
+    return results[:limit] if limit else results
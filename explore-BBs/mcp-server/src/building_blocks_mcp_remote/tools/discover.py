@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
+from building_blocks_mcp_remote import search_index
 from building_blocks_mcp_remote.data_loader import (
     DOCS_SITE_URL,
     REPO_BASE_URL,
@@ -82,10 +83,14 @@ def list_building_blocks(
 def search_building_blocks(
     query: str,
     scope: str = "all",
+    include_code: bool = False,
 ) -> dict:
     """Search across IBM Building Blocks documentation and code.
 
-    Searches names, descriptions, docs page titles, and optionally code files.
+    Searches names, tags, products, descriptions, docs page titles, and
+    optionally code files. Results are ranked by relevance (BM25 over an
+    inverted index; name matches weigh more than tags, tags more than
+    descriptions). Partial words and small typos still match, at a lower score.
 
     Args:
         query: Search query string. Examples: "RAG pipeline", "Terraform", "multi-agent".
@@ -94,61 +99,29 @@ def search_building_blocks(
             - "registry" : only block names/descriptions (no API call)
             - "docs"     : docs page titles and sections
             - "code"     : code files in the repo (requires GITHUB_TOKEN)
+        include_code: With scope "all", also append code file matches
+            (requires GITHUB_TOKEN). Code search failures do not fail the call.
     """
     try:
         reg = load_registry()
-        blocks = reg["BUILDING_BLOCKS"]
-        docs_pages = reg["DOCS_PAGES"]
-
-        # Token-based matching: a multi-word query matches if ANY word hits,
-        # ranked by how many words hit (exact-phrase matches rank highest).
-        # Literal substring-only matching made e.g. "RAG agent guardrails"
-        # return zero results even though three blocks matched individually.
-        query_lower = query.lower()
-        tokens = query_lower.split()
-
-        def score(searchable: str) -> int:
-            s = sum(1 for t in tokens if t in searchable)
-            if len(tokens) > 1 and query_lower in searchable:
-                s += len(tokens)  # phrase match beats scattered words
-            return s
-
-        scored: list[tuple[int, dict]] = []
 
+        kinds = []
         if scope in ("all", "registry"):
-            for bid, block in blocks.items():
-                searchable = (
-                    f"{block['name']} {block['description']} "
-                    f"{' '.join(block['tags'])} {' '.join(block['products'])}"
-                ).lower()
-                if (s := score(searchable)):
-                    scored.append((s, {
-                        "type": "building_block",
-                        "id": bid,
-                        "title": block["name"],
-                        "description": block["description"],
-                        "group": block["group"],
-                        "url": f"{REPO_BASE_URL}/tree/main/{block['repo_path']}",
-                    }))
-
+            kinds.append("building_block")
         if scope in ("all", "docs"):
-            for page in docs_pages:
-                searchable = f"{page['title']} {page['section']}".lower()
-                if (s := score(searchable)):
-                    scored.append((s, {
-                        "type": "docs_page",
-                        "title": page["title"],
-                        "section": page["section"],
-                        "path": page["path"],
-                        "url": f"{DOCS_SITE_URL}/{page['path'].replace('.md', '/')}",
-                    }))
-
-        scored.sort(key=lambda x: -x[0])
-        results = [r for _, r in scored]
-
-        if scope == "code":
+            kinds.append("docs_page")
+        results = search_index.search(reg, query, kinds) if kinds else []
+
+        code_error = None
+        if scope == "code" or (scope == "all" and include_code):
             from building_blocks_mcp_remote.github_client import search_code
-            code_results = search_code(query)
+            try:
+                code_results = search_code(query)
+            except Exception as exc:
+                if scope == "code":
+                    raise
+                logger.warning("search_building_blocks: code search failed: %s", exc)
+                code_results, code_error = [], str(exc)
             for item in code_results:
                 results.append({
                     "type": "code_file",
@@ -157,13 +130,16 @@ def search_building_blocks(
                     "url": item["html_url"],
                 })
 
-        return {
+        response = {
             "status": "success",
             "query": query,
             "scope": scope,
             "total": len(results),
             "results": results,
         }
+        if code_error:
+            response["code_error"] = code_error
+        return response
     except Exception as exc:
         logger.error("search_building_blocks failed: %s", exc, exc_info=True)
         return {"status": "error", "error": str(exc)}
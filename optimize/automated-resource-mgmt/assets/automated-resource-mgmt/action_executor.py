@@ -0,0 +1,272 @@
+"""
+Bulk Action Executor
+====================
+Executes approved Turbonomic actions in the background so a Dash callback
+only has to submit the batch and return a job id; the UI then polls the job
+for incremental progress.
+
+- A single shared worker pool bounds how many actions are in flight across
+  all jobs (EXECUTE_CONCURRENCY).
+- Actions on the same target cluster are additionally limited to
+  PER_CLUSTER_CONCURRENCY at a time. Each cluster has its own queue and an
+  action only reaches the pool once it holds a cluster slot, so workers
+  never sit waiting on a busy cluster; each job is interleaved across
+  clusters so one busy cluster does not hold up the rest.
+- Executing an action is not idempotent, so it is only sent again when the
+  first request provably never reached Turbonomic (connection could not be
+  opened, 429 / 503). After a read timeout, dropped connection or 502 / 504
+  the action's state is checked instead. Retries wait out an exponential
+  backoff without holding a worker or a cluster slot, up to MAX_ATTEMPTS
+  tries.
+- Finished jobs are kept for JOB_TTL seconds, then dropped.
+"""
+
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+import requests
+import urllib3
+
+from turbo_client import TurbonomicClient
+
+log = logging.getLogger("action_executor")
+
+EXECUTE_CONCURRENCY = 8        # actions in flight across all jobs
+PER_CLUSTER_CONCURRENCY = 2    # actions in flight per target cluster
+MAX_ATTEMPTS = 3               # tries per action, including the first
+BACKOFF_BASE = 1.0             # seconds; doubled on every retry (plus jitter)
+JOB_TTL = 600                  # seconds a finished job stays queryable
+
+_NOT_SENT_STATUS = (429, 503)          # rejected before the action was touched
+_UNKNOWN_STATUS = (502, 504)           # a gateway gave up; Turbonomic may have acted
+_EXECUTED_STATES = ("ACCEPTED", "QUEUED", "IN_PROGRESS", "SUCCEEDED")
+
+
+def _not_sent(exc: Exception) -> bool:
+    """Return True if the request behind *exc* provably never reached Turbonomic."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.exceptions.ConnectionError):
+        # requests wraps urllib3's MaxRetryError, whose reason is the underlying error
+        reason = exc.args[0] if exc.args else None
+        return isinstance(getattr(reason, "reason", reason), urllib3.exceptions.NewConnectionError)
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        return exc.response.status_code in _NOT_SENT_STATUS
+    return False
+
+
+def _outcome_unknown(exc: Exception) -> bool:
+    """Return True if the request behind *exc* may have been applied anyway."""
+    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return not _not_sent(exc)
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        return exc.response.status_code in _UNKNOWN_STATUS
+    return False
+
+
+# ============================================================================
+# JOB STATE
+# ============================================================================
+
+@dataclass
+class ActionResult:
+    name: str
+    ok: bool
+    attempts: int
+    error: str = ""
+
+
+@dataclass
+class BulkJob:
+    job_id: str
+    total: int
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    results: List[ActionResult] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, result: ActionResult) -> bool:
+        """Store one action's result; return True if it completed the job."""
+        with self._lock:
+            self.results.append(result)
+            if len(self.results) == self.total:
+                self.finished_at = time.time()
+                return True
+            return False
+
+    def snapshot(self) -> Dict:
+        """
+        Return a JSON-serialisable view of the job for the UI.
+
+        Returns:
+            Dict with counts, ``finished`` flag, and succeeded / failed details
+        """
+        with self._lock:
+            results = list(self.results)
+            finished = self.finished_at is not None
+        return {
+            "job_id": self.job_id,
+            "total": self.total,
+            "done": len(results),
+            "finished": finished,
+            "succeeded": [r.name for r in results if r.ok],
+            "failed": [f"{r.name}: {r.error}" for r in results if not r.ok],
+            "retried": sum(1 for r in results if r.attempts > 1),
+        }
+
+
+# ============================================================================
+# EXECUTOR
+# ============================================================================
+
+class BulkActionExecutor:
+    """Runs batches of action executions on a shared, throttled worker pool."""
+
+    def __init__(self, concurrency: int = EXECUTE_CONCURRENCY,
+                 per_cluster: int = PER_CLUSTER_CONCURRENCY):
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="turbo-exec")
+        self._per_cluster = per_cluster
+        # (base url, cluster) -> actions waiting for a slot / actions holding one
+        self._cluster_queues: Dict[Tuple[str, str], Deque[Tuple]] = {}
+        self._cluster_active: Dict[Tuple[str, str], int] = {}
+        self._jobs: "OrderedDict[str, BulkJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, client: TurbonomicClient, actions: List[Dict]) -> str:
+        """
+        Start executing *actions* and return immediately.
+
+        Args:
+            client: Logged-in client used for every action in the batch
+            actions: Dicts with ``uuid``, ``name`` and ``cluster`` keys
+
+        Returns:
+            Job id to pass to :meth:`get`
+        """
+        job = BulkJob(job_id=uuid.uuid4().hex[:8], total=len(actions))
+        with self._lock:
+            self._cleanup()
+            self._jobs[job.job_id] = job
+
+        for action in self._interleave(actions):
+            if not action.get("uuid") or action["uuid"] == "—":
+                job.record(ActionResult(action.get("name", "unknown"), False, 0, "Missing UUID"))
+                continue
+            self._enqueue((client.base_url, action.get("cluster") or "—"), (client, job, action, 1))
+        if not job.total:
+            job.finished_at = time.time()
+
+        log.info("BulkActionExecutor: job %s submitted (%d actions)", job.job_id, job.total)
+        return job.job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return the job's progress snapshot, or None if unknown / expired."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job.snapshot() if job else None
+
+    @staticmethod
+    def _interleave(actions: List[Dict]) -> List[Dict]:
+        """Order actions round-robin by cluster so workers spread across clusters."""
+        by_cluster: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        for action in actions:
+            by_cluster.setdefault(action.get("cluster") or "—", []).append(action)
+        queues = list(by_cluster.values())
+        ordered: List[Dict] = []
+        for i in range(max((len(q) for q in queues), default=0)):
+            ordered.extend(q[i] for q in queues if i < len(q))
+        return ordered
+
+    def _enqueue(self, key: Tuple[str, str], task: Tuple) -> None:
+        with self._lock:
+            self._cluster_queues.setdefault(key, deque()).append(task)
+        self._dispatch(key)
+
+    def _release(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            self._cluster_active[key] -= 1
+        self._dispatch(key)
+
+    def _dispatch(self, key: Tuple[str, str]) -> None:
+        """Hand queued actions for *key* to the pool while the cluster has free slots."""
+        ready = []
+        with self._lock:
+            queue = self._cluster_queues.get(key)
+            active = self._cluster_active.get(key, 0)
+            while queue and active < self._per_cluster:
+                active += 1
+                ready.append(queue.popleft())
+            if queue or active:
+                self._cluster_active[key] = active
+            else:
+                self._cluster_queues.pop(key, None)
+                self._cluster_active.pop(key, None)
+        for task in ready:
+            self._pool.submit(self._run_one, key, *task)
+
+    def _run_one(self, key: Tuple[str, str], client: TurbonomicClient, job: BulkJob,
+                 action: Dict, attempt: int) -> None:
+        # The caller already holds one of the cluster's slots for this action
+        try:
+            result = self._execute(client, action, attempt)
+        finally:
+            self._release(key)
+        if result is None:
+            delay = BACKOFF_BASE * (2 ** (attempt - 1)) * (1 + random.random() / 2)
+            log.info("Action %s: retrying in %.1fs", action["uuid"], delay)
+            timer = threading.Timer(delay, self._enqueue, (key, (client, job, action, attempt + 1)))
+            timer.daemon = True
+            timer.start()
+        elif job.record(result):
+            log.info("BulkActionExecutor: job %s finished", job.job_id)
+
+    @staticmethod
+    def _execute(client: TurbonomicClient, action: Dict, attempt: int) -> Optional[ActionResult]:
+        """Try *action* once; return its result, or None if it should be sent again."""
+        name = action.get("name", "unknown")
+        try:
+            client.execute_action(action["uuid"])
+            return ActionResult(name, True, attempt)
+        except Exception as exc:
+            error = exc
+
+        resend = _not_sent(error)
+        if _outcome_unknown(error):
+            # The accept may have gone through: look before sending it again
+            try:
+                state = client.get_action_state(action["uuid"])
+            except Exception as exc:
+                log.warning("Action %s: %s, and its state could not be read: %s",
+                            action["uuid"], type(error).__name__, exc)
+                return ActionResult(name, False, attempt, f"{type(error).__name__} (outcome unknown)")
+            if state in _EXECUTED_STATES:
+                log.info("Action %s: %s, but it is already %s", action["uuid"],
+                         type(error).__name__, state)
+                return ActionResult(name, True, attempt)
+            resend = state == "READY"
+
+        if resend and attempt < MAX_ATTEMPTS:
+            log.info("Action %s: %s on attempt %d", action["uuid"], type(error).__name__, attempt)
+            return None
+        log.warning("Action %s failed after %d attempt(s): %s", action["uuid"], attempt, error)
+        return ActionResult(name, False, attempt, type(error).__name__)
+
+    def _cleanup(self) -> None:
+        # Caller holds the lock
+        now = time.time()
+        expired = [jid for jid, j in self._jobs.items()
+                   if j.finished_at is not None and now - j.finished_at > JOB_TTL]
+        for jid in expired:
+            del self._jobs[jid]
+
+
+bulk_executor = BulkActionExecutor()
+
+# Made with Bob
@@ -25,6 +25,9 @@ import plotly.graph_objects as go
 import pandas as pd
 
 from turbo_client import TurbonomicClient, safe_get
+from turbo_cache import session_pool, get_dataset
+from action_executor import bulk_executor
+from timeseries import load_series, downsample
 
 # Configure logging
 logging.basicConfig(
@@ -101,17 +104,19 @@ def _df_to_records(df: pd.DataFrame) -> List[Dict]:
 
 
 def get_client(session_data: Dict) -> TurbonomicClient:
-    """Get or create Turbonomic client from session data."""
+    """Get the pooled (already logged-in) Turbonomic client for this session."""
     if not session_data or "client_params" not in session_data:
         raise ValueError("Not authenticated")
     
-    params = session_data["client_params"]
-    return TurbonomicClient(
-        host=params["host"],
-        username=params["username"],
-        password=params["password"],
-        verify_ssl=params.get("verify_ssl", False)
-    )
+    return session_pool.get(session_data["client_params"])
+
+
+def get_cached(session_data: Dict, dataset: str) -> Any:
+    """Read a dataset from the shared background-refreshed cache (no API call)."""
+    if not session_data or "client_params" not in session_data:
+        raise ValueError("Not authenticated")
+    
+    return get_dataset(session_data["client_params"], dataset).data
 
 
 def safe_timestamp_to_datetime(ts_ms: Any) -> Optional[datetime]:
@@ -237,8 +242,6 @@ def handle_login(n_clicks, host, username, password, ssl_check):
     
     try:
         verify_ssl = "verify" in (ssl_check or [])
-        client = TurbonomicClient(host, username, password, verify_ssl)
-        
         session_data = {
             "authenticated": True,
             "client_params": {
@@ -248,6 +251,8 @@ def handle_login(n_clicks, host, username, password, ssl_check):
                 "verify_ssl": verify_ssl
             }
         }
+        # Logs in and keeps the session for the callbacks that follow
+        session_pool.get(session_data["client_params"])
         
         return (
             session_data,
@@ -299,9 +304,19 @@ def display_page(hash_value, auth_data):
         "policies": dcc.Store(id="policies-store"),
     }
     
+    # Page-level components that must survive content re-renders
+    extras = {
+        "actions": html.Div([
+            dcc.Store(id="execute-job-store"),
+            dcc.Interval(id="execute-job-interval", interval=1000, n_intervals=0, disabled=True),
+            html.Div(id="execute-progress", className="mb-3"),
+        ]),
+    }
+    
     return html.Div([
         intervals.get(page, html.Div()),
         stores.get(page, html.Div()),
+        extras.get(page, html.Div()),
         html.Div(id=f"{page}-content"),
     ])
 
@@ -318,11 +333,9 @@ def display_page(hash_value, auth_data):
 def load_overview_data(n, auth_data):
     """Load data for Overview tab."""
     try:
-        client = get_client(auth_data)
-        
-        entities = client.get_entities(limit=1000)
-        actions = client.get_pending_actions(limit=500)
-        targets = client.get_targets()
+        entities = get_cached(auth_data, "entities")
+        actions = get_cached(auth_data, "actions")
+        targets = get_cached(auth_data, "targets")
         
         return {
             "entities": entities,
@@ -499,8 +512,7 @@ def render_overview(data):
 def load_actions_data(n, auth_data):
     """Load pending actions data."""
     try:
-        client = get_client(auth_data)
-        actions = client.get_pending_actions(limit=500)
+        actions = get_cached(auth_data, "actions")
         
         rows = []
         for a in actions:
@@ -572,8 +584,13 @@ def load_actions_data(n, auth_data):
             if len(rows) < 10:
                 log.info(f"Action {len(rows)+1}: entity={entity_type}, namespace={namespace}, displayName={target.get('displayName', 'N/A')}")
             
+            # Target (cluster) that discovered the entity, used to throttle execution
+            discovered_by = target.get("discoveredBy") or {}
+            cluster = discovered_by.get("displayName") if isinstance(discovered_by, dict) else None
+            
             rows.append({
                 "UUID": a.get("uuid", "—"),
+                "Cluster": cluster or "—",
                 "Action Type": a.get("actionType", "Unknown"),
                 "Namespace": namespace,
                 "Entity": target.get("displayName", "Unknown"),
@@ -831,10 +848,31 @@ def show_execute_modal(execute_clicks, cancel_clicks, selected_rows, table_data)
     return False, ""
 
 
+def _execution_progress(job: Optional[Dict]) -> Any:
+    """Progress bar for a running bulk execution job."""
+    if not job or not job["total"]:
+        return None
+    failed = len(job["failed"])
+    return html.Div([
+        dbc.Progress(
+            value=job["done"] * 100 / job["total"],
+            label=f"{job['done']}/{job['total']}",
+            color="danger" if failed else "info",
+            striped=True,
+            animated=True,
+        ),
+        html.Small(
+            f"Executing actions — {len(job['succeeded'])} succeeded, {failed} failed"
+            + (f", {job['retried']} retried" if job["retried"] else ""),
+            style={"color": "#7a9abf"},
+        ),
+    ])
+
+
 @app.callback(
-    Output("execute-toast", "is_open"),
-    Output("execute-toast", "children"),
-    Output("execute-toast", "icon"),
+    Output("execute-job-store", "data"),
+    Output("execute-job-interval", "disabled"),
+    Output("execute-progress", "children"),
     Output("actions-table", "selected_rows"),
     Output("execute-modal", "is_open", allow_duplicate=True),
     Input("btn-execute-confirm", "n_clicks"),
@@ -844,29 +882,43 @@ def show_execute_modal(execute_clicks, cancel_clicks, selected_rows, table_data)
     prevent_initial_call=True
 )
 def execute_selected_actions(n_clicks, selected_rows, store_data, auth_data):
-    """Execute selected actions with detailed feedback."""
+    """Submit selected actions to the bulk executor; progress is polled below."""
     if not n_clicks or not selected_rows:
         return no_update, no_update, no_update, no_update, no_update
     
     client = get_client(auth_data)
-    actions = [store_data[i] for i in selected_rows if i < len(store_data)]
-    success, failed, error_details = [], [], []
+    actions = [
+        {
+            "uuid": row.get("UUID", ""),
+            "name": row.get("Entity", "unknown"),
+            "cluster": row.get("Cluster", "—"),
+        }
+        for row in (store_data[i] for i in selected_rows if i < len(store_data))
+    ]
+    job_id = bulk_executor.submit(client, actions)
     
-    for action in actions:
-        uuid = action.get("UUID", "")
-        entity_name = action.get("Entity", "unknown")
-        
-        if not uuid or uuid == "—":
-            failed.append(entity_name)
-            error_details.append(f"{entity_name}: Missing UUID")
-            continue
-        
-        try:
-            client.execute_action(uuid)
-            success.append(entity_name)
-        except Exception as exc:
-            failed.append(entity_name)
-            error_details.append(f"{entity_name}: {type(exc).__name__}")
+    return {"job_id": job_id}, False, _execution_progress(bulk_executor.get(job_id)), [], False
+
+
+@app.callback(
+    Output("execute-progress", "children", allow_duplicate=True),
+    Output("execute-job-interval", "disabled", allow_duplicate=True),
+    Output("execute-toast", "is_open"),
+    Output("execute-toast", "children"),
+    Output("execute-toast", "icon"),
+    Input("execute-job-interval", "n_intervals"),
+    State("execute-job-store", "data"),
+    prevent_initial_call=True
+)
+def poll_execution_job(_n, job_data):
+    """Show bulk execution progress and a detailed summary once it finishes."""
+    job = bulk_executor.get(job_data["job_id"]) if job_data else None
+    if not job:
+        return None, True, no_update, no_update, no_update
+    if not job["finished"]:
+        return _execution_progress(job), False, no_update, no_update, no_update
+    
+    success, error_details = job["succeeded"], job["failed"]
     
     # Build feedback
     parts = []
@@ -875,14 +927,14 @@ def execute_selected_actions(n_clicks, selected_rows, store_data, auth_data):
             html.Strong("✓ Successfully Executed:", style={"color": "#42be65"}),
             html.Ul([html.Li(name) for name in success])
         ]))
-    if failed:
+    if error_details:
         parts.append(html.Div([
             html.Strong("✗ Failed:", style={"color": "#da1e28"}),
             html.Ul([html.Li(detail) for detail in error_details])
         ]))
     
-    icon = "success" if not failed else ("danger" if not success else "warning")
-    return True, html.Div(parts), icon, [], False
+    icon = "success" if not error_details else ("danger" if not success else "warning")
+    return None, True, True, html.Div(parts), icon
 
 
 # ============================================================================
@@ -897,8 +949,7 @@ def execute_selected_actions(n_clicks, selected_rows, store_data, auth_data):
 def load_entities_data(n, auth_data):
     """Load entities data."""
     try:
-        client = get_client(auth_data)
-        entities = client.get_entities(limit=1000)
+        entities = get_cached(auth_data, "entities")
         
         rows = []
         for e in entities:
@@ -1132,7 +1183,7 @@ def search_applications_callback(_btn, search_text, auth_data):
     
     try:
         client = get_client(auth_data)
-        apps = client.search_applications(name_filter=search_text.strip(), limit=500)
+        apps = client.search_applications(name_filter=search_text.strip())
     except Exception as exc:
         log.error("Application search failed: %s", exc)
         return [], html.Span(f"❌ Search failed: {exc}", 
@@ -1210,7 +1261,6 @@ def load_app_statistics(_btn, app_uuid, time_range, auth_data):
         return dbc.Alert("Please select an application first.", color="warning")
     
     try:
-        import time
         client = get_client(auth_data)
         
         # Get application details
@@ -1221,64 +1271,28 @@ def load_app_statistics(_btn, app_uuid, time_range, auth_data):
         app_name = app_entity.get("displayName", "Unknown")
         app_class = app_entity.get("className", "BusinessApplication")
         
-        # Calculate time range
-        end_ms = int(time.time() * 1000)
-        time_ranges = {
-            "24h": 24 * 3600 * 1000,
-            "7d": 7 * 24 * 3600 * 1000,
-            "30d": 30 * 24 * 3600 * 1000,
-            "90d": 90 * 24 * 3600 * 1000,
-        }
-        start_ms = end_ms - time_ranges.get(time_range, time_ranges["7d"])
-        
-        # Get time-series statistics
+        # Time-series statistics as typed per-commodity frames (cached per range)
         commodities = ["ResponseTime", "Transaction"]
-        snapshots = client.get_entity_time_series(app_uuid, commodities, start_ms, end_ms)
+        stat_series = {
+            name: frame
+            for name, frame in load_series(client, app_uuid, commodities, time_range).items()
+            if not frame.empty
+        }
         
-        # Process time-series data
-        stat_series = {}
-        for snapshot in snapshots:
-            ts_ms = snapshot.get("date", 0)
-            ts = safe_timestamp_to_datetime(ts_ms)
-            
-            statistics = snapshot.get("statistics", [])
-            for stat in statistics:
-                name = stat.get("name", "Unknown")
-                units = stat.get("units", "")
-                vals = stat.get("values", {}) or {}
-                cap = stat.get("capacity", {}) or {}
-                
-                if name not in stat_series:
-                    stat_series[name] = {
-                        "dates": [], "avg": [], "max": [], "min": [],
-                        "cap_avg": [], "units": units
-                    }
-                
-                stat_series[name]["dates"].append(ts)
-                stat_series[name]["avg"].append(vals.get("avg", None))
-                stat_series[name]["max"].append(vals.get("max", None))
-                stat_series[name]["min"].append(vals.get("min", None))
-                stat_series[name]["cap_avg"].append(cap.get("avg", None))
+        def _latest(name: str) -> str:
+            frame = stat_series.get(name)
+            avgs = frame["avg"].dropna() if frame is not None else None
+            if avgs is None or avgs.empty:
+                return "N/A"
+            return f"{avgs.iloc[-1]:.1f} {frame['units'].iloc[0]}"
         
         # Get latest values for metric cards
-        response_time_val = "N/A"
-        transaction_val = "N/A"
-        
-        if "ResponseTime" in stat_series:
-            avgs = [v for v in stat_series["ResponseTime"]["avg"] if v is not None]
-            if avgs:
-                units = stat_series["ResponseTime"]["units"]
-                response_time_val = f"{avgs[-1]:.1f} {units}"
-        
-        if "Transaction" in stat_series:
-            avgs = [v for v in stat_series["Transaction"]["avg"] if v is not None]
-            if avgs:
-                units = stat_series["Transaction"]["units"]
-                transaction_val = f"{avgs[-1]:.1f} {units}"
+        response_time_val = _latest("ResponseTime")
+        transaction_val = _latest("Transaction")
         
         # Get pending actions count
         try:
-            actions = client.get_entity_actions(app_uuid, limit=100)
+            actions = client.get_entity_actions(app_uuid)
             pending_count = len(actions)
         except Exception:
             pending_count = 0
@@ -1316,12 +1330,13 @@ def load_app_statistics(_btn, app_uuid, time_range, auth_data):
             if commodity not in stat_series:
                 continue
             
-            series = stat_series[commodity]
-            dates = series["dates"]
+            # Downsample to the chart's resolution before plotting
+            series = downsample(stat_series[commodity])
+            dates = series["date"]
             avg_vals = series["avg"]
             max_vals = series["max"]
             cap_vals = series["cap_avg"]
-            units = series["units"]
+            units = series["units"].iloc[0]
             
             fig = go.Figure()
             
@@ -1334,7 +1349,7 @@ def load_app_statistics(_btn, app_uuid, time_range, auth_data):
             ))
             
             # Maximum line
-            if max_vals and len(max_vals) == len(dates):
+            if max_vals.notna().any():
                 fig.add_trace(go.Scatter(
                     x=dates, y=max_vals, name="Maximum", mode="lines",
                     line=dict(color="#da1e28", width=2, dash="dot", shape="spline"),
@@ -1342,7 +1357,7 @@ def load_app_statistics(_btn, app_uuid, time_range, auth_data):
                 ))
             
             # Capacity line
-            if cap_vals and len(cap_vals) == len(dates):
+            if cap_vals.notna().any():
                 fig.add_trace(go.Scatter(
                     x=dates, y=cap_vals, name="Capacity", mode="lines",
                     line=dict(color="#f1c21b", width=2, dash="dash", shape="spline"),
@@ -1558,8 +1573,7 @@ def load_app_statistics(_btn, app_uuid, time_range, auth_data):
 def load_targets_data(n, auth_data):
     """Load targets data."""
     try:
-        client = get_client(auth_data)
-        targets = client.get_targets()
+        targets = get_cached(auth_data, "targets")
         
         rows = []
         for t in targets:
@@ -1673,8 +1687,7 @@ def render_targets(data):
 def load_groups_data(n, auth_data):
     """Load groups data."""
     try:
-        client = get_client(auth_data)
-        groups = client.get_groups()
+        groups = get_cached(auth_data, "groups")
         
         rows = []
         for g in groups:
@@ -1782,8 +1795,7 @@ def render_groups(data):
 def load_clusters_data(n, auth_data):
     """Load Kubernetes clusters data."""
     try:
-        client = get_client(auth_data)
-        clusters = client.get_clusters()
+        clusters = get_cached(auth_data, "clusters")
         
         rows = []
         for c in clusters:
@@ -1854,8 +1866,7 @@ def render_clusters(data):
 def load_policies_data(n, auth_data):
     """Load policies data."""
     try:
-        client = get_client(auth_data)
-        policies = client.get_policies()
+        policies = get_cached(auth_data, "policies")
         
         rows = []
         for p in policies:
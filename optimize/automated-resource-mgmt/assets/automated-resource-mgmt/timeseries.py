@@ -0,0 +1,212 @@
+"""
+Application Time-Series Processing
+==================================
+Columnar handling of ``get_entity_time_series`` payloads for the App
+Statistics tab.
+
+- ``normalize_snapshots`` flattens the snapshot/statistic payload in one pass
+  into a typed frame (one row per snapshot and commodity).
+- ``downsample`` reduces a series to roughly the chart's pixel width with
+  min/max bucketing, keeping every bucket's lowest average and highest
+  maximum so spikes survive.
+- ``SeriesCache`` keeps normalized frames per (uuid, commodity, range); a
+  shorter range is sliced from a fresh longer one, so switching time ranges
+  does not hit the API again.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+CHART_POINTS = 600           # target points per chart (≈ half-width chart in px)
+SERIES_CACHE_TTL = 300       # seconds a fetched series stays fresh
+
+TIME_RANGES_MS = {
+    "24h": 24 * 3600 * 1000,
+    "7d": 7 * 24 * 3600 * 1000,
+    "30d": 30 * 24 * 3600 * 1000,
+    "90d": 90 * 24 * 3600 * 1000,
+}
+
+COLUMNS = ["commodity", "date", "avg", "max", "min", "cap_avg", "units"]
+
+
+def _to_datetime(raw: pd.Series) -> pd.Series:
+    """
+    Vectorised version of ``safe_timestamp_to_datetime`` (EC003).
+
+    Epoch milliseconds (int or numeric string) and ISO-8601 strings are both
+    accepted; results are naive UTC, invalid or zero timestamps become NaT.
+    """
+    numeric = pd.to_numeric(raw, errors="coerce")
+    dates = pd.to_datetime(numeric.where(numeric > 0), unit="ms").astype("datetime64[ns]")
+    iso = numeric.isna() & raw.notna()
+    if iso.any():
+        parsed = pd.to_datetime(raw[iso].astype(str), utc=True, errors="coerce", format="ISO8601")
+        dates[iso] = parsed.dt.tz_localize(None).astype("datetime64[ns]")
+    return dates
+
+
+def normalize_snapshots(snapshots: Iterable[Dict]) -> pd.DataFrame:
+    """
+    Flatten time-series snapshots into a typed, date-sorted frame.
+
+    Args:
+        snapshots: Result of ``TurbonomicClient.get_entity_time_series``
+
+    Returns:
+        DataFrame with columns ``commodity, date, avg, max, min, cap_avg, units``
+    """
+    rows: List[Tuple] = [
+        (
+            stat.get("name", "Unknown"),
+            snapshot.get("date", 0),
+            (stat.get("values") or {}).get("avg"),
+            (stat.get("values") or {}).get("max"),
+            (stat.get("values") or {}).get("min"),
+            (stat.get("capacity") or {}).get("avg"),
+            stat.get("units", ""),
+        )
+        for snapshot in snapshots
+        for stat in (snapshot.get("statistics") or [])
+    ]
+    if not rows:
+        return empty_frame()
+
+    frame = pd.DataFrame(rows, columns=COLUMNS)
+    frame["date"] = _to_datetime(frame["date"])
+    for col in ("avg", "max", "min", "cap_avg"):
+        frame[col] = pd.to_numeric(frame[col], errors="coerce").astype("float64")
+    frame["commodity"] = frame["commodity"].astype("category")
+    return frame.dropna(subset=["date"]).sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def empty_frame() -> pd.DataFrame:
+    """Return an empty frame with the normalized schema."""
+    frame = pd.DataFrame({c: pd.Series(dtype="float64") for c in COLUMNS})
+    frame["commodity"] = frame["commodity"].astype("category")
+    frame["date"] = frame["date"].astype("datetime64[ns]")
+    frame["units"] = frame["units"].astype("object")
+    return frame
+
+
+def downsample(series: pd.DataFrame, points: int = CHART_POINTS) -> pd.DataFrame:
+    """
+    Reduce one commodity's rows to about *points* rows with min/max bucketing.
+
+    The time axis is split into ``points // 2`` equal buckets; each bucket
+    keeps the row with the lowest ``avg`` and the row with the highest
+    ``max`` (falling back to ``avg``), plus the first and last rows overall.
+
+    Args:
+        series: Date-sorted rows of a single commodity
+        points: Target number of rows
+
+    Returns:
+        Subset of *series*, still date-sorted
+    """
+    n = len(series)
+    if n <= points:
+        return series
+
+    buckets = max(1, points // 2)
+    t = series["date"].to_numpy().astype("int64")
+    span = max(int(t[-1] - t[0]), 1)
+    bucket = np.minimum((t - t[0]) * buckets // span, buckets - 1)
+
+    avg = series["avg"].to_numpy()
+    peak = series["max"].fillna(series["avg"]).to_numpy()
+    positions = np.arange(n)
+    grouped = pd.DataFrame({"bucket": bucket, "avg": avg, "peak": peak, "pos": positions})
+    lows = grouped.dropna(subset=["avg"]).sort_values("avg", kind="stable").drop_duplicates("bucket")["pos"]
+    highs = grouped.dropna(subset=["peak"]).sort_values("peak", ascending=False, kind="stable").drop_duplicates("bucket")["pos"]
+
+    keep = np.unique(np.concatenate([[0, n - 1], lows.to_numpy(), highs.to_numpy()]))
+    return series.iloc[keep]
+
+
+# ============================================================================
+# SERIES CACHE
+# ============================================================================
+
+class SeriesCache:
+    """Normalized per-commodity frames keyed by (uuid, commodity, range)."""
+
+    def __init__(self, ttl: int = SERIES_CACHE_TTL):
+        self._ttl = ttl
+        self._entries: Dict[Tuple[str, str, str], Tuple[float, int, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, uuid: str, commodity: str, time_range: str) -> Optional[pd.DataFrame]:
+        """
+        Return the cached rows for the range, or None on a miss.
+
+        An exact entry is used if fresh; otherwise a fresh entry for a longer
+        range of the same commodity is sliced down to the requested window.
+        """
+        now = time.time()
+        wanted_ms = TIME_RANGES_MS[time_range]
+        with self._lock:
+            candidates = [
+                (TIME_RANGES_MS[rng], end_ms, frame)
+                for (u, c, rng), (fetched_at, end_ms, frame) in self._entries.items()
+                if u == uuid and c == commodity and now - fetched_at < self._ttl
+                and TIME_RANGES_MS[rng] >= wanted_ms
+            ]
+        if not candidates:
+            return None
+        span_ms, end_ms, frame = min(candidates, key=lambda c: c[0])
+        if span_ms == wanted_ms:
+            return frame
+        start = pd.Timestamp(end_ms - wanted_ms, unit="ms")
+        return frame[frame["date"] >= start]
+
+    def put(self, uuid: str, commodity: str, time_range: str, end_ms: int,
+            frame: pd.DataFrame) -> None:
+        """Store the full-resolution rows fetched for a range ending at *end_ms*."""
+        now = time.time()
+        with self._lock:
+            self._entries[(uuid, commodity, time_range)] = (now, end_ms, frame)
+            expired = [k for k, (fetched_at, _, _) in self._entries.items()
+                       if now - fetched_at >= self._ttl]
+            for k in expired:
+                del self._entries[k]
+
+
+series_cache = SeriesCache()
+
+
+def load_series(client, uuid: str, commodities: List[str],
+                time_range: str) -> Dict[str, pd.DataFrame]:
+    """
+    Return full-resolution rows per commodity, fetching only cache misses.
+
+    Args:
+        client: TurbonomicClient used on a cache miss
+        uuid: Entity UUID
+        commodities: Commodity names (e.g. ["ResponseTime", "Transaction"])
+        time_range: One of the keys of ``TIME_RANGES_MS`` (defaults to "7d")
+
+    Returns:
+        Dict of commodity name -> date-sorted frame (possibly empty)
+    """
+    if time_range not in TIME_RANGES_MS:
+        time_range = "7d"
+    result = {c: series_cache.get(uuid, c, time_range) for c in commodities}
+    missing = [c for c, frame in result.items() if frame is None]
+    if missing:
+        end_ms = int(time.time() * 1000)
+        start_ms = end_ms - TIME_RANGES_MS[time_range]
+        snapshots = client.get_entity_time_series(uuid, missing, start_ms, end_ms)
+        frame = normalize_snapshots(snapshots)
+        for commodity in missing:
+            rows = frame[frame["commodity"] == commodity].reset_index(drop=True)
+            if snapshots:
+                series_cache.put(uuid, commodity, time_range, end_ms, rows)
+            result[commodity] = rows
+    return result
+
+# Made with Bob
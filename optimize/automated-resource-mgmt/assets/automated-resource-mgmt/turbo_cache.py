@@ -0,0 +1,257 @@
+"""
+Turbonomic Session Pool and Shared Data Cache
+=============================================
+Keeps one authenticated TurbonomicClient per Turbonomic account and a
+background refresher that polls each dashboard dataset once per interval.
+
+Dash callbacks read from the cache instead of calling the API, so tab
+refresh timers cost no Turbonomic requests and any number of browser
+sessions logged in with the same account share a single poller.
+
+Datasets are only polled while someone is reading them; a refresher whose
+datasets have not been read for REFRESHER_IDLE_TTL seconds stops itself.
+Each cached entry carries a content hash (etag), a version that increments
+only when the content changes, and the time it was fetched.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from turbo_client import TurbonomicClient
+
+log = logging.getLogger("turbo_cache")
+
+SESSION_IDLE_TTL = 1800      # seconds an unused pooled session is kept
+REFRESHER_IDLE_TTL = 600     # seconds without reads before a refresher stops
+
+# dataset name -> (fetch function, refresh interval in seconds)
+DATASETS: Dict[str, Tuple[Callable[[TurbonomicClient], Any], int]] = {
+    "entities": (lambda c: c.get_entities(), 60),
+    "actions": (lambda c: c.get_pending_actions(), 30),
+    "targets": (lambda c: c.get_targets(), 60),
+    "groups": (lambda c: c.get_groups(), 60),
+    "clusters": (lambda c: c.get_clusters(), 60),
+    "policies": (lambda c: c.get_policies(), 60),
+}
+
+
+def _account_key(params: Dict) -> Tuple[str, str, bool]:
+    """Identify a Turbonomic account from the auth-store client params."""
+    host = params["host"].strip().rstrip("/").split("://")[-1].lower()
+    return host, params["username"], bool(params.get("verify_ssl", False))
+
+
+def _secret(params: Dict) -> str:
+    return hashlib.sha256(params["password"].encode("utf-8")).hexdigest()
+
+
+# ============================================================================
+# SESSION POOL
+# ============================================================================
+
+@dataclass
+class _PooledClient:
+    client: TurbonomicClient
+    secret: str
+    last_used: float
+
+
+class SessionPool:
+    """Reuses authenticated TurbonomicClient sessions across callbacks."""
+
+    def __init__(self, idle_ttl: int = SESSION_IDLE_TTL):
+        self._idle_ttl = idle_ttl
+        self._clients: Dict[Tuple[str, str, bool], _PooledClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, params: Dict) -> TurbonomicClient:
+        """
+        Return a logged-in client for the account described by *params*.
+
+        A new client (and login) is only created the first time an account is
+        seen, after its session sat idle past the TTL, or when the password
+        differs from the pooled one.
+
+        Args:
+            params: The ``client_params`` dict from the auth store
+
+        Returns:
+            Authenticated TurbonomicClient
+        """
+        key = _account_key(params)
+        secret = _secret(params)
+        now = time.time()
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry and entry.secret == secret and now - entry.last_used < self._idle_ttl:
+                entry.last_used = now
+                return entry.client
+
+        # Log in outside the lock so one slow login does not block every user
+        client = TurbonomicClient(
+            host=params["host"],
+            username=params["username"],
+            password=params["password"],
+            verify_ssl=params.get("verify_ssl", False),
+        )
+        with self._lock:
+            self._clients[key] = _PooledClient(client, secret, now)
+            self._evict_idle(now)
+        log.info("SessionPool: new session for %s@%s (%d pooled)", key[1], key[0], len(self._clients))
+        return client
+
+    def _evict_idle(self, now: float) -> None:
+        expired = [k for k, e in self._clients.items() if now - e.last_used >= self._idle_ttl]
+        for k in expired:
+            self._clients.pop(k).client.session.close()
+
+
+# ============================================================================
+# SHARED DATA CACHE
+# ============================================================================
+
+@dataclass
+class CacheEntry:
+    data: Any
+    version: int
+    etag: str
+    fetched_at: float
+
+
+class DataRefresher:
+    """Background poller and cache for one Turbonomic account's datasets."""
+
+    def __init__(self, pool: SessionPool, params: Dict, on_stop: Callable[["DataRefresher"], None]):
+        self.key = _account_key(params)
+        self._pool = pool
+        self._params = dict(params)
+        self._on_stop = on_stop
+        self._entries: Dict[str, CacheEntry] = {}
+        self._last_read: Dict[str, float] = {}
+        self._started = time.time()
+        self._lock = threading.Lock()
+        self._fetch_locks = {name: threading.Lock() for name in DATASETS}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"turbo-refresh-{self.key[1]}@{self.key[0]}", daemon=True
+        )
+        self._thread.start()
+
+    def update_params(self, params: Dict) -> None:
+        """Use the latest credentials for future fetches; only call after they logged in."""
+        with self._lock:
+            self._params = dict(params)
+
+    def get(self, dataset: str) -> CacheEntry:
+        """
+        Return the cached entry for *dataset*, fetching it on first use.
+
+        Args:
+            dataset: One of the keys of ``DATASETS``
+
+        Returns:
+            CacheEntry with the latest data
+        """
+        with self._lock:
+            self._last_read[dataset] = time.time()
+            entry = self._entries.get(dataset)
+        return entry if entry is not None else self.refresh(dataset)
+
+    def refresh(self, dataset: str) -> CacheEntry:
+        """Fetch *dataset* now and update the cache (one fetch at a time per dataset)."""
+        with self._fetch_locks[dataset]:
+            with self._lock:
+                params = self._params
+                current = self._entries.get(dataset)
+            # Another caller may have just refreshed it
+            if current is not None and time.time() - current.fetched_at < 1:
+                return current
+
+            fetch, _ = DATASETS[dataset]
+            data = fetch(self._pool.get(params))
+            etag = hashlib.sha1(
+                json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()
+            if current is not None and current.etag == etag:
+                entry = CacheEntry(current.data, current.version, etag, time.time())
+            else:
+                entry = CacheEntry(data, (current.version + 1) if current else 1, etag, time.time())
+                log.info("DataRefresher[%s]: %s v%d", self.key[0], dataset, entry.version)
+            with self._lock:
+                self._entries[dataset] = entry
+            return entry
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            now = time.time()
+            with self._lock:
+                active = {d: t for d, t in self._last_read.items() if now - t < REFRESHER_IDLE_TTL}
+                entries = dict(self._entries)
+            # The first read may land after the thread starts
+            if not active and now - self._started >= REFRESHER_IDLE_TTL:
+                break
+
+            next_due = now + 5
+            for dataset in active:
+                entry = entries.get(dataset)
+                interval = DATASETS[dataset][1]
+                due = entry.fetched_at + interval if entry else now
+                if due <= now:
+                    try:
+                        entry = self.refresh(dataset)
+                        due = entry.fetched_at + interval
+                    except Exception as exc:
+                        log.warning("DataRefresher[%s]: %s refresh failed: %s", self.key[0], dataset, exc)
+                        due = time.time() + interval
+                next_due = min(next_due, due)
+            self._stop.wait(max(0.5, next_due - time.time()))
+
+        log.info("DataRefresher[%s@%s]: idle — stopping", self.key[1], self.key[0])
+        self._on_stop(self)
+
+
+session_pool = SessionPool()
+_refreshers: Dict[Tuple[str, str, bool], DataRefresher] = {}
+_refreshers_lock = threading.Lock()
+
+
+def _remove_refresher(refresher: DataRefresher) -> None:
+    with _refreshers_lock:
+        if _refreshers.get(refresher.key) is refresher:
+            del _refreshers[refresher.key]
+
+
+def get_dataset(params: Dict, dataset: str) -> CacheEntry:
+    """
+    Read *dataset* for the account in *params* from the shared cache.
+
+    Starts the account's background refresher on first use. The caller's
+    password must match the pooled session (or log in successfully) before
+    any cached data is served or the refresher adopts the new credentials.
+
+    Args:
+        params: The ``client_params`` dict from the auth store
+        dataset: One of the keys of ``DATASETS``
+
+    Returns:
+        CacheEntry with ``data``, ``version``, ``etag`` and ``fetched_at``
+
+    Raises:
+        requests.exceptions.RequestException: If the credentials are rejected
+    """
+    key = _account_key(params)
+    # The cache is keyed without the password; this raises if the login fails
+    session_pool.get(params)
+    with _refreshers_lock:
+        refresher: Optional[DataRefresher] = _refreshers.get(key)
+        if refresher is None:
+            refresher = DataRefresher(session_pool, params, _remove_refresher)
+            _refreshers[key] = refresher
+        else:
+            refresher.update_params(params)
+    return refresher.get(dataset)
@@ -10,12 +10,19 @@ Critical Fixes Implemented:
 - EC003: Safe timestamp conversion (handles string and int)
 - EC004: Server-side filtering with POST /search
 - EC006: None value handling with 'or {}' pattern
+
+List endpoints follow Turbonomic cursor pagination (``cursor`` parameter /
+``X-Next-Cursor`` response header) to completion, and multi-query fallbacks
+(per entity type, per search strategy) run concurrently on a small thread pool.
 """
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import urllib3
-from typing import Optional, List, Dict, Any
+from requests.adapters import HTTPAdapter
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Set, Tuple
 
 # Disable SSL warnings for self-signed certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -47,6 +54,11 @@ class TurbonomicClient:
         "ApplicationServer", "WebServer"
     ]
     
+    # Items requested per page when following cursors
+    PAGE_SIZE = 500
+    # Concurrent requests for per-type / per-strategy fan-out
+    MAX_WORKERS = 8
+    
     def __init__(self, host: str, username: str, password: str, verify_ssl: bool = False):
         """
         Initialize Turbonomic API client.
@@ -69,6 +81,12 @@ class TurbonomicClient:
         self.verify_ssl = verify_ssl
         self.session = requests.Session()
         self.session.verify = verify_ssl
+        # Enough pooled connections for the concurrent fan-out
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.MAX_WORKERS * 2)
+        self.session.mount("https://", adapter)
+        self._username = username
+        self._password = password
+        self._login_lock = threading.Lock()
         
         log.info("TurbonomicClient initializing | base_url=%s", self.base_url)
         self._login(username, password)
@@ -145,27 +163,137 @@ class TurbonomicClient:
                    label, type(data).__name__)
         return []
     
-    def _get(self, path: str, params: Optional[Dict] = None) -> Any:
-        """Execute GET request with error handling."""
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        Send a request, logging in again once if the session has expired.
+        
+        Long-lived (pooled) clients outlive the Turbonomic session cookie, so
+        a 401 triggers a single re-login and retry.
+        """
         url = f"{self.base_url}{path}"
-        log.debug("GET %s params=%s", url, params)
-        resp = self.session.get(url, params=params, timeout=60)
-        log.debug("GET %s → %s", url, resp.status_code)
+        log.debug("%s %s params=%s", method, url, kwargs.get("params"))
+        resp = self.session.request(method, url, timeout=60, **kwargs)
+        if resp.status_code == 401:
+            with self._login_lock:
+                log.info("Session expired — logging in again")
+                self._login(self._username, self._password)
+            resp = self.session.request(method, url, timeout=60, **kwargs)
+        log.debug("%s %s → %s", method, url, resp.status_code)
         resp.raise_for_status()
-        return resp.json()
+        return resp
+    
+    def _get(self, path: str, params: Optional[Dict] = None) -> Any:
+        """Execute GET request with error handling."""
+        return self._request("GET", path, params=params).json()
     
     def _post(self, path: str, payload: Optional[Dict] = None, 
               params: Optional[Dict] = None) -> Any:
         """Execute POST request with error handling."""
-        url = f"{self.base_url}{path}"
-        log.debug("POST %s params=%s", url, params)
-        resp = self.session.post(url, json=payload or {}, params=params, timeout=60)
-        log.debug("POST %s → %s", url, resp.status_code)
-        resp.raise_for_status()
-        return resp.json()
+        return self._request("POST", path, json=payload or {}, params=params).json()
+    
+    def _iter_pages(self, method: str, path: str, *, params: Optional[Dict] = None,
+                    payload: Optional[Dict] = None, label: str = "",
+                    max_items: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Stream items from a paginated list endpoint, following cursors.
+        
+        Turbonomic returns the next page's cursor in the ``X-Next-Cursor``
+        header; iteration stops when it is absent, a page is empty, or
+        *max_items* have been yielded. Stopping at *max_items* while another
+        page is still available is logged as a warning.
+        
+        Args:
+            method: "GET" or "POST"
+            path: API path
+            params: Query parameters (``limit``/``cursor`` are managed here)
+            payload: JSON body for POST endpoints
+            label: Label for logging
+            max_items: Stop after this many items (None = all pages)
+            
+        Yields:
+            Entity / action dictionaries
+        """
+        params = dict(params or {})
+        cursor: Optional[str] = None
+        yielded = 0
+        while True:
+            remaining = (max_items - yielded) if max_items else self.PAGE_SIZE
+            page_params = {**params, "limit": min(self.PAGE_SIZE, remaining)}
+            if cursor:
+                page_params["cursor"] = cursor
+            if method == "GET":
+                resp = self._request("GET", path, params=page_params)
+            else:
+                resp = self._request("POST", path, json=payload or {}, params=page_params)
+            items = self._to_list(resp.json(), label)
+            for item in items:
+                yield item
+                yielded += 1
+                if max_items and yielded >= max_items:
+                    if resp.headers.get("X-Next-Cursor"):
+                        log.warning("_iter_pages[%s]: stopped at max_items=%d, more results available",
+                                    label, max_items)
+                    return
+            cursor = resp.headers.get("X-Next-Cursor")
+            if not cursor or not items:
+                return
+            log.debug("_iter_pages[%s]: %d items so far, next cursor %s", label, yielded, cursor)
+    
+    def _fan_out(self, fn: Callable[[str], List[Dict]],
+                 keys: Iterable[str]) -> List[Tuple[str, List[Dict]]]:
+        """
+        Run ``fn(key)`` for every key concurrently.
+        
+        Failures are logged and yield an empty list for that key.
+        
+        Returns:
+            ``(key, result)`` pairs in the order of *keys*
+        """
+        keys = list(keys)
+        
+        def _safe(key: str) -> List[Dict]:
+            try:
+                return fn(key)
+            except Exception as exc:
+                log.debug("fan-out[%s] failed: %s", key, exc)
+                return []
+        
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(keys) or 1),
+                                thread_name_prefix="turbo-fanout") as pool:
+            return list(zip(keys, pool.map(_safe, keys)))
+    
+    @staticmethod
+    def _merge_unique(target: List[Dict], seen: Set[Any], items: Iterable[Dict]) -> int:
+        """Append items whose uuid is not in *seen*; return how many were added."""
+        added = 0
+        for item in items:
+            uuid = item.get("uuid")
+            if uuid is not None and uuid in seen:
+                continue
+            seen.add(uuid)
+            target.append(item)
+            added += 1
+        return added
+    
+    def iter_entities(self, entity_type: Optional[str] = None,
+                      max_items: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Stream market entities page by page (all pages unless *max_items*).
+        
+        Args:
+            entity_type: Optional entity type filter
+            max_items: Optional cap on the number of entities
+            
+        Yields:
+            Entity dictionaries
+        """
+        params = {"types": entity_type} if entity_type else {}
+        return self._iter_pages("GET", "/markets/Market/entities", params=params,
+                                label=f"market_entities_{entity_type or 'all'}",
+                                max_items=max_items)
     
     def get_entities(self, entity_type: Optional[str] = None, 
-                    limit: int = 500) -> List[Dict]:
+                    limit: Optional[int] = None) -> List[Dict]:
         """
         Fetch entities using correct API endpoints with fallback strategies.
         
@@ -174,7 +302,7 @@ class TurbonomicClient:
         
         Args:
             entity_type: Specific entity type to fetch
-            limit: Maximum number of entities to return
+            limit: Optional cap on the number of entities (None = all pages)
             
         Returns:
             List of entity dictionaries
@@ -182,9 +310,7 @@ class TurbonomicClient:
         # Strategy 1: If entity_type specified, query via Market endpoint
         if entity_type:
             try:
-                result = self._get("/markets/Market/entities", 
-                                  params={"types": entity_type, "limit": limit})
-                entities = self._to_list(result, f"market_entities_{entity_type}")
+                entities = list(self.iter_entities(entity_type, max_items=limit))
                 if entities:
                     log.info("get_entities[%s] via Market = %d items", 
                             entity_type, len(entities))
@@ -194,9 +320,9 @@ class TurbonomicClient:
             
             # Fallback to direct /entities
             try:
-                result = self._get("/entities", 
-                                  params={"types": entity_type, "limit": limit})
-                entities = self._to_list(result, entity_type)
+                entities = list(self._iter_pages("GET", "/entities",
+                                                 params={"types": entity_type},
+                                                 label=entity_type, max_items=limit))
                 if entities:
                     log.info("get_entities[%s] via /entities = %d items", 
                             entity_type, len(entities))
@@ -208,28 +334,26 @@ class TurbonomicClient:
         
         # Strategy 2: No specific type - get all via Market endpoint
         try:
-            result = self._get("/markets/Market/entities", params={"limit": limit})
-            entities = self._to_list(result, "market_entities_all")
+            entities = list(self.iter_entities(max_items=limit))
             if entities:
                 log.info("get_entities via Market returned %d items", len(entities))
                 return entities
         except Exception as exc:
             log.warning("Market endpoint failed: %s", exc)
         
-        # Strategy 3: Fallback - query each type individually
+        # Strategy 3: Fallback - query every type concurrently
         all_entities: List[Dict] = []
-        per_type_limit = max(200, limit // len(self.COMMON_ENTITY_TYPES))
-        
-        for etype in self.COMMON_ENTITY_TYPES:
-            try:
-                result = self._get("/markets/Market/entities", 
-                                  params={"types": etype, "limit": per_type_limit})
-                items = self._to_list(result, etype)
-                if items:
-                    log.info("get_entities[%s] = %d items", etype, len(items))
-                    all_entities.extend(items)
-            except Exception as exc:
-                log.debug("get_entities[%s] failed: %s", etype, exc)
+        seen: Set[Any] = set()
+        per_type_limit = max(200, limit // len(self.COMMON_ENTITY_TYPES)) if limit else None
+        
+        per_type = self._fan_out(
+            lambda etype: list(self.iter_entities(etype, max_items=per_type_limit)),
+            self.COMMON_ENTITY_TYPES,
+        )
+        for etype, items in per_type:
+            if items:
+                added = self._merge_unique(all_entities, seen, items)
+                log.info("get_entities[%s] = %d items (%d new)", etype, len(items), added)
         
         if all_entities:
             log.info("get_entities fallback SUCCESS: %d items", len(all_entities))
@@ -332,13 +456,13 @@ class TurbonomicClient:
             log.warning("get_entity_time_series failed for %s: %s", entity_uuid, exc)
             return []
     
-    def get_entity_actions(self, entity_uuid: str, limit: int = 100) -> List[Dict]:
+    def get_entity_actions(self, entity_uuid: str, limit: Optional[int] = None) -> List[Dict]:
         """
         Get actions for a specific entity.
         
         Args:
             entity_uuid: Entity UUID
-            limit: Maximum number of actions
+            limit: Optional cap on the number of actions (None = all pages)
             
         Returns:
             List of action dictionaries
@@ -349,9 +473,10 @@ class TurbonomicClient:
             "relatedEntityTypes": []
         }
         try:
-            result = self._post(f"/entities/{entity_uuid}/actions",
-                               payload=payload, params={"limit": limit})
-            actions = self._to_list(result, f"entity_{entity_uuid}_actions")
+            actions = list(self._iter_pages("POST", f"/entities/{entity_uuid}/actions",
+                                            payload=payload,
+                                            label=f"entity_{entity_uuid}_actions",
+                                            max_items=limit))
             log.info("get_entity_actions: %d actions for entity %s", len(actions), entity_uuid)
             return actions
         except Exception as exc:
@@ -419,12 +544,12 @@ class TurbonomicClient:
             log.error("get_entity_stats failed for %s: %s", entity_uuid, exc)
             return []
     
-    def get_pending_actions(self, limit: int = 500) -> List[Dict]:
+    def get_pending_actions(self, limit: Optional[int] = None) -> List[Dict]:
         """
         Get all pending actions from the market.
         
         Args:
-            limit: Maximum number of actions
+            limit: Optional cap on the number of actions (None = all pages)
             
         Returns:
             List of action dictionaries
@@ -434,9 +559,9 @@ class TurbonomicClient:
             "actionModeList": ["RECOMMEND", "EXTERNAL_APPROVAL", "MANUAL", "AUTOMATIC"],
         }
         try:
-            result = self._post("/markets/Market/actions", 
-                               payload=payload, params={"limit": limit})
-            actions = self._to_list(result, "pending_actions")
+            actions = list(self._iter_pages("POST", "/markets/Market/actions",
+                                            payload=payload, label="pending_actions",
+                                            max_items=limit))
             log.info("get_pending_actions: %d actions", len(actions))
             return actions
         except Exception as exc:
@@ -473,100 +598,93 @@ class TurbonomicClient:
         # Try format 3: legacy /accept endpoint
         return self._post(f"/actions/{action_uuid}/accept")
     
+    def get_action_state(self, action_uuid: str) -> str:
+        """
+        Get an action's current state (READY, ACCEPTED, IN_PROGRESS, SUCCEEDED, ...).
+        
+        Args:
+            action_uuid: Action UUID
+            
+        Returns:
+            The ``actionState`` string, or "" if the response has none
+        """
+        action = self._get(f"/actions/{action_uuid}")
+        return action.get("actionState", "") if isinstance(action, dict) else ""
+    
     def search_applications(self, name_filter: str = "", 
-                           limit: int = 500) -> List[Dict]:
+                           limit: Optional[int] = None) -> List[Dict]:
         """
         Search for applications with SERVER-SIDE filtering.
         
         CRITICAL FIX (EC004): Client-side filtering after limit misses results.
-        Uses 5 fallback strategies for maximum reliability.
+        Uses 5 fallback strategies for maximum reliability. Strategies in the
+        same tier, and the per-type queries within a strategy, run
+        concurrently; earlier strategies still take priority.
         
         Args:
             name_filter: Application name filter
-            limit: Maximum results
+            limit: Optional cap on the results per query (None = all pages)
             
         Returns:
             List of application entity dictionaries
         """
-        app_entities = []
-        
-        # Strategy 1: POST /search with server-side filtering
-        if name_filter:
-            try:
-                search_payload = {
-                    "criteria": {
-                        "expType": "RXEQ",
-                        "expVal": f".*{name_filter}.*",
-                        "filterType": "displayName",
-                        "caseSensitive": False
-                    },
-                    "className": "BusinessApplication"
-                }
-                result = self._post("/search", payload=search_payload, 
-                                   params={"limit": limit})
-                business_apps = self._to_list(result, "search_businessapplications")
-                if business_apps:
-                    log.info("search_applications: found %d via POST /search", 
-                            len(business_apps))
-                    app_entities.extend(business_apps)
-            except Exception as exc:
-                log.debug("POST /search failed: %s", exc)
-        
-        # Strategy 2: Try /businessapplications endpoint (no filter support)
+        def _search(class_name: str) -> List[Dict]:
+            search_payload = {
+                "criteria": {
+                    "expType": "RXEQ",
+                    "expVal": f".*{name_filter}.*",
+                    "filterType": "displayName",
+                    "caseSensitive": False
+                },
+                "className": class_name
+            }
+            return list(self._iter_pages("POST", "/search", payload=search_payload,
+                                         label=f"search_{class_name.lower()}",
+                                         max_items=limit))
+        
+        def _strategy(name: str) -> List[Dict]:
+            # Strategy 1: POST /search with server-side filtering
+            if name == "search":
+                return _search("BusinessApplication")
+            # Strategy 2: /businessapplications endpoint (no filter support)
+            return list(self._iter_pages("GET", "/businessapplications",
+                                         label="businessapplications", max_items=limit))
+        
+        app_entities: List[Dict] = []
+        seen: Set[Any] = set()
+        
+        # Tier 1: strategies 1 and 2 together, first non-empty wins
+        tier1 = self._fan_out(_strategy, ["search", "businessapplications"] if name_filter
+                              else ["businessapplications"])
+        for name, found in tier1:
+            if found:
+                log.info("search_applications: found %d via %s", len(found), name)
+                self._merge_unique(app_entities, seen, found)
+                break
+        
+        # Tier 2: strategy 3 (filtered search per app type) and strategy 4
+        # (Market entities per app type), all types concurrently
         if not app_entities:
-            try:
-                result = self._get("/businessapplications", params={"limit": limit})
-                business_apps = self._to_list(result, "businessapplications")
-                if business_apps:
-                    log.info("search_applications: found %d via /businessapplications", 
-                            len(business_apps))
-                    app_entities.extend(business_apps)
-            except Exception as exc:
-                log.debug("/businessapplications failed: %s", exc)
-        
-        # Strategy 3: Try each app entity type with server-side filter
-        if name_filter and not app_entities:
-            for entity_type in self.APP_ENTITY_TYPES:
-                try:
-                    search_payload = {
-                        "criteria": {
-                            "expType": "RXEQ",
-                            "expVal": f".*{name_filter}.*",
-                            "filterType": "displayName",
-                            "caseSensitive": False
-                        },
-                        "className": entity_type
-                    }
-                    result = self._post("/search", payload=search_payload, 
-                                       params={"limit": limit})
-                    entities = self._to_list(result, f"search_{entity_type}")
-                    if entities:
-                        log.info("search_applications: found %d of type %s", 
-                                len(entities), entity_type)
-                        # Deduplicate by UUID
-                        existing_uuids = {e.get("uuid") for e in app_entities}
-                        new_entities = [e for e in entities 
-                                       if e.get("uuid") not in existing_uuids]
-                        app_entities.extend(new_entities)
-                except Exception as exc:
-                    log.debug("POST /search for %s failed: %s", entity_type, exc)
-        
-        # Strategy 4: Try /markets/Market/entities with app types
-        if not app_entities:
-            for entity_type in self.APP_ENTITY_TYPES:
-                try:
-                    result = self._get("/markets/Market/entities",
-                                      params={"types": entity_type, "limit": limit})
-                    entities = self._to_list(result, f"market_{entity_type}")
-                    if entities:
-                        log.info("search_applications: found %d of type %s via Market", 
-                                len(entities), entity_type)
-                        existing_uuids = {e.get("uuid") for e in app_entities}
-                        new_entities = [e for e in entities 
-                                       if e.get("uuid") not in existing_uuids]
-                        app_entities.extend(new_entities)
-                except Exception as exc:
-                    log.debug("Market endpoint for %s failed: %s", entity_type, exc)
+            keys = [f"market:{t}" for t in self.APP_ENTITY_TYPES]
+            if name_filter:
+                keys = [f"search:{t}" for t in self.APP_ENTITY_TYPES] + keys
+            
+            def _tier2(key: str) -> List[Dict]:
+                kind, entity_type = key.split(":", 1)
+                if kind == "search":
+                    return _search(entity_type)
+                return list(self.iter_entities(entity_type, max_items=limit))
+            
+            results = dict(self._fan_out(_tier2, keys))
+            for kind in ("search", "market"):
+                for entity_type in self.APP_ENTITY_TYPES:
+                    found = results.get(f"{kind}:{entity_type}") or []
+                    if found:
+                        added = self._merge_unique(app_entities, seen, found)
+                        log.info("search_applications: found %d of type %s via %s (%d new)",
+                                 len(found), entity_type, kind, added)
+                if app_entities:
+                    break
         
         # Strategy 5: Client-side filtering only as final fallback
         if name_filter and app_entities: